@@ -1,5 +1,6 @@
 import express from "express";
 import bodyParser from "body-parser";
+import crypto from "crypto";
 
 const app = express();
 const port = 4000;
@@ -9,11 +10,13 @@ app.use(bodyParser.urlencoded({extended: true}));
 app.use(bodyParser.json());
 
 
+// Records are looked up by id; each response body and its ETag are built once at startup
 app.get("/videolib/:id", (req, res) => {
-    const video = videolib.find((v) => v.id === (req.params.id));
-    if (!video) return res.status(404).json({ message: "Video not found" });
-    console.log(video);
-    res.json(video);
+    const entry = videosById.get(req.params.id);
+    if (!entry) return res.status(404).json({ message: "Video not found" });
+    res.set("ETag", entry.etag);
+    res.set("Cache-Control", "no-cache");
+    res.type("json").send(entry.body);
 });
 
 
@@ -45,6 +48,13 @@ const videolib = [
         video: encodeURI("/assets/videos/feelings.mp4"),
     },
 ]
+
+const videosById = new Map(videolib.map((video) => {
+    const body = JSON.stringify(video);
+    const etag = `"${crypto.createHash("sha1").update(body).digest("base64url")}"`;
+    return [video.id, { body: body, etag: etag }];
+}));
+
 app.listen(port, () => {
     console.log(`API is running at http://localhost:${port}`);
   });
\ No newline at end of file
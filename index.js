@@ -1,14 +1,52 @@
 import express from "express";
-import axios from "axios";
 import bodyParser from "body-parser";
+import { createBackendProxy, createUpgradeProxy } from "./proxy.js";
+import { createTutorialCache } from "./tutorial-cache.js";
 
 const app = express();
-const port = 3000;
-const API_URL = "http://localhost:4000";
-const PYTHON_API_URL = "http://localhost:8000"; // FastAPI backend for sign language recognition
+const port = process.env.PORT || 3000;
+const API_URL = process.env.API_URL || "http://localhost:4000";
+const PYTHON_API_URL = process.env.PYTHON_API_URL || "http://localhost:8000"; // FastAPI backend for sign language recognition
+
+// Recognition requests are streamed to the Python backend over pooled keep-alive connections
+const recognitionProxy = createBackendProxy({
+    target: PYTHON_API_URL,
+    timeoutMs: Number(process.env.BACKEND_TIMEOUT_MS || 30000),
+    maxBodyBytes: Number(process.env.BACKEND_MAX_BODY_BYTES || 50 * 1024 * 1024),
+    maxSockets: Number(process.env.BACKEND_MAX_SOCKETS || 64)
+});
+
+// The quiz's WebSocket stream goes through the gateway as well, so pages
+// served over https connect with wss:// on their own origin
+const streamProxy = createUpgradeProxy({
+    target: PYTHON_API_URL,
+    paths: ["/ws/recognize"],
+    timeoutMs: Number(process.env.BACKEND_TIMEOUT_MS || 30000)
+});
+
+// Tutorial metadata is cached in-process and revalidated against api.js once its TTL runs out
+const tutorialCache = createTutorialCache({
+    baseUrl: API_URL,
+    ttlMs: Number(process.env.TUTORIAL_CACHE_TTL_MS || 60000)
+});
+
+// Tutorial videos are large and rarely change: browsers may keep them for a
+// while and revalidate with ETag/Last-Modified afterwards, and byte-range
+// requests let players seek and fetch only the parts they play
+app.use("/assets/videos", express.static("public/assets/videos", {
+    maxAge: Number(process.env.VIDEO_MAX_AGE_MS || 7 * 24 * 60 * 60 * 1000),
+    acceptRanges: true,
+    etag: true,
+    lastModified: true,
+    fallthrough: false
+}));
 
 app.use(express.static('public'));
 
+// Registered before the body parsers so recognition bodies are never parsed in the gateway
+app.post("/api/quiz", recognitionProxy);
+app.post("/api/quiz/landmarks", recognitionProxy);
+
 // Increase the body size limit for JSON and URL-encoded data
 app.use(bodyParser.json({ limit: '50mb' }));
 app.use(bodyParser.urlencoded({ extended: true, limit: '50mb' }));
@@ -33,36 +71,13 @@ app.get("/quiz", (req, res) => {
 app.get("/about-us",(req,res)=>{
     res.render("about-us.ejs");
 });
-// API endpoint to proxy requests to the Python backend
-app.post("/api/quiz", async (req, res) => {
-    try {
-        // Forward the request to the Python backend
-        const response = await axios.post(`${PYTHON_API_URL}/api/quiz`, req.body, {
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            maxContentLength: Infinity,
-            maxBodyLength: Infinity
-        });
-        
-        // Return the Python backend's response
-        res.json(response.data);
-    } catch (error) {
-        console.error("Error forwarding to Python backend:", error.message);
-        res.status(500).json({
-            error: "Failed to process sign language recognition",
-            details: error.message
-        });
-    }
-});
-
 // Existing routes for tutorials
 app.get("/tutorials/basics", async (req, res) => {
     try {
         // By default, load the Introduction video (001)
-        const response = await axios.get(`${API_URL}/videolib/001`);
+        const video = await tutorialCache.get("001");
         res.render("basics.ejs", {
-            videos: response.data
+            videos: video
         });
     } catch (error) {
         console.error("Error fetching default video:", error.message);
@@ -75,7 +90,7 @@ app.get("/tutorials/basics", async (req, res) => {
 app.get("/tutorials/basics/:id", async (req,res) => {
     const videoId = req.params.id;
     try {
-        const response = await axios.get(`${API_URL}/videolib/${videoId}`);
+        const video = await tutorialCache.get(videoId);
         
         // Check if this is an AJAX request (looks for XHR header or accepts JSON)
         const isAjaxRequest = req.xhr || req.headers.accept.indexOf('json') > -1;
@@ -83,12 +98,12 @@ app.get("/tutorials/basics/:id", async (req,res) => {
         if (isAjaxRequest) {
             // Return JSON for AJAX requests
             res.json({
-                videos: response.data
+                videos: video
             });
         } else {
             // Return full page for direct access
             res.render("basics.ejs", {
-                videos: response.data
+                videos: video
             });
         }
     } catch(error) {
@@ -104,9 +119,9 @@ app.get("/tutorials/basics/:id", async (req,res) => {
 app.get("/tutorials/family-signs", async (req, res) => {
     try {
         // By default, load the Family Signs video (004)
-        const response = await axios.get(`${API_URL}/videolib/004`);
+        const video = await tutorialCache.get("004");
         res.render("family-signs.ejs", {
-            videos: response.data
+            videos: video
         });
     } catch (error) {
         console.error("Error fetching default video:", error.message);
@@ -119,7 +134,7 @@ app.get("/tutorials/family-signs", async (req, res) => {
 app.get("/tutorials/family-signs/:id", async (req, res) => {
     const videoId = req.params.id;
     try {
-        const response = await axios.get(`${API_URL}/videolib/${videoId}`);
+        const video = await tutorialCache.get(videoId);
         
         // Check if this is an AJAX request
         const isAjaxRequest = req.xhr || req.headers.accept.indexOf('json') > -1;
@@ -127,12 +142,12 @@ app.get("/tutorials/family-signs/:id", async (req, res) => {
         if (isAjaxRequest) {
             // Return JSON for AJAX requests
             res.json({
-                videos: response.data
+                videos: video
             });
         } else {
             // Return full page for direct access
             res.render("family-signs.ejs", {
-                videos: response.data
+                videos: video
             });
         }
     } catch(error) {
@@ -148,9 +163,9 @@ app.get("/tutorials/family-signs/:id", async (req, res) => {
 app.get("/tutorials/emotions-expressions", async (req, res) => {
     try {
         // By default, load the Emotions Introduction video (007)
-        const response = await axios.get(`${API_URL}/videolib/005`);
+        const video = await tutorialCache.get("005");
         res.render("emotions-expressions.ejs", {
-            videos: response.data
+            videos: video
         });
     } catch (error) {
         console.error("Error fetching default video:", error.message);
@@ -163,7 +178,7 @@ app.get("/tutorials/emotions-expressions", async (req, res) => {
 app.get("/tutorials/emotions-expressions/:id", async (req, res) => {
     const videoId = req.params.id;
     try {
-        const response = await axios.get(`${API_URL}/videolib/${videoId}`);
+        const video = await tutorialCache.get(videoId);
         
         // Check if this is an AJAX request
         const isAjaxRequest = req.xhr || req.headers.accept.indexOf('json') > -1;
@@ -171,12 +186,12 @@ app.get("/tutorials/emotions-expressions/:id", async (req, res) => {
         if (isAjaxRequest) {
             // Return JSON for AJAX requests
             res.json({
-                videos: response.data
+                videos: video
             });
         } else {
             // Return full page for direct access
             res.render("emotions-expressions.ejs", {
-                videos: response.data
+                videos: video
             });
         }
     } catch(error) {
@@ -199,6 +214,7 @@ app.get("/tutorials/quiz/:category", (req, res) => {
     res.render("quiz.ejs", { category: category });
 });
 
-app.listen(port, () => {
+const server = app.listen(port, () => {
     console.log("server listening on port " + port);
-});
\ No newline at end of file
+});
+server.on("upgrade", streamProxy);
\ No newline at end of file
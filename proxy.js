@@ -0,0 +1,199 @@
+import http from "http";
+import { pipeline, Transform } from "stream";
+
+// Streaming reverse proxy for the recognition backend.
+// Request bodies are piped to the backend as they arrive instead of being
+// parsed and re-serialized, and responses are piped back the same way;
+// piping pauses whichever side is faster, so a slow backend or client never
+// makes the gateway buffer a whole body. Connections to the backend
+// are pooled by a keep-alive agent.
+
+// Hop-by-hop headers are not forwarded
+const HOP_BY_HOP = new Set([
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade", "host"
+]);
+
+function forwardHeaders(headers) {
+    const forwarded = {};
+    for (const [name, value] of Object.entries(headers)) {
+        if (!HOP_BY_HOP.has(name.toLowerCase())) {
+            forwarded[name] = value;
+        }
+    }
+    return forwarded;
+}
+
+// Fails the stream once more than maxBytes have passed through (for chunked bodies)
+function limitBytes(maxBytes) {
+    let seen = 0;
+    return new Transform({
+        transform(chunk, encoding, callback) {
+            seen += chunk.length;
+            if (seen > maxBytes) {
+                const error = new Error(`Request body larger than ${maxBytes} bytes`);
+                error.status = 413;
+                callback(error);
+            } else {
+                callback(null, chunk);
+            }
+        }
+    });
+}
+
+export function createBackendProxy({ target, timeoutMs = 30000, maxBodyBytes = 50 * 1024 * 1024, maxSockets = 64 }) {
+    const backend = new URL(target);
+    const agent = new http.Agent({ keepAlive: true, maxSockets: maxSockets, maxFreeSockets: maxSockets });
+
+    // Middleware forwarding the request to the same path on the backend
+    return function proxy(req, res) {
+        const declaredLength = Number(req.headers["content-length"] || 0);
+        if (declaredLength > maxBodyBytes) {
+            res.status(413).json({
+                error: "Failed to process sign language recognition",
+                details: `Request body larger than ${maxBodyBytes} bytes`
+            });
+            req.resume();
+            return;
+        }
+
+        let failed = false;
+        function fail(status, message) {
+            if (failed) {
+                return;
+            }
+            failed = true;
+            upstream.destroy();
+            if (!res.headersSent) {
+                res.status(status).json({ error: "Failed to process sign language recognition", details: message });
+            } else {
+                res.destroy();
+            }
+        }
+
+        // The backend stops working on a request once the gateway would have given up on it
+        const headers = forwardHeaders(req.headers);
+        const clientBudget = Number(headers["x-request-timeout-ms"]);
+        headers["x-request-timeout-ms"] = String(clientBudget > 0 ? Math.min(clientBudget, timeoutMs) : timeoutMs);
+
+        const upstream = http.request({
+            protocol: backend.protocol,
+            hostname: backend.hostname,
+            port: backend.port,
+            method: req.method,
+            path: req.originalUrl,
+            headers: headers,
+            agent: agent,
+            timeout: timeoutMs
+        });
+
+        upstream.on("timeout", () => {
+            console.error(`Backend timed out after ${timeoutMs}ms on ${req.originalUrl}`);
+            fail(504, `Backend did not respond within ${timeoutMs}ms`);
+        });
+
+        upstream.on("error", (error) => {
+            if (!failed) {
+                console.error("Error forwarding to Python backend:", error.message);
+                fail(502, error.message);
+            }
+        });
+
+        upstream.on("response", (backendRes) => {
+            res.status(backendRes.statusCode);
+            for (const [name, value] of Object.entries(forwardHeaders(backendRes.headers))) {
+                res.setHeader(name, value);
+            }
+            pipeline(backendRes, res, (error) => {
+                if (error && !failed) {
+                    console.error("Error streaming backend response:", error.message);
+                }
+            });
+        });
+
+        // A client that goes away mid-request frees the backend connection too
+        res.on("close", () => {
+            if (!res.writableFinished) {
+                upstream.destroy();
+            }
+        });
+
+        // pipe() rather than pipeline() on this side: an oversized body must not
+        // destroy the client connection before the 413 is sent
+        const limiter = limitBytes(maxBodyBytes);
+        limiter.on("error", (error) => {
+            req.unpipe(limiter);
+            req.resume();
+            fail(error.status, error.message);
+        });
+        req.pipe(limiter).pipe(upstream);
+    };
+}
+
+function writeHead(socket, statusCode, statusMessage, rawHeaders) {
+    let head = `HTTP/1.1 ${statusCode} ${statusMessage}\r\n`;
+    for (let i = 0; i < rawHeaders.length; i += 2) {
+        head += `${rawHeaders[i]}: ${rawHeaders[i + 1]}\r\n`;
+    }
+    socket.write(head + "\r\n");
+}
+
+// Handler for the server's "upgrade" event that tunnels WebSocket
+// connections on the given paths to the backend. Once the backend accepts the
+// handshake, bytes are piped both ways untouched, so wss:// clients of an
+// https gateway reach a plain ws:// backend. The stream's lifetime is up to
+// the backend; timeoutMs only bounds the handshake.
+export function createUpgradeProxy({ target, paths, timeoutMs = 30000 }) {
+    const backend = new URL(target);
+
+    return function proxyUpgrade(req, socket, head) {
+        const path = req.url.split("?")[0];
+        if (!paths.includes(path) || (req.headers.upgrade || "").toLowerCase() !== "websocket") {
+            socket.end("HTTP/1.1 404 Not Found\r\nConnection: close\r\n\r\n");
+            return;
+        }
+
+        const upstream = http.request({
+            protocol: backend.protocol,
+            hostname: backend.hostname,
+            port: backend.port,
+            method: req.method,
+            path: req.url,
+            headers: { ...forwardHeaders(req.headers), connection: "Upgrade", upgrade: req.headers.upgrade },
+            agent: false,
+            timeout: timeoutMs
+        });
+
+        function fail(message) {
+            console.error(`Error forwarding ${path} to Python backend:`, message);
+            upstream.destroy();
+            socket.end("HTTP/1.1 502 Bad Gateway\r\nConnection: close\r\n\r\n");
+        }
+
+        upstream.on("timeout", () => fail(`no handshake within ${timeoutMs}ms`));
+        upstream.on("error", (error) => fail(error.message));
+        socket.on("error", () => upstream.destroy());
+
+        // The backend refused the upgrade: relay its answer and close
+        upstream.on("response", (backendRes) => {
+            writeHead(socket, backendRes.statusCode, backendRes.statusMessage, backendRes.rawHeaders);
+            backendRes.pipe(socket);
+        });
+
+        upstream.on("upgrade", (backendRes, backendSocket, backendHead) => {
+            backendSocket.setTimeout(0);
+            writeHead(socket, backendRes.statusCode, backendRes.statusMessage, backendRes.rawHeaders);
+            if (backendHead.length) {
+                socket.write(backendHead);
+            }
+            if (head.length) {
+                backendSocket.write(head);
+            }
+            // Either side closing or failing tears down the other
+            pipeline(backendSocket, socket, () => backendSocket.destroy());
+            pipeline(socket, backendSocket, () => socket.destroy());
+        });
+
+        upstream.end();
+    };
+}
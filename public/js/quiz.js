@@ -29,6 +29,8 @@ document.addEventListener('DOMContentLoaded', function() {
     let isCapturing = false;
     let countdownTimer = null;
     let captureTimer = null;
+    let recognitionSocket = null;
+    let handLandmarkerPromise = null;
     
     // Constants
     const API_URL = '/api/quiz'; // Backend API endpoint
@@ -38,6 +40,12 @@ document.addEventListener('DOMContentLoaded', function() {
     const MAX_FRAMES = 10; // Maximum number of frames to capture
     const IMAGE_QUALITY = 0.5; // JPEG quality (0.0-1.0)
     const IMAGE_SCALE = 0.5; // Scale factor for image size
+    const USE_STREAMING = true; // Stream frames over WebSocket while recording
+    const STREAM_URL = `${window.location.protocol === 'https:' ? 'wss' : 'ws'}://${window.location.host}/ws/recognize`; // Proxied by the gateway
+    const USE_CLIENT_LANDMARKS = true; // Track hands in the browser and send landmarks instead of frames
+    const LANDMARKS_URL = '/api/quiz/landmarks';
+    const VISION_BUNDLE_URL = 'https://cdn.jsdelivr.net/npm/@mediapipe/tasks-vision@0.10.14';
+    const HAND_MODEL_URL = 'https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task';
     
     // Initialize quiz
     function initQuiz() {
@@ -94,6 +102,9 @@ document.addEventListener('DOMContentLoaded', function() {
             stream = await navigator.mediaDevices.getUserMedia(constraints);
             webcamElement.srcObject = stream;
             
+            // Start downloading the hand tracker while the user gets ready
+            loadHandLandmarker();
+            
             return new Promise((resolve) => {
                 webcamElement.onloadedmetadata = () => {
                     // Start playing the video
@@ -145,6 +156,84 @@ document.addEventListener('DOMContentLoaded', function() {
         return canvasElement.toDataURL('image/jpeg', IMAGE_QUALITY);
     }
     
+    // Load MediaPipe's hand landmarker once; resolves to null if it is unavailable
+    function loadHandLandmarker() {
+        if (!USE_CLIENT_LANDMARKS) {
+            return Promise.resolve(null);
+        }
+        
+        if (!handLandmarkerPromise) {
+            handLandmarkerPromise = import(`${VISION_BUNDLE_URL}/vision_bundle.mjs`)
+                .then(async ({ FilesetResolver, HandLandmarker }) => {
+                    const fileset = await FilesetResolver.forVisionTasks(`${VISION_BUNDLE_URL}/wasm`);
+                    return HandLandmarker.createFromOptions(fileset, {
+                        baseOptions: { modelAssetPath: HAND_MODEL_URL },
+                        runningMode: 'VIDEO',
+                        numHands: 1
+                    });
+                })
+                .catch((error) => {
+                    console.warn('In-browser hand tracking unavailable, sending frames instead:', error);
+                    return null;
+                });
+        }
+        return handLandmarkerPromise;
+    }
+    
+    // Hand landmarks in the current video frame as [x, y, z] triples, or null if no hand is visible
+    function detectHand(handLandmarker) {
+        const result = handLandmarker.detectForVideo(webcamElement, performance.now());
+        if (!result.landmarks || result.landmarks.length === 0) {
+            return null;
+        }
+        return result.landmarks[0].map(point => [point.x, point.y, point.z]);
+    }
+    
+    // Open a streaming recognition session; resolves to null if unavailable
+    function openRecognitionStream(expectedSign) {
+        if (!USE_STREAMING || !('WebSocket' in window)) {
+            return Promise.resolve(null);
+        }
+        
+        return new Promise((resolve) => {
+            const socket = new WebSocket(STREAM_URL);
+            
+            socket.onopen = () => {
+                socket.send(JSON.stringify({ type: 'start', expectedSign: expectedSign }));
+                resolve(socket);
+            };
+            
+            socket.onerror = () => {
+                console.warn('Streaming recognition unavailable, falling back to upload');
+                resolve(null);
+            };
+            
+            socket.onmessage = (event) => {
+                const message = JSON.parse(event.data);
+                
+                if (message.type === 'prediction') {
+                    // Rolling feedback while the user is still signing
+                    const confidencePercent = Math.round(message.confidence * 100);
+                    feedbackElement.textContent = `Detecting... "${message.predictedSign}" (${confidencePercent}%)`;
+                    feedbackElement.className = 'feedback visible';
+                } else if (message.type === 'final') {
+                    socket.close();
+                    handleResult(message);
+                } else if (message.type === 'error') {
+                    console.error('Streaming recognition error:', message.detail);
+                }
+            };
+        });
+    }
+    
+    // Close the streaming session if one is open
+    function closeRecognitionStream() {
+        if (recognitionSocket) {
+            recognitionSocket.close();
+            recognitionSocket = null;
+        }
+    }
+    
     // Start capturing frames for sign recognition
     function startCapturing() {
         if (isCapturing) return;
@@ -152,6 +241,7 @@ document.addEventListener('DOMContentLoaded', function() {
         // Reset state
         isCapturing = true;
         let capturedFrames = [];
+        let capturedLandmarks = [];
         
         // Display countdown
         let countdownSeconds = COUNTDOWN_DURATION;
@@ -159,13 +249,24 @@ document.addEventListener('DOMContentLoaded', function() {
         countdownElement.style.display = 'block';
         
         // Start countdown
-        countdownTimer = setInterval(() => {
+        countdownTimer = setInterval(async () => {
             countdownSeconds--;
             
             if (countdownSeconds <= 0) {
                 clearInterval(countdownTimer);
                 countdownElement.style.display = 'none';
                 
+                // Track hands locally if possible; otherwise open the stream before
+                // recording so frames can be sent as they are captured
+                const handLandmarker = await loadHandLandmarker();
+                if (!handLandmarker) {
+                    recognitionSocket = await openRecognitionStream(questions[currentQuestionIndex].answer);
+                }
+                if (!isCapturing) {
+                    closeRecognitionStream();
+                    return;
+                }
+                
                 // Start capturing frames
                 let captureSeconds = CAPTURE_DURATION;
                 
@@ -179,6 +280,13 @@ document.addEventListener('DOMContentLoaded', function() {
                         const frame = captureImage();
                         if (frame) {
                             capturedFrames.push(frame);
+                            
+                            if (handLandmarker) {
+                                // Frames are still kept for verification and the upload fallback
+                                capturedLandmarks.push(detectHand(handLandmarker));
+                            } else if (recognitionSocket && recognitionSocket.readyState === WebSocket.OPEN) {
+                                recognitionSocket.send(JSON.stringify({ type: 'frame', frame: frame }));
+                            }
                         }
                     }
                 }, CAPTURE_INTERVAL);
@@ -194,8 +302,31 @@ document.addEventListener('DOMContentLoaded', function() {
                         countdownElement.style.display = 'none';
                         isCapturing = false;
                         
-                        // Submit the captured frames
-                        submitSign(capturedFrames);
+                        if (handLandmarker) {
+                            submitLandmarks(capturedFrames, capturedLandmarks);
+                        } else if (recognitionSocket && recognitionSocket.readyState === WebSocket.OPEN && capturedFrames.length > 0) {
+                            // Ask the stream for its final prediction, uploading instead if it drops
+                            const socket = recognitionSocket;
+                            let finalReceived = false;
+                            recognitionSocket = null;
+                            submitSignBtn.disabled = true;
+                            
+                            socket.addEventListener('message', (event) => {
+                                if (JSON.parse(event.data).type === 'final') {
+                                    finalReceived = true;
+                                }
+                            });
+                            socket.addEventListener('close', () => {
+                                if (!finalReceived) {
+                                    submitSign(capturedFrames);
+                                }
+                            });
+                            socket.send(JSON.stringify({ type: 'end' }));
+                        } else {
+                            // Submit the captured frames
+                            closeRecognitionStream();
+                            submitSign(capturedFrames);
+                        }
                     }
                 }, 1000);
             } else {
@@ -244,19 +375,7 @@ document.addEventListener('DOMContentLoaded', function() {
             }
             
             const result = await response.json();
-            console.log('Recognition result:', result);
-            
-            // Display feedback
-            showFeedback(result.isCorrect, result.predictedSign, result.confidence);
-            
-            // Update score if correct
-            if (result.isCorrect) {
-                score++;
-            }
-            
-            // Enable next question button
-            nextQuestionBtn.style.display = 'inline-block';
-            submitSignBtn.disabled = true;
+            handleResult(result);
             
         } catch (error) {
             console.error('Error submitting sign:', error);
@@ -270,6 +389,89 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
     
+    // SHA-256 of a frame's data URL as hex, committing to it before the server picks frames to check
+    async function frameHash(frame) {
+        const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(frame));
+        return Array.from(new Uint8Array(digest), byte => byte.toString(16).padStart(2, '0')).join('');
+    }
+    
+    async function postLandmarks(body) {
+        const response = await fetch(LANDMARKS_URL, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify(body)
+        });
+        
+        if (!response.ok) {
+            throw new Error(`Server responded with status: ${response.status}`);
+        }
+        return response.json();
+    }
+    
+    // Submit landmarks tracked in the browser with hashes of their frames,
+    // then the frames the server asks for to verify them
+    async function submitLandmarks(frames, landmarks) {
+        const handLandmarks = [];
+        const handFrames = [];
+        landmarks.forEach((hand, i) => {
+            if (hand) {
+                handLandmarks.push(hand);
+                handFrames.push(frames[i]);
+            }
+        });
+        
+        if (handLandmarks.length === 0 || !(window.crypto && crypto.subtle)) {
+            // Let the server look for a hand the browser missed; frames
+            // cannot be hashed outside a secure context either
+            return submitSign(frames);
+        }
+        
+        console.log(`Submitting ${handLandmarks.length} landmark frames for analysis`);
+        submitSignBtn.disabled = true;
+        feedbackElement.textContent = "Processing...";
+        feedbackElement.className = 'feedback';
+        feedbackElement.classList.add('visible');
+        
+        try {
+            const body = {
+                landmarks: handLandmarks,
+                expectedSign: questions[currentQuestionIndex].answer,
+                frameHashes: await Promise.all(handFrames.map(frameHash))
+            };
+            let result = await postLandmarks(body);
+            if (result.verifyFrames) {
+                body.verify = result.verifyFrames.map(index => ({ index: index, frame: handFrames[index] }));
+                result = await postLandmarks(body);
+            }
+            if (result.verified === false || result.verifyFrames) {
+                throw new Error('Server could not verify the tracked landmarks');
+            }
+            handleResult(result);
+        } catch (error) {
+            console.warn('Landmark recognition failed, uploading frames instead:', error);
+            submitSign(frames);
+        }
+    }
+    
+    // Score a recognition result from either the upload or the stream
+    function handleResult(result) {
+        console.log('Recognition result:', result);
+        
+        // Display feedback
+        showFeedback(result.isCorrect, result.predictedSign, result.confidence);
+        
+        // Update score if correct
+        if (result.isCorrect) {
+            score++;
+        }
+        
+        // Enable next question button
+        nextQuestionBtn.style.display = 'inline-block';
+        submitSignBtn.disabled = true;
+    }
+    
     // Show feedback
     function showFeedback(isCorrect, predictedSign, confidence) {
         // Format confidence as percentage
@@ -349,6 +551,7 @@ document.addEventListener('DOMContentLoaded', function() {
         
         countdownElement.style.display = 'none';
         isCapturing = false;
+        closeRecognitionStream();
     }
     
     // Event Listeners
@@ -0,0 +1,168 @@
+"""
+Admission control and request deadlines for recognition requests.
+At most max_concurrent requests are processed at a time and at most
+max_queue more wait for a slot, in arrival order. Anything beyond that is
+turned away at once with 429, and a queued request that does not get a slot
+within its queue timeout or deadline gets 503, both with a Retry-After
+estimated from recent service times. Requests are admitted before their
+body is read, so waiting requests hold no frames in memory.
+
+Each admitted request carries a Deadline, the time budget its client is
+willing to wait. Processing stages run under it and stop once it is spent.
+A WebSocket stream holds one slot for as long as it is open.
+"""
+import asyncio
+import collections
+import math
+import time
+
+from metrics import REGISTRY
+
+
+def _rejections(reason):
+    return REGISTRY.counter(
+        "admission_rejections_total", "Recognition requests turned away by admission control", {"reason": reason}
+    )
+
+
+QUEUE_FULL, QUEUE_TIMEOUT, DEADLINE_EXCEEDED = (
+    _rejections("queue_full"), _rejections("queue_timeout"), _rejections("deadline")
+)
+
+
+class Overloaded(Exception):
+    """The request cannot be served now; status_code is 429 or 503"""
+
+    def __init__(self, status_code, detail, retry_after):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(Exception):
+    """The request's time budget ran out before processing finished"""
+
+
+class Deadline:
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(0.0, self.expires - time.monotonic())
+
+    @property
+    def expired(self):
+        return time.monotonic() >= self.expires
+
+    def check(self):
+        """Raise DeadlineExceeded if the budget is spent (safe to call from worker threads)"""
+        if self.expired:
+            DEADLINE_EXCEEDED.inc()
+            raise DeadlineExceeded(f"Request deadline of {self.seconds * 1000:.0f}ms exceeded")
+
+    async def run(self, awaitable):
+        """
+        Await under the remaining budget. On expiry the awaitable is
+        cancelled, which drops its frames still queued for extraction and
+        its sequence still queued for inference.
+        """
+        try:
+            return await asyncio.wait_for(awaitable, self.remaining())
+        except asyncio.TimeoutError:
+            DEADLINE_EXCEEDED.inc()
+            raise DeadlineExceeded(f"Request deadline of {self.seconds * 1000:.0f}ms exceeded")
+
+
+class AdmissionController:
+    """
+    max_concurrent: requests processed at once (0 disables admission control)
+    max_queue: requests allowed to wait for a slot
+    queue_timeout: longest wait for a slot in seconds, also bounded by the deadline
+    """
+
+    def __init__(self, max_concurrent=8, max_queue=16, queue_timeout=5.0):
+        self.max_concurrent = max(0, int(max_concurrent))
+        self.max_queue = max(0, int(max_queue))
+        self.queue_timeout = queue_timeout
+
+        self.in_flight = 0
+        self._waiters = collections.deque()
+        # Moving average of how long an admitted request holds its slot
+        self._service_time = 0.1
+
+    @property
+    def enabled(self):
+        return self.max_concurrent > 0
+
+    @property
+    def queued(self):
+        return len(self._waiters)
+
+    def retry_after(self):
+        """Seconds until the current backlog should have cleared, at least 1"""
+        backlog = (self.queued + 1) * self._service_time / max(1, self.max_concurrent)
+        return max(1, math.ceil(backlog))
+
+    async def _acquire(self, deadline):
+        if self.in_flight < self.max_concurrent and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            QUEUE_FULL.inc()
+            raise Overloaded(429, "Too many recognition requests, try again later", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, min(self.queue_timeout, deadline.remaining()))
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # Handed a slot just as the wait timed out; keep it
+                return
+            QUEUE_TIMEOUT.inc()
+            raise Overloaded(503, "Server busy, no capacity within the request deadline", self.retry_after())
+        except asyncio.CancelledError:
+            # Handed a slot just as the client went away
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def _release(self):
+        # Hand the slot straight to the longest-waiting request
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    async def run(self, deadline, handler, timed=True):
+        """
+        Run handler() once a slot is free; raises Overloaded if none frees up in time.
+        Pass timed=False for long-lived handlers such as WebSocket streams, so
+        their lifetime does not inflate the Retry-After estimate.
+        """
+        if not self.enabled:
+            return await handler()
+        await self._acquire(deadline)
+        start = time.monotonic()
+        try:
+            return await handler()
+        finally:
+            if timed:
+                self._service_time = 0.8 * self._service_time + 0.2 * (time.monotonic() - start)
+            self._release()
+
+    def stats(self):
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "service_time_ms": self._service_time * 1000,
+        }
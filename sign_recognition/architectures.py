@@ -0,0 +1,117 @@
+"""
+Model architectures for sign recognition.
+Each builder takes the input shape (sequence_length, num_features) and the
+number of classes and returns an uncompiled Keras model ending in a float32
+softmax. Only built-in Keras layers are used, so every architecture saves to
+and loads from .h5 and converts to TFLite without custom objects.
+
+    bilstm       the original stacked bidirectional LSTM (largest, slowest)
+    gru          a single bidirectional GRU layer
+    tcn          dilated 1D convolutions over time (fastest on CPU)
+    transformer  a small self-attention encoder over a convolutional stem
+
+Select one with SignLanguageModel(architecture=...) or train.py --architecture;
+benchmarks/bench_architectures.py compares them on the same data.
+"""
+
+DEFAULT_ARCHITECTURE = 'bilstm'
+
+
+def build_bilstm(input_shape, num_classes):
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import LSTM, Dense, Dropout, Bidirectional, BatchNormalization
+
+    return Sequential([
+        # First LSTM layer with bidirectional wrapper
+        Bidirectional(LSTM(64, return_sequences=True), input_shape=input_shape),
+        BatchNormalization(),
+        Dropout(0.3),
+
+        # Second LSTM layer
+        Bidirectional(LSTM(128, return_sequences=True)),
+        BatchNormalization(),
+        Dropout(0.3),
+
+        # Third LSTM layer
+        LSTM(64),
+        BatchNormalization(),
+        Dropout(0.3),
+
+        # Dense layers
+        Dense(64, activation='relu'),
+        BatchNormalization(),
+        Dropout(0.3),
+
+        Dense(32, activation='relu'),
+        BatchNormalization(),
+
+        # Output layer, kept in float32 under mixed precision
+        Dense(num_classes, activation='softmax', dtype='float32')
+    ])
+
+
+def build_gru(input_shape, num_classes):
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import GRU, Dense, Dropout, Bidirectional
+
+    return Sequential([
+        Bidirectional(GRU(48), input_shape=input_shape),
+        Dropout(0.3),
+        Dense(32, activation='relu'),
+        Dense(num_classes, activation='softmax', dtype='float32')
+    ])
+
+
+def build_tcn(input_shape, num_classes):
+    from tensorflow.keras import Input, Model
+    from tensorflow.keras.layers import (
+        Add, BatchNormalization, Conv1D, Dense, Dropout, GlobalAveragePooling1D
+    )
+
+    inputs = Input(shape=input_shape)
+    x = Conv1D(64, 1)(inputs)
+    # Dilations 1, 2, 4, 8 give a receptive field of 31 frames, the whole sequence
+    for dilation in (1, 2, 4, 8):
+        residual = x
+        x = Conv1D(64, 3, padding='same', dilation_rate=dilation, activation='relu')(x)
+        x = BatchNormalization()(x)
+        x = Add()([x, residual])
+    x = GlobalAveragePooling1D()(x)
+    x = Dropout(0.3)(x)
+    outputs = Dense(num_classes, activation='softmax', dtype='float32')(x)
+    return Model(inputs, outputs)
+
+
+def build_transformer(input_shape, num_classes, dim=64, heads=4, blocks=2):
+    from tensorflow.keras import Input, Model
+    from tensorflow.keras.layers import (
+        Add, Conv1D, Dense, Dropout, GlobalAveragePooling1D, LayerNormalization, MultiHeadAttention
+    )
+
+    inputs = Input(shape=input_shape)
+    # The convolutional stem mixes neighbouring frames, which gives attention the
+    # local order it needs without a custom positional embedding layer
+    x = Conv1D(dim, 3, padding='same', activation='relu')(inputs)
+    for _ in range(blocks):
+        attended = MultiHeadAttention(num_heads=heads, key_dim=dim // heads)(x, x)
+        x = LayerNormalization()(Add()([x, Dropout(0.1)(attended)]))
+        expanded = Dense(dim * 2, activation='relu')(x)
+        x = LayerNormalization()(Add()([x, Dense(dim)(expanded)]))
+    x = GlobalAveragePooling1D()(x)
+    x = Dropout(0.3)(x)
+    outputs = Dense(num_classes, activation='softmax', dtype='float32')(x)
+    return Model(inputs, outputs)
+
+
+ARCHITECTURES = {
+    'bilstm': build_bilstm,
+    'gru': build_gru,
+    'tcn': build_tcn,
+    'transformer': build_transformer,
+}
+
+
+def build_model(architecture, input_shape, num_classes):
+    if architecture not in ARCHITECTURES:
+        raise ValueError(f"Unknown architecture '{architecture}', expected one of {tuple(ARCHITECTURES)}")
+    return ARCHITECTURES[architecture](input_shape, num_classes)
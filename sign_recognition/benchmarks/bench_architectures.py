@@ -0,0 +1,170 @@
+"""
+Compare the model architectures in architectures.py on the same data.
+Each one is trained for a few epochs and reported with its parameter count,
+FLOPs per sequence, single-sequence CPU latency, batch throughput and
+validation accuracy.
+
+FLOPs come from the TensorFlow profiler on the frozen inference graph. The
+loop body of a recurrent layer appears once in that graph, so for bilstm and
+gru the ops inside while loops are counted once per frame and everything
+else (input projections, the dense head) once.
+
+Uses the packed dataset if it exists, otherwise synthetic sequences from
+synthetic_data.py.
+
+Usage: python benchmarks/bench_architectures.py [--architectures bilstm,gru,tcn,transformer]
+                                                [--features landmarks|engineered] [--epochs 15]
+                                                [--batch-size 16] [--threads 0]
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+from architectures import ARCHITECTURES
+from features import FEATURE_SETS
+from model import SignLanguageModel
+
+RECURRENT = ("bilstm", "gru")
+
+# Scope of ops inside a (lowered) tf.while_loop body
+WHILE_SCOPE = re.compile(r"(^|/)while(_\d+)?/")
+
+
+def load_data(model, per_class=200):
+    packed_dir = os.path.join(SERVER_DIR, 'training_data_packed')
+    if os.path.exists(packed_dir):
+        return model.prepare_data_from_packed(packed_dir)
+
+    from synthetic_data import SIGNS, synthetic_sequence
+    rng = np.random.default_rng(0)
+    signs = [sign for sign in model.classes if sign in SIGNS]
+    sequences, labels = [], []
+    for sign in signs:
+        for _ in range(per_class):
+            sequences.append(synthetic_sequence(sign, model.sequence_length, rng))
+            labels.append(model.classes.index(sign))
+    return model.preprocess_batch(np.stack(sequences)), np.array(labels)
+
+
+def scope_nodes(node):
+    """Every node of a profiler scope tree"""
+    yield node
+    for child in node.children:
+        yield from scope_nodes(child)
+
+
+def count_flops(keras_model, input_shape, loop_iterations=1):
+    """
+    Floating point operations for one sequence through the inference graph,
+    with ops inside while loops counted loop_iterations times
+    """
+    import tensorflow as tf
+    from tensorflow.python.framework.convert_to_constants import convert_variables_to_constants_v2
+
+    concrete = tf.function(lambda x: keras_model(x, training=False)).get_concrete_function(
+        tf.TensorSpec((1,) + input_shape, tf.float32)
+    )
+    frozen = convert_variables_to_constants_v2(concrete)
+    options = tf.compat.v1.profiler.ProfileOptionBuilder(
+        tf.compat.v1.profiler.ProfileOptionBuilder.float_operation()
+    ).with_empty_output().build()
+    profile = tf.compat.v1.profiler.profile(graph=frozen.graph, cmd="scope", options=options)
+    loop_flops = sum(node.float_ops for node in scope_nodes(profile) if WHILE_SCOPE.search(node.name))
+    if loop_iterations > 1 and loop_flops == 0:
+        print("Warning: no while loop ops found, recurrent FLOPs are counted for one step only")
+    return profile.total_float_ops + loop_flops * (loop_iterations - 1)
+
+
+def measure_latency(keras_model, input_shape, batch_size, runs):
+    """Milliseconds per call of the compiled forward pass"""
+    import tensorflow as tf
+
+    forward = tf.function(lambda x: keras_model(x, training=False))
+    x = tf.constant(np.random.default_rng(0).random((batch_size,) + input_shape), tf.float32)
+    for _ in range(10):
+        forward(x)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        forward(x).numpy()
+        times.append((time.perf_counter() - start) * 1000)
+    return np.percentile(times, [50, 95])
+
+
+def run_architecture(name, X, y, reference, args):
+    import tensorflow as tf
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        # Fresh weights in a scratch directory, never touching the saved model
+        model = SignLanguageModel(model_dir=model_dir, classes=reference.classes, architecture=name,
+                                  feature_set=reference.feature_set)
+        model.create_model()
+        input_shape = (model.sequence_length, model.num_features)
+
+        order = np.random.default_rng(42).permutation(len(X))
+        num_val = len(X) // 5
+        val_idx, train_idx = order[:num_val], order[num_val:]
+        y_onehot = tf.keras.utils.to_categorical(y, num_classes=len(reference.classes))
+
+        start = time.perf_counter()
+        history = model.model.fit(
+            X[train_idx], y_onehot[train_idx],
+            epochs=args.epochs, batch_size=args.batch_size, verbose=0,
+            validation_data=(X[val_idx], y_onehot[val_idx])
+        )
+        train_seconds = time.perf_counter() - start
+
+        flops = count_flops(model.model, input_shape, model.sequence_length if name in RECURRENT else 1)
+        p50, p95 = measure_latency(model.model, input_shape, 1, args.runs)
+        batch_p50, _ = measure_latency(model.model, input_shape, 16, args.runs // 4)
+        return {
+            "architecture": name,
+            "params": model.model.count_params(),
+            "mflops": flops / 1e6,
+            "latency_p50_ms": p50,
+            "latency_p95_ms": p95,
+            "batch16_seq_per_s": 16 / (batch_p50 / 1000),
+            "train_seconds": train_seconds,
+            "val_accuracy": float(max(history.history["val_categorical_accuracy"])),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--architectures", default=",".join(ARCHITECTURES))
+    parser.add_argument("--features", choices=FEATURE_SETS, default=None,
+                        help="input features (default: those of the saved model)")
+    parser.add_argument("--epochs", type=int, default=15)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--runs", type=int, default=200, help="timed forward passes per architecture")
+    parser.add_argument("--threads", type=int, default=0, help="intra/inter-op threads, 0 = TensorFlow default")
+    args = parser.parse_args()
+
+    from train import configure_tensorflow
+    configure_tensorflow(intra_op_threads=args.threads, inter_op_threads=args.threads)
+
+    reference = SignLanguageModel(feature_set=args.features)
+    X, y = load_data(reference)
+    print(f"{len(X)} sequences of shape {X.shape[1:]} ({reference.feature_set} features), "
+          f"{len(reference.classes)} classes\n")
+
+    results = [run_architecture(name, X, y, reference, args) for name in args.architectures.split(",")]
+
+    print(f"{'architecture':<12} {'params':>9} {'MFLOPs':>8} {'p50 ms':>7} {'p95 ms':>7} "
+          f"{'seq/s@16':>9} {'train s':>8} {'val acc':>8}")
+    for r in results:
+        print(f"{r['architecture']:<12} {r['params']:>9,} {r['mflops']:>8.2f} {r['latency_p50_ms']:>7.2f} "
+              f"{r['latency_p95_ms']:>7.2f} {r['batch16_seq_per_s']:>9.0f} {r['train_seconds']:>8.1f} "
+              f"{r['val_accuracy'] * 100:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Server cost and accuracy of browser-side landmark extraction.
+Replays JPEG frame sets (<sign>/<name>/*.jpg, e.g. from synthetic_data.py
+--frames) through both quiz paths and reports server CPU time per attempt
+and accuracy:
+
+    frames     the upload path: decode and run MediaPipe on every frame
+    landmarks  the browser path: landmarks arrive as JSON with frame hashes,
+               the server asks for LANDMARK_VERIFY_FRAMES of the frames and
+               re-extracts only those
+
+The browser's landmarks are stood in for by MediaPipe in video mode (as
+the in-browser tracker runs) over the same frames. CPU time is process time,
+so it includes every extraction and inference thread.
+
+Usage: python benchmarks/bench_client_landmarks.py [--data-dir synthetic] [--verify-frames 2] [--limit 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+from evaluate import find_samples, load_frame_set
+from extraction import FrameExtractor, base64_to_image, create_hands, landmarks_from_frame
+from landmark_codec import decode_json_landmarks
+from model import SignLanguageModel
+from verification import FramesRequired, LandmarkVerifier, frame_hash
+
+
+def browser_payload(frames, expected_sign, num_hands):
+    """
+    The JSON body quiz.js sends: landmarks of frames with a hand and the
+    hashes of those frames, which are returned too for answering the server
+    """
+    hands = create_hands(static_image_mode=False, max_num_hands=num_hands)
+    landmarks, hand_frames = [], []
+    try:
+        for frame in frames:
+            found = landmarks_from_frame(base64_to_image(frame), hands, num_hands)
+            if found is not None:
+                landmarks.append(np.asarray(found).tolist())
+                hand_frames.append(frame)
+    finally:
+        hands.close()
+    body = {"landmarks": landmarks, "expectedSign": expected_sign,
+            "frameHashes": [frame_hash(frame) for frame in hand_frames]}
+    return body, hand_frames
+
+
+def frames_attempt(model, extractor, frames):
+    results = extractor.extract_sync(frames)
+    sequence = [landmarks for _, landmarks in results if landmarks is not None]
+    return model.predict_batch([sequence])[0][0] if sequence else "unknown", None
+
+
+def landmarks_attempt(model, verifier, body, hand_frames, num_landmarks):
+    """Both round trips of a checked attempt: landmarks and hashes, then the frames the server asks for"""
+    landmarks, _, frame_hashes, samples = decode_json_landmarks(json.loads(json.dumps(body)), num_landmarks)
+    if len(landmarks) == 0:
+        return "unknown", None
+    try:
+        verified = asyncio.run(verifier.verify(landmarks, frame_hashes, samples))
+    except FramesRequired as e:
+        body = dict(body, verify=[{"index": i, "frame": hand_frames[i]} for i in e.indices])
+        landmarks, _, frame_hashes, samples = decode_json_landmarks(json.loads(json.dumps(body)), num_landmarks)
+        verified = asyncio.run(verifier.verify(landmarks, frame_hashes, samples))
+    if verified is False:
+        return "unknown", False
+    return model.predict_batch([landmarks])[0][0], verified
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", default=os.path.join(SERVER_DIR, 'training_data'))
+    parser.add_argument("--verify-frames", type=int, default=2)
+    parser.add_argument("--tolerance", type=float, default=0.05)
+    parser.add_argument("--limit", type=int, default=None, help="Frame sets per sign")
+    args = parser.parse_args()
+
+    model = SignLanguageModel()
+    if model.model is None:
+        print("No trained model found! Please run train.py first.")
+        return
+    samples = [(sign, path) for kind, sign, path in find_samples(args.data_dir, model.classes, args.limit)
+               if kind == "frames"]
+    if not samples:
+        print(f"No frame sets found in {args.data_dir}. Generate some with synthetic_data.py --frames.")
+        return
+
+    # One worker and no landmark cache, so CPU time is the extraction work itself
+    extractor = FrameExtractor(num_workers=1, num_hands=model.num_hands)
+
+    async def extract(frames):
+        return extractor.extract_sync(frames)
+
+    verifier = LandmarkVerifier(extract, sample_size=args.verify_frames, tolerance=args.tolerance,
+                                secret=b"bench_client_landmarks")
+    num_landmarks = 21 * model.num_hands
+    model.warm_up(batch_sizes=[1])
+
+    cpu = {"frames": [], "landmarks": []}
+    correct = {"frames": 0, "landmarks": 0}
+    agree, outcomes = 0, {True: 0, False: 0, None: 0}
+    for sign, path in samples:
+        frames = load_frame_set(path)
+        body, hand_frames = browser_payload(frames, sign, model.num_hands)
+
+        start = time.process_time()
+        frames_sign, _ = frames_attempt(model, extractor, frames)
+        cpu["frames"].append((time.process_time() - start) * 1000)
+
+        start = time.process_time()
+        landmarks_sign, verified = landmarks_attempt(model, verifier, body, hand_frames, num_landmarks)
+        cpu["landmarks"].append((time.process_time() - start) * 1000)
+
+        correct["frames"] += frames_sign == sign
+        correct["landmarks"] += landmarks_sign == sign
+        agree += frames_sign == landmarks_sign
+        outcomes[verified] += 1
+    extractor.shutdown()
+
+    n = len(samples)
+    print(f"{n} quiz attempts, {args.verify_frames} verification frames each\n")
+    print(f"{'path':<10} {'CPU ms/attempt':>15} {'accuracy':>9}")
+    for path in ("frames", "landmarks"):
+        print(f"{path:<10} {np.mean(cpu[path]):>15.1f} {correct[path] / n * 100:>8.1f}%")
+    print(f"\nServer CPU reduced {np.mean(cpu['frames']) / np.mean(cpu['landmarks']):.1f}x; "
+          f"both paths agree on {agree / n * 100:.1f}% of attempts")
+    print(f"Verification: {outcomes[True]} verified, {outcomes[False]} rejected, {outcomes[None]} unchecked")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark loading per-file .npy sequences against the packed memory-mapped dataset.
+Writes a synthetic training_data tree to a temporary directory.
+
+Usage: python benchmarks/bench_dataset.py [--sequences 5000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset import PackedDataset, pack_directory
+
+CLASSES = ['one', 'two', 'three', 'four', 'five']
+
+
+def write_per_file_tree(data_dir, count, sequence_length):
+    rng = np.random.default_rng(0)
+    for i in range(count):
+        class_dir = os.path.join(data_dir, CLASSES[i % len(CLASSES)])
+        os.makedirs(class_dir, exist_ok=True)
+        np.save(os.path.join(class_dir, f"seq_{i}.npy"), rng.random((sequence_length, 21, 3)))
+
+
+def load_per_file(data_dir):
+    """The prepare_data_from_directory loading loop, without preprocessing"""
+    X, y = [], []
+    for class_idx, class_name in enumerate(CLASSES):
+        class_dir = os.path.join(data_dir, class_name)
+        for file_name in os.listdir(class_dir):
+            if file_name.endswith('.npy'):
+                X.append(np.load(os.path.join(class_dir, file_name)))
+                y.append(class_idx)
+    return np.array(X), np.array(y)
+
+
+def load_packed(packed_dir):
+    dataset = PackedDataset(packed_dir)
+    return np.array(dataset.sequences), np.array(dataset.labels)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sequences", type=int, default=5000)
+    parser.add_argument("--sequence-length", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = os.path.join(tmp, 'training_data')
+        packed_dir = os.path.join(tmp, 'training_data_packed')
+        write_per_file_tree(data_dir, args.sequences, args.sequence_length)
+
+        start = time.perf_counter()
+        pack_directory(data_dir, packed_dir, CLASSES, args.sequence_length)
+        pack_time = time.perf_counter() - start
+
+        # Second pack finds nothing new
+        start = time.perf_counter()
+        _, added = pack_directory(data_dir, packed_dir, CLASSES, args.sequence_length)
+        repack_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        X_files, _ = load_per_file(data_dir)
+        per_file_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        X_packed, _ = load_packed(packed_dir)
+        packed_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        dataset = PackedDataset(packed_dir)
+        _ = dataset.sequences[len(dataset) // 2]
+        open_time = time.perf_counter() - start
+
+        assert X_files.shape == X_packed.shape
+
+        print(f"{args.sequences} sequences of {args.sequence_length} frames")
+        print(f"initial pack:         {pack_time:8.3f}s")
+        print(f"incremental no-op:    {repack_time:8.3f}s ({added} added)")
+        print(f"per-file load:        {per_file_time:8.3f}s")
+        print(f"packed load (copy):   {packed_time:8.3f}s  ({per_file_time / packed_time:.1f}x faster)")
+        print(f"packed open + 1 read: {open_time * 1000:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
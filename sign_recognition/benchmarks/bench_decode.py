@@ -0,0 +1,134 @@
+"""
+Benchmark the per-frame decode path, before and after the lean decoder.
+Runs the same frames through:
+
+    original  b64decode of the split data URL, full-size BGR imdecode,
+              a cvtColor copy and landmarks as a list of lists, stacked
+              into an array per request
+    lean      a2b_base64, JPEG decoding straight to RGB at a reduced scale
+              (--min-side) and landmarks written into a preallocated
+              (T, 21, 3) array
+
+and reports frames/s with and without MediaPipe, the memory allocated at
+peak while processing a frame (tracemalloc, which also sees NumPy and
+OpenCV image buffers), and how far reduced-scale landmarks are from
+full-scale ones. Frames are read from a directory of JPEGs if given, otherwise synthesized.
+
+Usage: python benchmarks/bench_decode.py [--frames-dir DIR] [--frames 200]
+                                         [--width 640] [--height 480] [--min-side 240]
+"""
+import argparse
+import base64
+import os
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_extraction import load_frames
+from extraction import (NUM_HAND_LANDMARKS, bytes_to_rgb, create_hands, decode_base64_frame,
+                        landmarks_from_rgb)
+
+
+class NoHands:
+    """Stands in for MediaPipe to time decoding on its own"""
+
+    def process(self, rgb_frame):
+        return type("Results", (), {"multi_hand_landmarks": None})()
+
+
+def original_request(frames, hands):
+    """The decode path before the lean decoder, copied here to keep it measurable"""
+    sequence = []
+    for b64 in frames:
+        if "data:image" in b64:
+            b64 = b64.split(',')[1]
+        frame = cv2.imdecode(np.frombuffer(base64.b64decode(b64), np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            continue
+        results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if results.multi_hand_landmarks:
+            sequence.append([[lm.x, lm.y, lm.z] for lm in results.multi_hand_landmarks[0].landmark])
+        else:
+            sequence.append(None)
+    hand_frames = [landmarks for landmarks in sequence if landmarks is not None]
+    return np.array(hand_frames, dtype=np.float32), sequence
+
+
+def lean_request(frames, hands, min_side):
+    rows = np.empty((len(frames), NUM_HAND_LANDMARKS, 3), dtype=np.float32)
+    sequence = []
+    for b64, row in zip(frames, rows):
+        frame = bytes_to_rgb(decode_base64_frame(b64), min_side)
+        sequence.append(None if frame is None else landmarks_from_rgb(frame, hands, 1, row))
+    found = [i for i, landmarks in enumerate(sequence) if landmarks is not None]
+    return rows[found], sequence
+
+
+def frames_per_second(run, frames, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run(frames)
+        best = min(best, time.perf_counter() - start)
+    return len(frames) / best
+
+
+def allocation_per_frame(run, frames):
+    """Mean and largest KB allocated at once while processing a single frame"""
+    tracemalloc.start()
+    try:
+        peaks = []
+        for frame in frames:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            run([frame])
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return np.mean(peaks) / 1024, max(peaks) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames-dir", default=None)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--min-side", type=int, default=240, help="Shortest side the reduced decode keeps")
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames_dir, args.frames, args.width, args.height)
+    print(f"{len(frames)} frames, reduced decode keeps a short side of at least {args.min_side}px\n")
+
+    hands = create_hands(static_image_mode=True)
+    paths = {
+        "original": lambda batch, hands: original_request(batch, hands),
+        "lean": lambda batch, hands: lean_request(batch, hands, args.min_side),
+    }
+
+    print(f"{'path':<10} {'decode fps':>11} {'with hands fps':>15} {'KB/frame':>9} {'max KB':>8}")
+    for name, run in paths.items():
+        decode_fps = frames_per_second(lambda batch: run(batch, NoHands()), frames)
+        hands_fps = frames_per_second(lambda batch: run(batch, hands), frames, repeats=1)
+        allocated, peak = allocation_per_frame(lambda batch: run(batch, NoHands()), frames)
+        print(f"{name:<10} {decode_fps:>11.0f} {hands_fps:>15.1f} {allocated:>9.1f} {peak:>8.1f}")
+
+    # Landmark agreement between full and reduced scale, where both find a hand
+    _, full = lean_request(frames, hands, 0)
+    _, reduced = lean_request(frames, hands, args.min_side)
+    both = [(a, b) for a, b in zip(full, reduced) if a is not None and b is not None]
+    detected = sum(a is not None for a in full), sum(b is not None for b in reduced)
+    print(f"\nHands found: {detected[0]} at full scale, {detected[1]} reduced")
+    if both:
+        error = np.mean([np.abs(a - b).mean() for a, b in both])
+        print(f"Mean absolute landmark difference (normalized coordinates): {error:.4f}")
+    hands.close()
+
+
+if __name__ == "__main__":
+    main()
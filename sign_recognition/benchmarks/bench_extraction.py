@@ -0,0 +1,82 @@
+"""
+Benchmark parallel frame extraction against the serial per-frame loop.
+Frames are read from a directory of JPEGs if given, otherwise synthesized.
+
+Usage: python benchmarks/bench_extraction.py [--frames-dir DIR] [--frames 200] [--workers 4] [--mode thread]
+"""
+import argparse
+import base64
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction import FrameExtractor, base64_to_image, create_hands, landmarks_from_frame
+
+
+def load_frames(frames_dir, count, width=160, height=120):
+    """Return a list of base64 data URLs like the ones quiz.js sends"""
+    encoded = []
+    if frames_dir:
+        names = sorted(f for f in os.listdir(frames_dir) if f.lower().endswith(('.jpg', '.jpeg')))
+        for name in names[:count]:
+            with open(os.path.join(frames_dir, name), 'rb') as f:
+                encoded.append("data:image/jpeg;base64," + base64.b64encode(f.read()).decode())
+    else:
+        rng = np.random.default_rng(0)
+        for _ in range(count):
+            img = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+            ok, buf = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 50])
+            encoded.append("data:image/jpeg;base64," + base64.b64encode(buf.tobytes()).decode())
+    return encoded
+
+
+def run_serial(frames):
+    """Baseline: the original recognize_sign loop with one shared Hands"""
+    hands = create_hands(static_image_mode=False)
+    start = time.perf_counter()
+    results = []
+    for b64 in frames:
+        frame = base64_to_image(b64)
+        results.append(None if frame is None else landmarks_from_frame(frame, hands))
+    return time.perf_counter() - start, results
+
+
+def run_parallel(frames, workers, mode):
+    extractor = FrameExtractor(num_workers=workers, mode=mode)
+    # Warm up so every worker has created its Hands instance
+    extractor.extract_sync(frames[:workers * 2])
+    start = time.perf_counter()
+    results = extractor.extract_sync(frames)
+    elapsed = time.perf_counter() - start
+    extractor.shutdown()
+    return elapsed, [landmarks for _, landmarks in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames-dir", default=None)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--mode", choices=["thread", "process"], default="thread")
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames_dir, args.frames)
+    print(f"{len(frames)} frames, {args.workers} {args.mode} workers")
+
+    serial_time, serial_results = run_serial(frames)
+    parallel_time, parallel_results = run_parallel(frames, args.workers, args.mode)
+
+    serial_hits = sum(r is not None for r in serial_results)
+    parallel_hits = sum(r is not None for r in parallel_results)
+    print(f"serial:   {len(frames) / serial_time:8.1f} fps  ({serial_hits} frames with hands)")
+    print(f"parallel: {len(frames) / parallel_time:8.1f} fps  ({parallel_hits} frames with hands)")
+    print(f"speedup:  {serial_time / parallel_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Compare plain normalized landmarks with the engineered features of features.py.
+Each configuration (architecture + feature set) is trained on the same
+sequences and reported with its parameter count, batch-1 CPU latency, the
+epoch at which it first reaches the target validation accuracy, and its best
+validation accuracy. Also times feature computation, both fresh and read back
+from the packed dataset's features cache.
+
+Uses the packed dataset if it exists, otherwise synthetic sequences in which a
+share of hands is mirrored (left-handed signers) and rotated, the variation
+the engineered features are meant to absorb.
+
+Usage: python benchmarks/bench_features.py [--configs bilstm:landmarks,gru:landmarks,gru:engineered,tcn:engineered]
+                                           [--epochs 30] [--target-accuracy 0.95] [--mirror-fraction 0.5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+from bench_architectures import measure_latency
+from dataset import PackedDataset
+from model import SignLanguageModel
+
+
+def load_sequences(model, per_class, mirror_fraction):
+    """Raw (N, T, 21, 3) sequences and labels"""
+    packed_dir = os.path.join(SERVER_DIR, 'training_data_packed')
+    if os.path.exists(packed_dir):
+        dataset = PackedDataset(packed_dir, model.classes, model.sequence_length)
+        return np.asarray(dataset.sequences), np.asarray(dataset.labels)
+
+    from synthetic_data import SIGNS, synthetic_sequence
+    rng = np.random.default_rng(0)
+    sequences, labels = [], []
+    for sign in [sign for sign in model.classes if sign in SIGNS]:
+        for _ in range(per_class):
+            sequence = synthetic_sequence(sign, model.sequence_length, rng)
+            if rng.random() < mirror_fraction:
+                sequence[..., 0] = 1.0 - sequence[..., 0]
+            sequences.append(sequence)
+            labels.append(model.classes.index(sign))
+    return np.stack(sequences), np.array(labels)
+
+
+def time_feature_cache(sequences, labels, classes, sequence_length):
+    """Seconds to featurize every sequence fresh, and to read the features back from the cache"""
+    with tempfile.TemporaryDirectory() as model_dir, tempfile.TemporaryDirectory() as packed_dir:
+        model = SignLanguageModel(model_dir=model_dir, classes=classes, feature_set='engineered')
+        dataset = PackedDataset(packed_dir, classes, sequence_length)
+        dataset.append(sequences, labels)
+        start = time.perf_counter()
+        np.asarray(model.packed_features(dataset))
+        fresh = time.perf_counter() - start
+        start = time.perf_counter()
+        np.asarray(model.packed_features(PackedDataset(packed_dir)))
+        cached = time.perf_counter() - start
+    return fresh, cached
+
+
+def run_config(architecture, feature_set, sequences, labels, classes, args):
+    import tensorflow as tf
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        model = SignLanguageModel(model_dir=model_dir, classes=classes, architecture=architecture,
+                                  feature_set=feature_set)
+        start = time.perf_counter()
+        X = model.preprocess_batch(sequences).astype(np.float32)
+        preprocess_seconds = time.perf_counter() - start
+        model.create_model()
+
+        order = np.random.default_rng(42).permutation(len(X))
+        num_val = len(X) // 5
+        val_idx, train_idx = order[:num_val], order[num_val:]
+        y_onehot = tf.keras.utils.to_categorical(labels, num_classes=len(classes))
+
+        history = model.model.fit(
+            X[train_idx], y_onehot[train_idx],
+            epochs=args.epochs, batch_size=args.batch_size, verbose=0,
+            validation_data=(X[val_idx], y_onehot[val_idx])
+        )
+        accuracy = history.history["val_categorical_accuracy"]
+        reached = next((epoch + 1 for epoch, acc in enumerate(accuracy) if acc >= args.target_accuracy), None)
+        p50, _ = measure_latency(model.model, (model.sequence_length, model.num_features), 1, args.runs)
+        return {
+            "config": f"{architecture}:{feature_set}",
+            "features": model.num_features,
+            "params": model.model.count_params(),
+            "preprocess_ms_per_seq": preprocess_seconds * 1000 / len(X),
+            "latency_p50_ms": p50,
+            "epochs_to_target": reached,
+            "val_accuracy": float(max(accuracy)),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--configs", default="bilstm:landmarks,gru:landmarks,gru:engineered,tcn:engineered")
+    parser.add_argument("--epochs", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--target-accuracy", type=float, default=0.95)
+    parser.add_argument("--per-class", type=int, default=200, help="synthetic sequences per sign")
+    parser.add_argument("--mirror-fraction", type=float, default=0.5)
+    parser.add_argument("--runs", type=int, default=200, help="timed forward passes per configuration")
+    args = parser.parse_args()
+
+    reference = SignLanguageModel()
+    sequences, labels = load_sequences(reference, args.per_class, args.mirror_fraction)
+    print(f"{len(sequences)} sequences, {len(reference.classes)} classes")
+
+    fresh, cached = time_feature_cache(sequences, labels, reference.classes, reference.sequence_length)
+    print(f"Engineered features: {fresh:.2f}s to compute, {cached:.3f}s to read from the cache\n")
+
+    results = []
+    for config in args.configs.split(","):
+        architecture, feature_set = config.split(":")
+        results.append(run_config(architecture, feature_set, sequences, labels, reference.classes, args))
+
+    print(f"{'config':<20} {'inputs':>6} {'params':>9} {'prep ms':>8} {'p50 ms':>7} "
+          f"{'epochs to ' + format(args.target_accuracy, '.0%'):>13} {'val acc':>8}")
+    for r in results:
+        reached = r["epochs_to_target"] if r["epochs_to_target"] is not None else "-"
+        print(f"{r['config']:<20} {r['features']:>6} {r['params']:>9,} {r['preprocess_ms_per_seq']:>8.3f} "
+              f"{r['latency_p50_ms']:>7.2f} {reached:>13} {r['val_accuracy'] * 100:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Load test for the Express gateway's recognition proxy.
+Runs the gateway (index.js) in front of a stub backend that reads the body
+and answers immediately, sends concurrent /api/quiz requests carrying base64
+frames, and reports gateway CPU time per request, peak and final resident
+memory, and the latency the gateway adds over calling the stub directly.
+
+The gateway is measured at two revisions: the working tree and a baseline
+(by default the commit before the streaming proxy was introduced), which is
+checked out into a temporary file next to index.js. The baseline hardcodes
+ports 3000 and 8000, so both must be free. Needs `npm install` in the
+repository root.
+
+Usage: python benchmarks/bench_gateway.py [--requests 500] [--concurrency 16]
+                                          [--frames 10] [--frame-kb 30] [--baseline-ref REV]
+"""
+import argparse
+import base64
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+GATEWAY_PORT = 3000
+BACKEND_PORT = 8000
+
+RESULT = json.dumps({"isCorrect": True, "predictedSign": "one", "confidence": 0.9}).encode()
+
+
+class StubBackend(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(RESULT)))
+        self.end_headers()
+        self.wfile.write(RESULT)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def baseline_revision(path="proxy.js"):
+    """The commit before path was added"""
+    added = subprocess.run(
+        ["git", "log", "--diff-filter=A", "--format=%H", "--", path],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    return f"{added}^" if added else "HEAD"
+
+
+def cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    # utime and stime, fields 14 and 15 of the full line
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def memory_mb(pid):
+    status = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            status[name] = value.strip()
+    return int(status["VmRSS"].split()[0]) / 1024, int(status["VmHWM"].split()[0]) / 1024
+
+
+def run_load(port, body, num_requests, concurrency):
+    """Latencies in ms, each worker thread reusing one keep-alive connection like a browser"""
+    local = threading.local()
+
+    def request(_):
+        if not hasattr(local, "connection"):
+            local.connection = http.client.HTTPConnection("127.0.0.1", port)
+        start = time.perf_counter()
+        local.connection.request("POST", "/api/quiz", body, {"Content-Type": "application/json"})
+        response = local.connection.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(request, range(num_requests)))
+
+
+def wait_for_port(port, timeout=20):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            http.client.HTTPConnection("127.0.0.1", port, timeout=1).connect()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Nothing listening on port {port} after {timeout}s")
+
+
+def measure_gateway(script, body, args):
+    gateway = subprocess.Popen(["node", script], cwd=REPO_ROOT,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(GATEWAY_PORT)
+        run_load(GATEWAY_PORT, body, args.concurrency * 4, args.concurrency)  # warm up
+        cpu_before = cpu_seconds(gateway.pid)
+        latencies = run_load(GATEWAY_PORT, body, args.requests, args.concurrency)
+        cpu = cpu_seconds(gateway.pid) - cpu_before
+        rss, peak_rss = memory_mb(gateway.pid)
+    finally:
+        gateway.terminate()
+        gateway.wait()
+    return latencies, cpu, rss, peak_rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--frames", type=int, default=10, help="Frames per quiz attempt")
+    parser.add_argument("--frame-kb", type=int, default=30, help="JPEG size per frame before base64")
+    parser.add_argument("--baseline-ref", default=None, help="git revision to compare against")
+    args = parser.parse_args()
+
+    frame = "data:image/jpeg;base64," + base64.b64encode(os.urandom(args.frame_kb * 1024)).decode()
+    body = json.dumps({"frames": [frame] * args.frames, "expectedSign": "one"}).encode()
+    print(f"{args.requests} requests of {len(body) / 1024:.0f} KB, concurrency {args.concurrency}\n")
+
+    backend = ThreadingHTTPServer(("127.0.0.1", BACKEND_PORT), StubBackend)
+    threading.Thread(target=backend.serve_forever, daemon=True).start()
+
+    revision = args.baseline_ref or baseline_revision()
+    baseline_script = os.path.join(REPO_ROOT, ".gateway-baseline.js")
+    with open(baseline_script, "w") as f:
+        f.write(subprocess.run(["git", "show", f"{revision}:index.js"], cwd=REPO_ROOT,
+                               capture_output=True, text=True, check=True).stdout)
+    try:
+        direct = run_load(BACKEND_PORT, body, args.requests, args.concurrency)
+        results = {
+            f"baseline ({revision})": measure_gateway(baseline_script, body, args),
+            "working tree": measure_gateway("index.js", body, args),
+        }
+    finally:
+        os.remove(baseline_script)
+        backend.shutdown()
+
+    direct_p50 = np.percentile(direct, 50)
+    print(f"{'gateway':<28} {'CPU ms/req':>10} {'RSS MB':>7} {'peak MB':>8} {'p50 ms':>7} {'p99 ms':>7} {'added p50':>10}")
+    for name, (latencies, cpu, rss, peak_rss) in results.items():
+        p50, p99 = np.percentile(latencies, [50, 99])
+        print(f"{name:<28} {cpu * 1000 / args.requests:>10.2f} {rss:>7.1f} {peak_rss:>8.1f} "
+              f"{p50:>7.1f} {p99:>7.1f} {p50 - direct_p50:>9.1f}ms")
+    print(f"{'stub backend, direct':<28} {'':>10} {'':>7} {'':>8} {direct_p50:>7.1f} {np.percentile(direct, 99):>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
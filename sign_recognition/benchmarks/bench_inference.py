@@ -0,0 +1,86 @@
+"""
+Benchmark the micro-batching inference engine against per-request predict.
+Simulates a burst of concurrent quiz submissions with synthetic landmarks.
+
+Usage: python benchmarks/bench_inference.py [--requests 64] [--max-batch 16] [--max-wait-ms 10]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model import SignLanguageModel
+from inference import BatchedInferenceEngine
+
+
+def synthetic_sequences(count, sequence_length, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.random((sequence_length, 21, 3)).astype(np.float32) for _ in range(count)]
+
+
+async def run_serial(model, sequences):
+    """Baseline: one blocking predict call per request on the event loop"""
+    latencies = []
+    start = time.perf_counter()
+    for seq in sequences:
+        t0 = time.perf_counter()
+        model.predict(seq)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return time.perf_counter() - start, latencies
+
+
+async def run_batched(model, sequences, max_batch, max_wait_ms):
+    engine = BatchedInferenceEngine(model, max_batch_size=max_batch, max_wait_ms=max_wait_ms)
+    await engine.start()
+
+    async def one(seq):
+        t0 = time.perf_counter()
+        await engine.predict(seq)
+        return (time.perf_counter() - t0) * 1000
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one(seq) for seq in sequences))
+    elapsed = time.perf_counter() - start
+    stats = engine.stats()
+    await engine.stop()
+    return elapsed, list(latencies), stats
+
+
+def report(label, elapsed, latencies, count):
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"{label:<10} {count / elapsed:8.1f} req/s  p50={p50:7.1f}ms  p95={p95:7.1f}ms  p99={p99:7.1f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--max-batch", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    model = SignLanguageModel()
+    if model.model is None:
+        print("No trained model found, benchmarking an untrained one")
+        model.create_model()
+
+    sequences = synthetic_sequences(args.requests, model.sequence_length)
+
+    # Warm up graph tracing so neither path pays for it
+    model.predict_batch(sequences[:args.max_batch])
+    model.predict(sequences[0])
+
+    elapsed, latencies = await run_serial(model, sequences)
+    report("serial", elapsed, latencies, args.requests)
+
+    elapsed, latencies, stats = await run_batched(model, sequences, args.max_batch, args.max_wait_ms)
+    report("batched", elapsed, latencies, args.requests)
+    print(f"mean batch size: {stats['batch_size']['mean']:.1f} over {stats['batch_size']['count']} batches")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
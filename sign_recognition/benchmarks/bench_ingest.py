@@ -0,0 +1,83 @@
+"""
+Compare the base64 JPEG ingest path with the binary landmark path.
+Reports payload size for each encoding and, if a server is running,
+end-to-end request latency for /api/quiz and /api/quiz/landmarks.
+
+Usage: python benchmarks/bench_ingest.py [--url http://localhost:8000] [--frames 10] [--requests 20]
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from landmark_codec import encode_landmark_bytes, encode_msgpack_landmarks
+
+
+def synthetic_jpeg_frames(count, width=160, height=120, quality=50):
+    """Frames shaped like quiz.js captures (320x240 webcam scaled by 0.5, JPEG q=0.5)"""
+    rng = np.random.default_rng(0)
+    frames = []
+    for _ in range(count):
+        img = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+        img = cv2.GaussianBlur(img, (9, 9), 0)
+        ok, buf = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        frames.append("data:image/jpeg;base64," + base64.b64encode(buf.tobytes()).decode())
+    return frames
+
+
+def post(url, body, content_type):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": content_type}, method="POST")
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def measure(label, url, body, content_type, requests):
+    try:
+        latencies = [post(url, body, content_type) for _ in range(requests)]
+    except urllib.error.URLError as e:
+        print(f"{label:<18} skipped ({e})")
+        return
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"{label:<18} p50={p50:7.1f}ms  p95={p95:7.1f}ms  p99={p99:7.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--frames", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    frames = synthetic_jpeg_frames(args.frames)
+    landmarks = np.random.default_rng(0).random((args.frames, 21, 3), dtype=np.float32)
+
+    payloads = {
+        "jpeg+json": (json.dumps({"frames": frames, "expectedSign": "one"}).encode(), "application/json", "/api/quiz"),
+        "raw float32": (encode_landmark_bytes(landmarks, "float32"), "application/octet-stream", "/api/quiz/landmarks?expectedSign=one&dtype=float32"),
+        "raw float16": (encode_landmark_bytes(landmarks, "float16"), "application/octet-stream", "/api/quiz/landmarks?expectedSign=one&dtype=float16"),
+        "msgpack float16": (encode_msgpack_landmarks(landmarks, "one", "float16"), "application/msgpack", "/api/quiz/landmarks"),
+    }
+
+    print(f"Payload size for {args.frames} frames:")
+    baseline = len(payloads["jpeg+json"][0])
+    for label, (body, _, _) in payloads.items():
+        print(f"  {label:<18} {len(body):>9} bytes  ({baseline / len(body):6.1f}x smaller than jpeg+json)")
+
+    print(f"\nEnd-to-end latency against {args.url} ({args.requests} requests each):")
+    for label, (body, content_type, path) in payloads.items():
+        measure(label, args.url + path, body, content_type, args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark hot-swapping between registry versions under load.
+A steady stream of concurrent predictions runs while the model manager swaps
+back and forth between two versions; reports swap time, resident memory
+overhead while both models are loaded, and request latency and failures
+during the swaps.
+
+Usage: python benchmarks/bench_model_swap.py VERSION_A VERSION_B [--swaps 5] [--concurrency 8] [--backend keras]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference import BatchedInferenceEngine
+from metrics import current_rss_mb
+from model import SignLanguageModel
+from model_manager import ModelManager
+from registry import ModelRegistry
+
+
+async def run(args):
+    registry = ModelRegistry()
+
+    def load(version):
+        model = SignLanguageModel(backend=args.backend, model_dir=registry.path(version))
+        model.warm_up(batch_sizes=[1, 16])
+        return model
+
+    manager = ModelManager(load, lambda model: BatchedInferenceEngine(model))
+    await manager.swap(args.versions[0])
+    print(f"Loaded {args.versions[0]}, RSS {current_rss_mb():.1f} MB")
+
+    rng = np.random.default_rng(0)
+    sequence_length = manager.current.model.sequence_length
+    latencies, failures = [], 0
+    stop = asyncio.Event()
+
+    async def client():
+        nonlocal failures
+        while not stop.is_set():
+            sequence = rng.random((sequence_length, 21, 3)).astype(np.float32)
+            start = time.perf_counter()
+            try:
+                async with manager.use() as served:
+                    await served.engine.predict(sequence)
+                latencies.append((time.perf_counter() - start) * 1000)
+            except Exception:
+                failures += 1
+
+    clients = [asyncio.create_task(client()) for _ in range(args.concurrency)]
+    swaps = []
+    for i in range(args.swaps):
+        await asyncio.sleep(args.interval)
+        swaps.append(await manager.swap(args.versions[(i + 1) % 2]))
+    await asyncio.sleep(args.interval)
+    stop.set()
+    await asyncio.gather(*clients)
+    await manager.stop()
+
+    swap_times = [swap["total_seconds"] for swap in swaps]
+    overheads = [swap["swap_overhead_mb"] for swap in swaps]
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"{len(swaps)} swaps: mean {np.mean(swap_times):.2f}s, max {max(swap_times):.2f}s")
+    print(f"Memory while both models are loaded: +{np.mean(overheads):.1f} MB mean, +{max(overheads):.1f} MB max")
+    print(f"{len(latencies)} requests during the run: p50={p50:.1f}ms p99={p99:.1f}ms, {failures} failed")
+    print(f"Final RSS {current_rss_mb():.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("versions", nargs=2)
+    parser.add_argument("--swaps", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between swaps")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--backend", choices=SignLanguageModel.BACKENDS, default="keras")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Overload test for admission control on /api/quiz.
+Starts the server, measures the request rate it sustains with
+ADMISSION_MAX_CONCURRENT requests in flight, then offers --overload times
+that rate as an open-loop stream of frame uploads (arrivals do not wait for
+earlier responses, as with real users) with admission control on and off.
+Reports latency of successful requests, how many were rejected (429/503)
+or failed, and the peak resident memory of the server process tree.
+
+Latency is measured from each request's scheduled send time, so time spent
+waiting for a free client connection counts too.
+
+Usage: python benchmarks/bench_overload.py [--overload 5] [--duration 20] [--frames 10]
+                                           [--max-concurrent 8] [--max-queue 16] [--port 8767]
+"""
+import argparse
+import base64
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from bench_workers import SERVER_DIR, tree_rss_mb, wait_until_ready
+
+
+def quiz_bodies(count, frames, rng):
+    """JSON bodies of noise JPEG frames; distinct, so no cache answers for the server"""
+    bodies = []
+    for _ in range(count):
+        encoded = []
+        for _ in range(frames):
+            image = rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)
+            _, jpeg = cv2.imencode(".jpg", image)
+            encoded.append("data:image/jpeg;base64," + base64.b64encode(jpeg.tobytes()).decode())
+        bodies.append(json.dumps({"frames": encoded, "expectedSign": "one"}).encode())
+    return bodies
+
+
+def post_quiz(port, body, timeout):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    try:
+        connection.request("POST", "/api/quiz", body, {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    except OSError:
+        return None
+    finally:
+        connection.close()
+
+
+def closed_loop_rate(port, bodies, concurrency, num_requests, timeout):
+    """Requests per second with a fixed number in flight"""
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        statuses = list(pool.map(lambda i: post_quiz(port, bodies[i % len(bodies)], timeout), range(num_requests)))
+        elapsed = time.perf_counter() - start
+    return sum(status == 200 for status in statuses) / elapsed
+
+
+def open_loop(port, bodies, rate, duration, timeout, server_pid):
+    """Send at a fixed rate regardless of responses; returns (status, latency ms) pairs and peak RSS"""
+    num_requests = int(rate * duration)
+    results = []
+    lock = threading.Lock()
+    peak_rss = [0.0]
+    done = threading.Event()
+
+    def sample_memory():
+        while not done.is_set():
+            peak_rss[0] = max(peak_rss[0], tree_rss_mb(server_pid))
+            done.wait(0.2)
+
+    def request(i, start):
+        scheduled = start + i / rate
+        time.sleep(max(0.0, scheduled - time.perf_counter()))
+        status = post_quiz(port, bodies[i % len(bodies)], timeout)
+        with lock:
+            results.append((status, (time.perf_counter() - scheduled) * 1000))
+
+    sampler = threading.Thread(target=sample_memory, daemon=True)
+    sampler.start()
+    # Enough client threads that sending never waits on slow responses
+    with ThreadPoolExecutor(max_workers=min(1024, int(rate * timeout) + 16)) as pool:
+        start = time.perf_counter()
+        for i in range(num_requests):
+            pool.submit(request, i, start)
+    done.set()
+    sampler.join()
+    return results, peak_rss[0]
+
+
+def start_server(port, env):
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=SERVER_DIR, env={**os.environ, **env}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def stop_server(server):
+    server.send_signal(signal.SIGINT)
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--overload", type=float, default=5.0, help="Offered load as a multiple of capacity")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of offered load")
+    parser.add_argument("--frames", type=int, default=10, help="Frames per request")
+    parser.add_argument("--max-concurrent", type=int, default=8)
+    parser.add_argument("--max-queue", type=int, default=16)
+    parser.add_argument("--deadline-ms", type=float, default=10000)
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds to wait for the model to load")
+    args = parser.parse_args()
+
+    bodies = quiz_bodies(64, args.frames, np.random.default_rng(0))
+    client_timeout = args.deadline_ms / 1000 * 3
+    common = {"REQUEST_DEADLINE_MS": str(args.deadline_ms), "ADMISSION_MAX_QUEUE": str(args.max_queue),
+              "LANDMARK_CACHE_ENTRIES": "0", "PREDICTION_CACHE_ENTRIES": "0"}
+    url = f"http://127.0.0.1:{args.port}"
+
+    server = start_server(args.port, {**common, "ADMISSION_MAX_CONCURRENT": str(args.max_concurrent)})
+    try:
+        wait_until_ready(url, 1, args.timeout)
+        closed_loop_rate(args.port, bodies, args.max_concurrent, args.max_concurrent * 2, client_timeout)  # warm up
+        capacity = closed_loop_rate(args.port, bodies, args.max_concurrent, args.max_concurrent * 10, client_timeout)
+    finally:
+        stop_server(server)
+    rate = capacity * args.overload
+    print(f"Capacity {capacity:.1f} req/s with {args.max_concurrent} in flight; "
+          f"offering {rate:.1f} req/s for {args.duration:.0f}s ({args.frames} frames per request)\n")
+
+    print(f"{'admission':<10} {'ok':>6} {'429':>6} {'503':>6} {'other':>6} "
+          f"{'ok p50 ms':>10} {'ok p99 ms':>10} {'all p99 ms':>11} {'peak MB':>8}")
+    for name, max_concurrent in (("on", args.max_concurrent), ("off", 0)):
+        server = start_server(args.port, {**common, "ADMISSION_MAX_CONCURRENT": str(max_concurrent)})
+        try:
+            wait_until_ready(url, 1, args.timeout)
+            results, peak_rss = open_loop(args.port, bodies, rate, args.duration, client_timeout, server.pid)
+        finally:
+            stop_server(server)
+
+        statuses = [status for status, _ in results]
+        ok = [latency for status, latency in results if status == 200]
+        counts = {code: statuses.count(code) for code in (200, 429, 503)}
+        other = len(statuses) - sum(counts.values())
+        ok_p50, ok_p99 = np.percentile(ok, [50, 99]) if ok else (float("nan"), float("nan"))
+        all_p99 = np.percentile([latency for _, latency in results], 99)
+        print(f"{name:<10} {counts[200]:>6} {counts[429]:>6} {counts[503]:>6} {other:>6} "
+              f"{ok_p50:>10.0f} {ok_p99:>10.0f} {all_p99:>11.0f} {peak_rss:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
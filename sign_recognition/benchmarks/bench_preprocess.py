@@ -0,0 +1,86 @@
+"""
+Micro-benchmark for vectorized landmark preprocessing.
+Compares SignLanguageModel.preprocess_batch against the original per-frame
+list implementation and checks that both produce identical output.
+
+Usage: python benchmarks/bench_preprocess.py [--sizes 1000 10000 100000] [--legacy-limit 10000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model import SignLanguageModel
+
+
+def legacy_preprocess_landmarks(landmarks_sequence, sequence_length):
+    """The original list-based preprocess_landmarks, kept as a reference"""
+    if isinstance(landmarks_sequence, np.ndarray):
+        landmarks_sequence = landmarks_sequence.tolist()
+
+    if len(landmarks_sequence) < sequence_length:
+        last_frame = landmarks_sequence[-1]
+        landmarks_sequence = landmarks_sequence + [last_frame] * (sequence_length - len(landmarks_sequence))
+    elif len(landmarks_sequence) > sequence_length:
+        landmarks_sequence = landmarks_sequence[:sequence_length]
+
+    flattened_sequence = []
+    for landmarks in landmarks_sequence:
+        landmarks = np.array(landmarks)
+        centered = landmarks - landmarks[0]
+        max_dist = np.max(np.abs(centered))
+        normalized = centered / max_dist if max_dist > 0 else centered
+        flattened_sequence.append(normalized.flatten())
+
+    return np.array(flattened_sequence)
+
+
+def check_parity(model, rng):
+    """Exact equality on padded, truncated, exact-length and degenerate inputs"""
+    cases = [rng.random((n, 21, 3)).astype(np.float32) for n in (1, 7, 30, 45)]
+    cases.append(np.zeros((12, 21, 3), dtype=np.float32))
+    for seq in cases:
+        expected = legacy_preprocess_landmarks(seq, model.sequence_length)
+        assert np.array_equal(model.preprocess_landmarks(seq), expected), f"mismatch for shape {seq.shape}"
+        assert np.array_equal(model.preprocess_landmarks(seq.tolist()), expected)
+
+    batch = rng.random((64, 20, 21, 3)).astype(np.float32)
+    expected = np.stack([legacy_preprocess_landmarks(s, model.sequence_length) for s in batch])
+    assert np.array_equal(model.preprocess_batch(batch), expected), "batch mismatch"
+    print("parity: vectorized output identical to legacy implementation")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--legacy-limit", type=int, default=10000,
+                        help="skip the slow legacy path above this many sequences")
+    args = parser.parse_args()
+
+    model = SignLanguageModel()
+    rng = np.random.default_rng(0)
+    check_parity(model, rng)
+
+    for n in args.sizes:
+        data = rng.random((n, model.sequence_length, 21, 3), dtype=np.float32)
+
+        start = time.perf_counter()
+        model.preprocess_batch(data)
+        vectorized = time.perf_counter() - start
+
+        if n <= args.legacy_limit:
+            start = time.perf_counter()
+            for seq in data:
+                legacy_preprocess_landmarks(seq, model.sequence_length)
+            legacy = time.perf_counter() - start
+            print(f"N={n:>7}: legacy {legacy:8.3f}s  vectorized {vectorized:8.4f}s  speedup {legacy / vectorized:7.1f}x")
+        else:
+            print(f"N={n:>7}: legacy      (skipped)  vectorized {vectorized:8.4f}s")
+
+
+if __name__ == "__main__":
+    main()
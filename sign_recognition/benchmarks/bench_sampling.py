@@ -0,0 +1,66 @@
+"""
+Benchmark adaptive frame sampling against running hand detection on every frame.
+Use a directory of frames from a real capture; synthetic frames contain no
+hands, so adaptive sampling would skip almost everything.
+Without a model the sampler only stops early on distinct hand frames.
+
+Usage: python benchmarks/bench_sampling.py --frames-dir DIR [--frames 120] [--stride 4] [--sequence-length 30]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_extraction import load_frames
+from extraction import FrameExtractor
+from sampling import AdaptiveSampler
+
+
+async def run_full(extractor, frames):
+    start = time.perf_counter()
+    results = await extractor.extract(frames)
+    elapsed = time.perf_counter() - start
+    hand_frames = sum(landmarks is not None for _, landmarks in results)
+    return elapsed, len(frames), hand_frames
+
+
+async def run_adaptive(extractor, frames, stride, sequence_length):
+    sampler = AdaptiveSampler(target_frames=sequence_length, stride=stride)
+    start = time.perf_counter()
+    landmarks, processed, _ = await sampler.run(frames, extractor.extract)
+    return time.perf_counter() - start, processed, len(landmarks)
+
+
+async def run(args):
+    frames = load_frames(args.frames_dir, args.frames)
+    # Static image mode without the landmark cache, so both runs do the full work
+    extractor = FrameExtractor(num_workers=args.workers)
+    extractor.extract_sync(frames[:args.workers * 2])
+    print(f"{len(frames)} frames, stride {args.stride}, target {args.sequence_length} hand frames")
+
+    full_time, full_processed, full_hands = await run_full(extractor, frames)
+    adaptive_time, adaptive_processed, adaptive_hands = await run_adaptive(
+        extractor, frames, args.stride, args.sequence_length
+    )
+    extractor.shutdown()
+
+    print(f"full:     {full_time * 1000:8.1f} ms  {full_processed} frames processed, {full_hands} with hands")
+    print(f"adaptive: {adaptive_time * 1000:8.1f} ms  {adaptive_processed} frames processed, {adaptive_hands} distinct hand frames kept")
+    print(f"speedup:  {full_time / adaptive_time:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames-dir", default=None)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--stride", type=int, default=4)
+    parser.add_argument("--sequence-length", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
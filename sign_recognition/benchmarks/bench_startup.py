@@ -0,0 +1,97 @@
+"""
+Startup benchmark for the recognition server.
+Measures the import time of main.py in a fresh interpreter, which heavy
+modules that import pulls in, time until /ready reports the model warm,
+and the latency of the first requests after that.
+
+Usage: python benchmarks/bench_startup.py [--port 8765] [--backend keras|tflite]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+from landmark_codec import encode_landmark_bytes
+
+HEAVY_MODULES = ["tensorflow", "keras", "sklearn", "mediapipe", "cv2"]
+
+IMPORT_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import():
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE], cwd=SERVER_DIR,
+        capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()[-1]
+    return json.loads(output)
+
+
+def post_landmarks(url):
+    body = encode_landmark_bytes(np.random.default_rng(0).random((10, 21, 3)), "float16")
+    request = urllib.request.Request(
+        f"{url}/api/quiz/landmarks?expectedSign=one&dtype=float16", data=body,
+        headers={"Content-Type": "application/octet-stream"}, method="POST"
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def wait_until_ready(url, timeout):
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(f"{url}/ready") as response:
+                if response.status == 200:
+                    return time.perf_counter() - start
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"Server not ready after {timeout}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--backend", default="keras")
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    result = measure_import()
+    print(f"import main: {result['seconds']:.2f}s, heavy modules loaded: {', '.join(result['loaded']) or 'none'}")
+
+    url = f"http://127.0.0.1:{args.port}"
+    env = dict(os.environ, MODEL_BACKEND=args.backend)
+    launched = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port)],
+        cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_ready(url, args.timeout)
+        print(f"process start to ready: {time.perf_counter() - launched:.2f}s")
+        print(f"first request:  {post_landmarks(url):.1f}ms")
+        print(f"second request: {post_landmarks(url):.1f}ms")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark concurrent streaming sessions on the hand tracker pool against a
+single Hands instance shared behind a lock (the pre-pool behaviour).
+Each session sends its frames in order, as a WebSocket client would.
+
+Usage: python benchmarks/bench_tracker_pool.py [--sessions 8] [--frames 60] [--pool-size 8] [--num-hands 1]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_extraction import load_frames
+from extraction import base64_to_image, create_hands, landmarks_from_frame
+from tracker_pool import HandsTrackerPool
+
+
+def run_shared(sessions, num_hands):
+    """Baseline: every session serialized through one tracker"""
+    hands = create_hands(static_image_mode=False, max_num_hands=num_hands)
+    lock = threading.Lock()
+
+    def run_session(frames):
+        for b64 in frames:
+            frame = base64_to_image(b64)
+            with lock:
+                landmarks_from_frame(frame, hands, num_hands)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(sessions)) as executor:
+        list(executor.map(run_session, sessions))
+    elapsed = time.perf_counter() - start
+    hands.close()
+    return elapsed
+
+
+def run_pooled(sessions, pool_size, num_hands):
+    pool = HandsTrackerPool(max_size=pool_size, max_num_hands=num_hands)
+
+    def run_session(session_id, frames):
+        for b64 in frames:
+            frame = base64_to_image(b64)
+            with pool.session(session_id) as hands:
+                landmarks_from_frame(frame, hands, num_hands)
+        pool.release(session_id)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(sessions)) as executor:
+        list(executor.map(run_session, range(len(sessions)), sessions))
+    elapsed = time.perf_counter() - start
+    stats = pool.stats()
+    pool.close()
+    return elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames-dir", default=None)
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--frames", type=int, default=60, help="Frames per session")
+    parser.add_argument("--pool-size", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--num-hands", type=int, choices=[1, 2], default=1)
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames_dir, args.frames)
+    sessions = [frames] * args.sessions
+    total = args.sessions * len(frames)
+    print(f"{args.sessions} sessions x {len(frames)} frames, pool of {args.pool_size}, {args.num_hands} hand(s)")
+
+    shared_time = run_shared(sessions, args.num_hands)
+    pooled_time, stats = run_pooled(sessions, args.pool_size, args.num_hands)
+
+    print(f"shared: {total / shared_time:8.1f} fps")
+    print(f"pooled: {total / pooled_time:8.1f} fps  ({stats['size']} trackers, "
+          f"{stats['reassignments']} reassignments, {stats['waits']} waits)")
+    print(f"speedup: {shared_time / pooled_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
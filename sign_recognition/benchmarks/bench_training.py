@@ -0,0 +1,134 @@
+"""
+Compare training throughput and accuracy across execution modes:
+eager (the old train.py default), compiled graph, graph + XLA and
+graph + mixed bfloat16. Each mode runs in its own process because
+TensorFlow runtime settings cannot change once initialized.
+
+Uses the packed dataset if it exists, otherwise separable synthetic data.
+
+Usage: python benchmarks/bench_training.py [--epochs 5] [--batch-size 16] [--threads 0]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+MODES = {
+    "eager": dict(eager=True),
+    "graph": dict(),
+    "graph+xla": dict(jit_compile=True),
+    "graph+bf16": dict(mixed_precision=True),
+}
+
+
+def synthetic_data(model, count=1500, seed=0):
+    """Class-dependent hand poses with noise, so accuracy is meaningful"""
+    rng = np.random.default_rng(seed)
+    prototypes = rng.random((len(model.classes), 21, 3))
+    y = rng.integers(0, len(model.classes), count)
+    X = prototypes[y][:, np.newaxis] + rng.normal(0, 0.05, (count, model.sequence_length, 21, 3))
+    return model.preprocess_batch(X), y
+
+
+def run_mode(mode, epochs, batch_size, threads):
+    """Train one mode in this process and return its measurements"""
+    import tensorflow as tf
+    from model import SignLanguageModel
+    from train import configure_tensorflow
+
+    options = MODES[mode]
+    bf16 = configure_tensorflow(
+        eager=options.get("eager", False),
+        intra_op_threads=threads,
+        inter_op_threads=threads,
+        mixed_precision=options.get("mixed_precision", False)
+    )
+
+    model = SignLanguageModel()
+    packed_dir = os.path.join(SERVER_DIR, 'training_data_packed')
+    if os.path.exists(packed_dir):
+        X, y = model.prepare_data_from_packed(packed_dir)
+    else:
+        X, y = synthetic_data(model)
+
+    # Fresh weights every run, never overwrite the saved model
+    model.model = None
+    model.jit_compile = options.get("jit_compile", False)
+    model.create_model()
+
+    rng = np.random.default_rng(42)
+    order = rng.permutation(len(X))
+    num_val = len(X) // 5
+    val_idx, train_idx = order[:num_val], order[num_val:]
+    y_onehot = tf.keras.utils.to_categorical(y, num_classes=len(model.classes))
+
+    epoch_times = []
+
+    class Timer(tf.keras.callbacks.Callback):
+        def on_epoch_begin(self, epoch, logs=None):
+            self.start = time.perf_counter()
+
+        def on_epoch_end(self, epoch, logs=None):
+            epoch_times.append(time.perf_counter() - self.start)
+
+    history = model.model.fit(
+        X[train_idx], y_onehot[train_idx],
+        epochs=epochs, batch_size=batch_size, verbose=0,
+        validation_data=(X[val_idx], y_onehot[val_idx]),
+        callbacks=[Timer()]
+    )
+
+    steps_per_epoch = int(np.ceil(len(train_idx) / batch_size))
+    # The first epoch includes tracing/compilation
+    steady = epoch_times[1:] or epoch_times
+    return {
+        "mode": mode,
+        "bf16_enabled": bf16,
+        "first_epoch_s": epoch_times[0],
+        "steps_per_sec": steps_per_epoch / float(np.mean(steady)),
+        "val_accuracy": float(history.history["val_categorical_accuracy"][-1]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--threads", type=int, default=0, help="intra/inter-op threads, 0 = TensorFlow default")
+    parser.add_argument("--mode", choices=list(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.epochs, args.batch_size, args.threads)))
+        return
+
+    results = []
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--epochs", str(args.epochs),
+             "--batch-size", str(args.batch_size), "--threads", str(args.threads)],
+            cwd=SERVER_DIR, capture_output=True, text=True
+        )
+        if output.returncode != 0:
+            print(f"{mode:<12} failed:\n{output.stderr[-2000:]}")
+            continue
+        results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    baseline = next((r for r in results if r["mode"] == "eager"), None)
+    print(f"{'mode':<12} {'steps/s':>9} {'speedup':>8} {'1st epoch':>10} {'val acc':>8}")
+    for r in results:
+        speedup = r["steps_per_sec"] / baseline["steps_per_sec"] if baseline else float("nan")
+        note = "" if r["mode"] != "graph+bf16" or r["bf16_enabled"] else "  (no bf16 support, ran float32)"
+        print(f"{r['mode']:<12} {r['steps_per_sec']:9.1f} {speedup:7.2f}x {r['first_epoch_s']:9.1f}s "
+              f"{r['val_accuracy'] * 100:7.1f}%{note}")
+
+
+if __name__ == "__main__":
+    main()
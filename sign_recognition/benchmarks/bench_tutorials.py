@@ -0,0 +1,168 @@
+"""
+Load test for the tutorial pages and videos served by the Express gateway.
+Runs api.js and the gateway (index.js) and measures, at two revisions:
+
+    metadata  requests/s and latency of /tutorials/basics/:id lookups
+              (the AJAX calls basics.js makes when a lesson is picked)
+    video     requests and bytes a caching client transfers to watch a test
+              video --visits times, one visit per --revisit-s seconds, plus the
+              bytes needed to seek into the middle of it with a Range request
+
+The client cache follows Cache-Control max-age and revalidates with
+If-None-Match once an entry is stale. The baseline is by default the commit
+before the tutorial metadata cache was introduced; its index.js and api.js
+are checked out into temporary files next to the originals. Ports 3000 and
+4000 must be free. Needs `npm install` in the repository root.
+
+Usage: python benchmarks/bench_tutorials.py [--requests 5000] [--concurrency 16]
+                                            [--video-mb 20] [--visits 5] [--revisit-s 3600]
+                                            [--baseline-ref REV]
+"""
+import argparse
+import http.client
+import os
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from bench_gateway import GATEWAY_PORT, REPO_ROOT, baseline_revision, wait_for_port
+
+API_PORT = 4000
+VIDEO_IDS = ["001", "002", "003", "004", "005"]
+VIDEO_DIR = os.path.join(REPO_ROOT, "public", "assets", "videos")
+VIDEO_NAME = "bench-video.mp4"
+
+
+def load_metadata(num_requests, concurrency):
+    """Latencies in ms for JSON lookups over keep-alive connections"""
+    local = threading.local()
+
+    def request(i):
+        if not hasattr(local, "connection"):
+            local.connection = http.client.HTTPConnection("127.0.0.1", GATEWAY_PORT)
+        start = time.perf_counter()
+        local.connection.request("GET", f"/tutorials/basics/{VIDEO_IDS[i % len(VIDEO_IDS)]}",
+                                 headers={"Accept": "application/json"})
+        response = local.connection.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(request, range(num_requests)))
+
+
+def max_age(headers):
+    match = re.search(r"max-age=(\d+)", headers.get("Cache-Control", ""))
+    return int(match.group(1)) if match else 0
+
+
+def video_visits(visits, revisit_s):
+    """(requests, bytes) a client with an HTTP cache needs for repeated visits"""
+    connection = http.client.HTTPConnection("127.0.0.1", GATEWAY_PORT)
+    cached = None   # (etag, expires at, in simulated seconds)
+    requests = transferred = 0
+    for visit in range(visits):
+        now = visit * revisit_s
+        if cached and now < cached[1]:
+            continue
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        connection.request("GET", f"/assets/videos/{VIDEO_NAME}", headers=headers)
+        response = connection.getresponse()
+        transferred += len(response.read())
+        requests += 1
+        if response.status not in (200, 304):
+            raise RuntimeError(f"HTTP {response.status}")
+        cached = (response.headers.get("ETag") or (cached and cached[0]), now + max_age(response.headers))
+    connection.close()
+    return requests, transferred
+
+
+def seek_bytes(size):
+    """Bytes sent for one megabyte from the middle of the video, and whether it came as a 206"""
+    connection = http.client.HTTPConnection("127.0.0.1", GATEWAY_PORT)
+    start = size // 2
+    connection.request("GET", f"/assets/videos/{VIDEO_NAME}",
+                       headers={"Range": f"bytes={start}-{start + 1024 * 1024 - 1}"})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return len(body), response.status == 206
+
+
+def measure(gateway_script, api_script, video_size, args):
+    processes = [subprocess.Popen(["node", script], cwd=REPO_ROOT,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                 for script in (api_script, gateway_script)]
+    try:
+        wait_for_port(API_PORT)
+        wait_for_port(GATEWAY_PORT)
+        load_metadata(args.concurrency * 10, args.concurrency)  # warm up
+        start = time.perf_counter()
+        latencies = load_metadata(args.requests, args.concurrency)
+        throughput = args.requests / (time.perf_counter() - start)
+        visits = video_visits(args.visits, args.revisit_s)
+        seek = seek_bytes(video_size)
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+    return throughput, latencies, visits, seek
+
+
+def checkout(revision, path):
+    """Write path as of revision to a hidden file next to it"""
+    target = os.path.join(REPO_ROOT, f".baseline-{path}")
+    with open(target, "w") as f:
+        f.write(subprocess.run(["git", "show", f"{revision}:{path}"], cwd=REPO_ROOT,
+                               capture_output=True, text=True, check=True).stdout)
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--video-mb", type=int, default=20, help="Size of the test video")
+    parser.add_argument("--visits", type=int, default=5, help="Times the client watches the video")
+    parser.add_argument("--revisit-s", type=int, default=3600, help="Simulated seconds between visits")
+    parser.add_argument("--baseline-ref", default=None, help="git revision to compare against")
+    args = parser.parse_args()
+
+    video_size = args.video_mb * 1024 * 1024
+    created_dir = not os.path.isdir(VIDEO_DIR)
+    os.makedirs(VIDEO_DIR, exist_ok=True)
+    video_path = os.path.join(VIDEO_DIR, VIDEO_NAME)
+    with open(video_path, "wb") as f:
+        f.write(os.urandom(video_size))
+
+    revision = args.baseline_ref or baseline_revision("tutorial-cache.js")
+    baseline = [checkout(revision, "index.js"), checkout(revision, "api.js")]
+    try:
+        results = {
+            f"baseline ({revision})": measure(*baseline, video_size, args),
+            "working tree": measure("index.js", "api.js", video_size, args),
+        }
+    finally:
+        for path in baseline + [video_path]:
+            os.remove(path)
+        if created_dir:
+            os.rmdir(VIDEO_DIR)
+
+    print(f"{args.requests} metadata lookups at concurrency {args.concurrency}; "
+          f"{args.visits} visits {args.revisit_s}s apart to a {args.video_mb} MB video\n")
+    print(f"{'gateway':<28} {'req/s':>8} {'p50 ms':>7} {'p99 ms':>7} "
+          f"{'video reqs':>10} {'video MB':>9} {'seek MB':>8} {'range':>6}")
+    for name, (throughput, latencies, (requests, transferred), (seeked, ranged)) in results.items():
+        p50, p99 = np.percentile(latencies, [50, 99])
+        print(f"{name:<28} {throughput:>8.0f} {p50:>7.2f} {p99:>7.2f} {requests:>10} "
+              f"{transferred / 2 ** 20:>9.1f} {seeked / 2 ** 20:>8.1f} {'yes' if ranged else 'no':>6}")
+
+
+if __name__ == "__main__":
+    main()
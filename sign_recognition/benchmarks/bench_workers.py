@@ -0,0 +1,151 @@
+"""
+Multi-worker serving benchmark.
+Starts serve.py with 1, 2, 4 and 8 workers in centralized mode (one shared
+inference process) and replicated mode (a model per worker), sends
+concurrent landmark requests to /api/quiz/landmarks and reports throughput,
+latency and the resident memory of the whole process tree.
+
+Usage: python benchmarks/bench_workers.py [--workers 1,2,4,8] [--modes centralized,replicated]
+                                          [--requests 2000] [--concurrency 32] [--port 8766]
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+from landmark_codec import encode_landmark_bytes
+
+
+def process_tree(root_pid):
+    """root_pid and all its descendants, from the parent pids in /proc"""
+    children = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as f:
+                # The command name may contain spaces; fields resume after its ')'
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+    pids, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+
+def tree_rss_mb(root_pid):
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    for pid in process_tree(root_pid):
+        try:
+            with open(f"/proc/{pid}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except OSError:
+            continue
+    return total / (1024 * 1024)
+
+
+def wait_until_ready(url, workers, timeout):
+    """Wait until /ready succeeds on several consecutive requests, which land on different workers"""
+    deadline = time.perf_counter() + timeout
+    streak = 0
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/ready") as response:
+                streak = streak + 1 if response.status == 200 else 0
+        except (urllib.error.URLError, ConnectionError):
+            streak = 0
+        if streak >= workers * 4:
+            return
+        time.sleep(0.05)
+    raise TimeoutError(f"Server not ready after {timeout}s")
+
+
+def post_landmarks(url, body):
+    request = urllib.request.Request(
+        f"{url}/api/quiz/landmarks?expectedSign=one&dtype=float16", data=body,
+        headers={"Content-Type": "application/octet-stream"}, method="POST"
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def run_load(url, bodies, num_requests, concurrency):
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        latencies = list(pool.map(lambda i: post_landmarks(url, bodies[i % len(bodies)]), range(num_requests)))
+        elapsed = time.perf_counter() - start
+    return num_requests / elapsed, latencies
+
+
+def benchmark(args, mode, workers, bodies, warm_bodies):
+    url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(SERVER_DIR, "serve.py"), "--mode", mode,
+         "--workers", str(workers), "--host", "127.0.0.1", "--port", str(args.port)],
+        cwd=SERVER_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_ready(url, workers, args.timeout)
+        run_load(url, warm_bodies, len(warm_bodies), args.concurrency)  # warm every worker
+        idle_rss = tree_rss_mb(server.pid)
+        throughput, latencies = run_load(url, bodies, args.requests, args.concurrency)
+        loaded_rss = tree_rss_mb(server.pid)
+    finally:
+        server.send_signal(signal.SIGINT)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return {
+        "throughput": throughput, "p50": p50, "p99": p99,
+        "idle_rss": idle_rss, "loaded_rss": loaded_rss,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--modes", default="centralized,replicated")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--sequence-length", type=int, default=30)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    # Distinct sequences, so the prediction cache does not answer for the model
+    rng = np.random.default_rng(0)
+    bodies = [
+        encode_landmark_bytes(rng.random((args.sequence_length, 21, 3)), "float16")
+        for _ in range(args.requests + 200)
+    ]
+    bodies, warm_bodies = bodies[:args.requests], bodies[args.requests:]
+
+    print(f"{'mode':<12} {'workers':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'idle MB':>9} {'load MB':>9}")
+    for mode in args.modes.split(","):
+        for workers in [int(w) for w in args.workers.split(",")]:
+            result = benchmark(args, mode, workers, bodies, warm_bodies)
+            print(f"{mode:<12} {workers:>7} {result['throughput']:>8.1f} {result['p50']:>8.1f} "
+                  f"{result['p99']:>8.1f} {result['idle_rss']:>9.1f} {result['loaded_rss']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
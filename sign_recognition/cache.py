@@ -0,0 +1,257 @@
+"""
+Bounded caches for extracted landmarks and predictions.
+Quiz retries resend the same JPEG frames, so landmark extraction and
+prediction results are cached by a hash of their input. A local-disk tier
+lets several uvicorn workers on one host share results.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# Sentinel distinguishing "not cached" from a cached None (frame without a hand)
+MISS = object()
+
+
+def content_key(data):
+    """Fast 128-bit hash of a bytes-like object"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def sequence_key(landmarks, namespace=""):
+    """Hash of a landmark sequence, independent of list vs ndarray input"""
+    array = np.ascontiguousarray(landmarks, dtype=np.float32)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(namespace.encode() + b"\0")
+    digest.update(str(array.shape).encode())
+    digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def _value_size(value):
+    if value is None:
+        return 0
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return len(json.dumps(value))
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache with an entry limit, a byte limit and a TTL"""
+
+    def __init__(self, max_entries=10000, max_bytes=None, ttl_seconds=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISS
+
+            value, expires, size = entry
+            if expires is not None and expires < time.monotonic():
+                del self._entries[key]
+                self.bytes -= size
+                self.evictions += 1
+                self.misses += 1
+                return MISS
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        size = _value_size(value)
+        expires = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            self._entries[key] = (value, expires, size)
+            self.bytes += size
+
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self.bytes > self.max_bytes)
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class DiskCache:
+    """
+    File-per-entry cache in a local directory shared by worker processes.
+    Entries expire by modification time; the oldest are pruned past max_entries.
+    """
+
+    PRUNE_EVERY = 256
+
+    def __init__(self, directory, encode, decode, max_entries=100000, ttl_seconds=None):
+        self.directory = directory
+        self.encode = encode
+        self.decode = decode
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(directory, exist_ok=True)
+
+        self._puts = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            if self.ttl_seconds and time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                os.remove(path)
+                self.misses += 1
+                return MISS
+            with open(path, 'rb') as f:
+                value = self.decode(f.read())
+        except (OSError, ValueError):
+            self.misses += 1
+            return MISS
+
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        # Write then rename so readers in other processes never see partial files
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(self.encode(value))
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            return
+
+        self._puts += 1
+        if self._puts % self.PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self):
+        """Remove expired entries and the oldest ones beyond max_entries"""
+        try:
+            entries = [e for e in os.scandir(self.directory) if not e.name.endswith('.tmp')]
+            entries = [(e.stat().st_mtime, e.path) for e in entries]
+        except OSError:
+            return
+
+        entries.sort()
+        now = time.time()
+        excess = len(entries) - self.max_entries
+        for i, (mtime, path) in enumerate(entries):
+            expired = self.ttl_seconds and now - mtime > self.ttl_seconds
+            if i < excess or expired:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def stats(self):
+        try:
+            files = [e for e in os.scandir(self.directory) if not e.name.endswith('.tmp')]
+            size = sum(e.stat().st_size for e in files)
+        except OSError:
+            files, size = [], 0
+        return {"entries": len(files), "bytes": size, "hits": self.hits, "misses": self.misses}
+
+
+class TieredCache:
+    """Memory tier in front of an optional shared disk tier"""
+
+    def __init__(self, memory, disk=None):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is MISS and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not MISS:
+                self.memory.put(key, value)
+        return value
+
+    def put(self, key, value):
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def clear(self):
+        self.memory.clear()
+
+    def stats(self):
+        stats = {"memory": self.memory.stats()}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+
+# Serializers for the disk tier
+def encode_landmarks(value):
+    return b'' if value is None else np.asarray(value, dtype=np.float32).tobytes()
+
+
+def decode_landmarks(data):
+    return None if not data else np.frombuffer(data, dtype=np.float32).reshape(-1, 3)
+
+
+def encode_prediction(value):
+    return json.dumps(list(value)).encode()
+
+
+def decode_prediction(data):
+    sign, confidence = json.loads(data)
+    return sign, confidence
+
+
+def create_landmark_cache(max_entries=10000, ttl_seconds=600, disk_dir=None):
+    """Frame hash -> (21, 3) landmarks, or None for frames without a hand"""
+    disk = None
+    if disk_dir:
+        disk = DiskCache(os.path.join(disk_dir, 'landmarks'), encode_landmarks, decode_landmarks,
+                         max_entries=max_entries * 10, ttl_seconds=ttl_seconds)
+    return TieredCache(LRUCache(max_entries, ttl_seconds=ttl_seconds), disk)
+
+
+def create_prediction_cache(max_entries=1000, ttl_seconds=600, disk_dir=None):
+    """Sequence hash -> (sign, confidence)"""
+    disk = None
+    if disk_dir:
+        disk = DiskCache(os.path.join(disk_dir, 'predictions'), encode_prediction, decode_prediction,
+                         max_entries=max_entries * 10, ttl_seconds=ttl_seconds)
+    return TieredCache(LRUCache(max_entries, ttl_seconds=ttl_seconds), disk)
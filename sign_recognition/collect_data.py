@@ -1,12 +1,15 @@
 """
 Script to collect training data for sign language recognition.
 Run this script to record hand gesture data for model training.
+To extract sequences from recorded videos instead, use ingest_videos.py.
 """
 import cv2
 import mediapipe as mp
 import numpy as np
 import os
+import sys
 import time
+from model import DEFAULT_CLASSES
 
 # Initialize MediaPipe
 mp_hands = mp.solutions.hands
@@ -22,8 +25,8 @@ hands = mp_hands.Hands(
 data_dir = 'training_data'
 os.makedirs(data_dir, exist_ok=True)
 
-# Signs to collect
-signs = ['one', 'two', 'three', 'four', 'five']
+# Signs to collect: given on the command line, or the default vocabulary
+signs = sys.argv[1:] or DEFAULT_CLASSES
 num_sequences = 30  # Number of sequences to collect per sign
 sequence_length = 30  # Number of frames per sequence
 
@@ -0,0 +1,219 @@
+"""
+Consolidated, memory-mapped storage for recorded landmark sequences.
+collect_data.py writes one small seq_{n}.npy per sequence; packing them into
+a single array file avoids a file open per sequence when loading for training.
+
+Layout of a packed dataset directory:
+    sequences.f32  raw float32 array of shape (N, sequence_length, L, 3), where L is
+                   21 landmarks per frame, or 42 for two-handed recordings
+    labels.i32     raw int32 class indices of shape (N,)
+    index.json     classes, shape, count and the source file of every sequence
+    features-<name>.f32
+                   optional float32 per-frame features of shape (N, sequence_length, F),
+                   computed once by cached_features and extended as sequences are added
+
+Usage: python dataset.py [--data-dir training_data] [--packed-dir training_data_packed] [--num-hands 1]
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+SEQUENCES_FILE = 'sequences.f32'
+LABELS_FILE = 'labels.i32'
+INDEX_FILE = 'index.json'
+
+NUM_LANDMARKS = 21
+NUM_COORDS = 3
+
+# Sequences featurized per chunk when filling a features cache
+FEATURE_CHUNK = 1024
+
+
+class DatasetMismatch(ValueError):
+    """An existing packed dataset was built for other classes or another hand count"""
+
+
+class PackedDataset:
+    def __init__(self, path, classes=None, sequence_length=30, landmarks_per_frame=None):
+        self.path = path
+        index_path = os.path.join(path, INDEX_FILE)
+
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                self.index = json.load(f)
+            # Packs written before two-handed data was supported hold one hand
+            self.index.setdefault('landmarks_per_frame', NUM_LANDMARKS)
+            if classes is not None and list(classes) != self.index['classes']:
+                raise DatasetMismatch(f"Packed dataset at {path} has classes {self.index['classes']}, expected {list(classes)}")
+            if landmarks_per_frame is not None and landmarks_per_frame != self.landmarks_per_frame:
+                raise DatasetMismatch(f"Packed dataset at {path} has {self.landmarks_per_frame} landmarks per frame, "
+                                      f"expected {landmarks_per_frame}")
+        else:
+            if classes is None:
+                raise ValueError(f"No packed dataset at {path}; classes are needed to create one")
+            self.index = {
+                'classes': list(classes),
+                'sequence_length': sequence_length,
+                'landmarks_per_frame': landmarks_per_frame or NUM_LANDMARKS,
+                'count': 0,
+                'sources': [],
+            }
+
+    @property
+    def classes(self):
+        return self.index['classes']
+
+    @property
+    def sequence_length(self):
+        return self.index['sequence_length']
+
+    @property
+    def landmarks_per_frame(self):
+        return self.index['landmarks_per_frame']
+
+    @property
+    def frame_shape(self):
+        return (self.sequence_length, self.landmarks_per_frame, NUM_COORDS)
+
+    def __len__(self):
+        return self.index['count']
+
+    @property
+    def sequences(self):
+        """Zero-copy read-only view of all sequences, shape (N, T, L, 3)"""
+        if len(self) == 0:
+            return np.empty((0,) + self.frame_shape, dtype=np.float32)
+        return np.memmap(os.path.join(self.path, SEQUENCES_FILE), dtype=np.float32, mode='r',
+                         shape=(len(self),) + self.frame_shape)
+
+    @property
+    def labels(self):
+        if len(self) == 0:
+            return np.empty((0,), dtype=np.int32)
+        return np.memmap(os.path.join(self.path, LABELS_FILE), dtype=np.int32, mode='r', shape=(len(self),))
+
+    def cached_features(self, name, compute, num_features):
+        """
+        Zero-copy view of per-frame features of every sequence, shape (N, T, num_features).
+        compute maps an (n, T, L, 3) array of sequences to their features; it
+        only runs on sequences added since the cache was last filled. name
+        must change whenever compute does.
+        """
+        file_name = f'features-{name}.f32'
+        cached = self.index.setdefault('features', {}).get(name, {'count': 0})
+        if cached.get('num_features', num_features) != num_features:
+            raise ValueError(f"Cached features '{name}' have width {cached['num_features']}, expected {num_features}")
+
+        frame_bytes = self.sequence_length * num_features * 4
+        sequences = self.sequences
+        for start in range(cached['count'], len(self), FEATURE_CHUNK):
+            chunk = np.asarray(compute(sequences[start:start + FEATURE_CHUNK]), dtype=np.float32)
+            self._append_raw(file_name, chunk.tobytes(), start * frame_bytes)
+            self.index['features'][name] = {'count': start + len(chunk), 'num_features': num_features}
+            self._write_index()
+
+        if len(self) == 0:
+            return np.empty((0, self.sequence_length, num_features), dtype=np.float32)
+        return np.memmap(os.path.join(self.path, file_name), dtype=np.float32, mode='r',
+                         shape=(len(self), self.sequence_length, num_features))
+
+    def fit_length(self, sequence, source=None):
+        """
+        Pad with the last frame or truncate to the packed sequence length.
+        Sequences must hold (T, L, 3) or flattened (T, L * 3) frames for this
+        pack's L; anything else is rejected rather than reshaped.
+        """
+        sequence = np.asarray(sequence, dtype=np.float32)
+        frame = (self.landmarks_per_frame, NUM_COORDS)
+        if sequence.ndim == 2 and sequence.shape[1] == frame[0] * frame[1]:
+            sequence = sequence.reshape(-1, *frame)
+        if sequence.ndim != 3 or sequence.shape[1:] != frame or len(sequence) == 0:
+            raise ValueError(f"Sequence{f' {source}' if source else ''} has shape {sequence.shape}, "
+                             f"expected (T, {frame[0]}, {frame[1]}) frames")
+        frame_idx = np.minimum(np.arange(self.sequence_length), len(sequence) - 1)
+        return sequence[frame_idx]
+
+    def append(self, sequences, labels, sources=None):
+        """Append sequences without rewriting existing data"""
+        if len(sequences) == 0:
+            return
+        os.makedirs(self.path, exist_ok=True)
+
+        if sources is None:
+            sources = [None] * len(sequences)
+        data = np.stack([self.fit_length(seq, source) for seq, source in zip(sequences, sources)])
+        labels = np.asarray(labels, dtype=np.int32)
+        if len(labels) != len(data):
+            raise ValueError("sequences and labels must have the same length")
+
+        # Drop bytes left behind by an append that was interrupted before
+        # the index was updated; the index count is authoritative
+        sequence_bytes = int(np.prod(self.frame_shape)) * 4
+        self._append_raw(SEQUENCES_FILE, data.tobytes(), len(self) * sequence_bytes)
+        self._append_raw(LABELS_FILE, labels.tobytes(), len(self) * 4)
+
+        self.index['count'] += len(data)
+        self.index['sources'].extend(sources)
+        self._write_index()
+
+    def _append_raw(self, name, payload, valid_bytes):
+        file_path = os.path.join(self.path, name)
+        with open(file_path, 'ab') as f:
+            if f.tell() != valid_bytes:
+                f.truncate(valid_bytes)
+                f.seek(valid_bytes)
+            f.write(payload)
+
+    def _write_index(self):
+        tmp_path = os.path.join(self.path, INDEX_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, os.path.join(self.path, INDEX_FILE))
+
+
+def pack_directory(data_dir, packed_dir, classes, sequence_length=30, landmarks_per_frame=NUM_LANDMARKS):
+    """
+    Add every training_data/<sign>/*.npy file not yet in the packed dataset.
+    Returns the dataset and the number of sequences added.
+    """
+    dataset = PackedDataset(packed_dir, classes, sequence_length, landmarks_per_frame)
+    known = set(dataset.index['sources'])
+
+    new_sequences, new_labels, new_sources = [], [], []
+    for class_idx, class_name in enumerate(classes):
+        class_dir = os.path.join(data_dir, class_name)
+        if not os.path.exists(class_dir):
+            continue
+
+        for file_name in sorted(os.listdir(class_dir)):
+            source = f"{class_name}/{file_name}"
+            if not file_name.endswith('.npy') or source in known:
+                continue
+            new_sequences.append(np.load(os.path.join(class_dir, file_name)))
+            new_labels.append(class_idx)
+            new_sources.append(source)
+
+    dataset.append(new_sequences, new_labels, new_sources)
+    return dataset, len(new_sequences)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack training_data into a memory-mapped dataset")
+    parser.add_argument("--data-dir", default=os.path.join(os.path.dirname(__file__), 'training_data'))
+    parser.add_argument("--packed-dir", default=os.path.join(os.path.dirname(__file__), 'training_data_packed'))
+    parser.add_argument("--num-hands", type=int, choices=[1, 2], default=1,
+                        help="hands per recorded frame (2 for ingest_videos.py --num-hands 2)")
+    args = parser.parse_args()
+
+    from model import SignLanguageModel
+    model = SignLanguageModel()
+
+    dataset, added = pack_directory(args.data_dir, args.packed_dir, model.classes, model.sequence_length,
+                                    NUM_LANDMARKS * args.num_hands)
+    print(f"Added {added} sequences, {len(dataset)} total in {args.packed_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Offline evaluation and benchmark harness.
+Replays recorded landmark sequences (<sign>/*.npy) and JPEG frame sets
+(<sign>/<name>/*.jpg) through the same decode -> landmark extraction ->
+preprocess_landmarks -> predict path the server uses. Reports accuracy,
+per-class confusion, per-stage throughput and latency, end-to-end
+p50/p95/p99 and peak memory, and writes them as JSON so runs on different
+commits can be compared.
+
+By default only samples a model trained on --data-dir has not seen are
+scored: the landmark sequences train.py and export_model.py hold out for
+validation, and every frame set. Pass --all-samples for data the model was
+not trained on.
+
+Generate data without a webcam with synthetic_data.py.
+
+Usage: python evaluate.py [--data-dir training_data] [--backend keras|tflite] [--version VERSION]
+                          [--all-samples] [--output results.json] [--baseline old.json]
+"""
+import argparse
+import base64
+import json
+import os
+import subprocess
+import time
+import numpy as np
+from metrics import peak_rss_mb, stage_histogram
+from model import SignLanguageModel
+from registry import ModelRegistry
+
+# Stages timed with stage_timer along the recognition path
+STAGES = ["base64_decode", "imdecode", "color_convert", "hands_process", "preprocess_landmarks", "model_predict"]
+
+UNKNOWN = "unknown"
+UNCERTAIN = "uncertain"  # SignLanguageModel's answer below 0.5 confidence
+
+def find_samples(data_dir, classes, limit=None):
+    """(kind, sign, path) for every landmark sequence and frame set under data_dir, in packing order"""
+    samples = []
+    for sign in classes:
+        sign_dir = os.path.join(data_dir, sign)
+        if not os.path.isdir(sign_dir):
+            continue
+        for name in sorted(os.listdir(sign_dir))[:limit]:
+            path = os.path.join(sign_dir, name)
+            if name.endswith('.npy'):
+                samples.append(("landmarks", sign, path))
+            elif os.path.isdir(path):
+                samples.append(("frames", sign, path))
+    return samples
+
+def held_out(samples, test_size=0.2):
+    """
+    The samples a model trained on the same directory has not seen: the
+    landmark sequences in the validation part of train.py's seeded
+    train_test_split (which picks by position, so samples must be in
+    packing order) and every frame set
+    """
+    from sklearn.model_selection import train_test_split
+
+    sequences = [sample for sample in samples if sample[0] == "landmarks"]
+    if len(sequences) < 2:
+        return samples
+    _, validation = train_test_split(sequences, test_size=test_size, random_state=42)
+    validation = set(validation)
+    return [sample for sample in samples if sample[0] != "landmarks" or sample in validation]
+
+def limit_per_sign(samples, limit):
+    """The first limit samples of each sign"""
+    if limit is None:
+        return samples
+    kept, counts = [], {}
+    for sample in samples:
+        counts[sample[1]] = counts.get(sample[1], 0) + 1
+        if counts[sample[1]] <= limit:
+            kept.append(sample)
+    return kept
+
+def load_frame_set(frames_dir):
+    """JPEG files of a frame set as the base64 data URLs the browser sends"""
+    frames = []
+    for name in sorted(os.listdir(frames_dir)):
+        if name.lower().endswith(('.jpg', '.jpeg')):
+            with open(os.path.join(frames_dir, name), 'rb') as f:
+                frames.append("data:image/jpeg;base64," + base64.b64encode(f.read()).decode())
+    return frames
+
+def run_sample(model, extractor, kind, path):
+    """Recognize one sample; returns (predicted_sign, confidence, frames)"""
+    if kind == "landmarks":
+        sequence = np.load(path)
+        frames = len(sequence)
+    else:
+        frame_set = load_frame_set(path)
+        frames = len(frame_set)
+        results = extractor.extract_sync(frame_set)
+        sequence = [landmarks for _, landmarks in results if landmarks is not None]
+        if not sequence:
+            return UNKNOWN, 0.0, frames
+
+    predicted_sign, confidence = model.predict_batch([sequence])[0]
+    return predicted_sign, confidence, frames
+
+def confusion_report(classes, labels, predictions):
+    """Confusion matrix (rows true, columns predicted) and per-class metrics"""
+    columns = list(classes) + [UNCERTAIN, UNKNOWN]
+    matrix = np.zeros((len(classes), len(columns)), dtype=int)
+    for label, prediction in zip(labels, predictions):
+        matrix[classes.index(label), columns.index(prediction)] += 1
+
+    per_class = {}
+    for i, sign in enumerate(classes):
+        support = int(matrix[i].sum())
+        predicted = int(matrix[:, i].sum())
+        correct = int(matrix[i, i])
+        per_class[sign] = {
+            "support": support,
+            "precision": correct / predicted if predicted else 0.0,
+            "recall": correct / support if support else 0.0,
+        }
+    return {"labels": columns, "matrix": matrix.tolist()}, per_class
+
+def stage_report():
+    """Throughput and latency of every stage that ran"""
+    stages = {}
+    for stage in STAGES:
+        snapshot = stage_histogram(stage).snapshot()
+        if snapshot["count"] == 0:
+            continue
+        total_s = snapshot["sum"] / 1000
+        stages[stage] = {
+            "count": snapshot["count"],
+            "per_second": snapshot["count"] / total_s if total_s else 0.0,
+            "mean_ms": snapshot["mean"],
+            # Upper bucket bounds, see Histogram.quantile
+            "p50_ms": snapshot["p50"],
+            "p95_ms": snapshot["p95"],
+            "p99_ms": snapshot["p99"],
+            "max_ms": snapshot["max"],
+        }
+    return stages
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(report, baseline):
+    """Print the change in headline numbers against an earlier report"""
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    rows = [
+        ("accuracy", report["accuracy"], baseline.get("accuracy")),
+        ("samples/sec", report["samples_per_second"], baseline.get("samples_per_second")),
+        ("p50 ms", report["latency_ms"]["p50"], baseline.get("latency_ms", {}).get("p50")),
+        ("p99 ms", report["latency_ms"]["p99"], baseline.get("latency_ms", {}).get("p99")),
+        ("peak RSS MB", report["peak_rss_mb"], baseline.get("peak_rss_mb")),
+    ]
+    for name, current, previous in rows:
+        if previous:
+            print(f"  {name:12s} {previous:10.3f} -> {current:10.3f}  ({(current - previous) / previous * 100:+.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate accuracy and speed of the recognition pipeline")
+    parser.add_argument("--data-dir", default=os.path.join(os.path.dirname(__file__), 'training_data'))
+    parser.add_argument("--backend", choices=SignLanguageModel.BACKENDS, default="keras")
+    parser.add_argument("--version", default=None, help="registry version to evaluate (default: current)")
+    parser.add_argument("--workers", type=int, default=1, help="Frame extraction workers")
+    parser.add_argument("--limit", type=int, default=None, help="Samples per sign")
+    parser.add_argument("--all-samples", action="store_true",
+                        help="Score every sample, not only the held-out validation split")
+    parser.add_argument("--output", default=None, help="Write the report as JSON")
+    parser.add_argument("--baseline", default=None, help="Earlier JSON report to compare with")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("SIGN LANGUAGE PIPELINE EVALUATION")
+    print("=" * 50)
+
+    registry = ModelRegistry()
+    version = args.version or registry.current()
+    model = SignLanguageModel(backend=args.backend, model_dir=registry.path(version) if version else None)
+    if model.model is None:
+        print("No trained model found! Please run train.py first.")
+        return
+
+    samples = find_samples(args.data_dir, model.classes)
+    if not args.all_samples:
+        samples = held_out(samples)
+    samples = limit_per_sign(samples, args.limit)
+    if not samples:
+        print(f"No samples found in {args.data_dir}. Generate some with synthetic_data.py.")
+        return
+
+    # MediaPipe is only needed to run samples, not for the report helpers
+    from extraction import FrameExtractor
+    extractor = FrameExtractor(num_workers=args.workers, num_hands=model.num_hands)
+    model.warm_up(batch_sizes=[1])
+    for stage in STAGES:
+        stage_histogram(stage).reset()
+
+    labels, predictions, latencies = [], [], []
+    total_frames = 0
+    start = time.perf_counter()
+    for kind, sign, path in samples:
+        sample_start = time.perf_counter()
+        predicted_sign, _, frames = run_sample(model, extractor, kind, path)
+        latencies.append((time.perf_counter() - sample_start) * 1000)
+        labels.append(sign)
+        predictions.append(predicted_sign)
+        total_frames += frames
+    elapsed = time.perf_counter() - start
+    extractor.shutdown()
+
+    confusion, per_class = confusion_report(model.classes, labels, predictions)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "backend": model.backend,
+        "model_version": version,
+        "data_dir": os.path.abspath(args.data_dir),
+        "split": "all" if args.all_samples else "held_out",
+        "samples": len(samples),
+        "landmark_samples": sum(kind == "landmarks" for kind, _, _ in samples),
+        "frame_samples": sum(kind == "frames" for kind, _, _ in samples),
+        "frames": total_frames,
+        "accuracy": float(np.mean([l == p for l, p in zip(labels, predictions)])),
+        "per_class": per_class,
+        "confusion": confusion,
+        "samples_per_second": len(samples) / elapsed,
+        "latency_ms": {"p50": float(p50), "p95": float(p95), "p99": float(p99), "max": max(latencies)},
+        "stages": stage_report(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    print(f"\n{report['samples']} {'' if args.all_samples else 'held-out '}samples ({report['landmark_samples']} landmark sequences, "
+          f"{report['frame_samples']} frame sets, {total_frames} frames), backend {model.backend}")
+    print(f"Accuracy: {report['accuracy'] * 100:.2f}%")
+    print("\nConfusion (rows true, columns predicted):")
+    print("        " + " ".join(f"{label[:7]:>7s}" for label in confusion["labels"]))
+    for sign, row in zip(model.classes, confusion["matrix"]):
+        print(f"{sign[:7]:>7s} " + " ".join(f"{count:7d}" for count in row))
+
+    print(f"\nEnd to end: {report['samples_per_second']:.1f} samples/sec, "
+          f"p50={p50:.2f}ms p95={p95:.2f}ms p99={p99:.2f}ms")
+    print("Stages:")
+    for stage, stats in report["stages"].items():
+        print(f"  {stage:22s} {stats['per_second']:10.1f}/s  mean={stats['mean_ms']:.3f}ms  "
+              f"p50<={stats['p50_ms']:.3f}ms p95<={stats['p95_ms']:.3f}ms p99<={stats['p99_ms']:.3f}ms")
+    print(f"Peak RSS: {report['peak_rss_mb']:.1f} MB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Export the trained sign language model to TensorFlow Lite.
+Run this after train.py. Checks accuracy parity against the Keras model on
+the held-out split and compares per-request CPU latency.
+
+Usage: python export_model.py [--quantization dynamic|float16|int8] [--output PATH] [--version VERSION]
+"""
+import argparse
+import os
+import time
+import numpy as np
+from sklearn.model_selection import train_test_split
+from model import SignLanguageModel
+from tflite_model import TFLiteModel
+from registry import ModelRegistry
+
+def latency_percentiles(predict_fn, samples, runs=200):
+    """p50/p99 latency in milliseconds for single-sequence requests"""
+    latencies = []
+    for i in range(runs):
+        X = samples[i % len(samples)][np.newaxis]
+        start = time.perf_counter()
+        predict_fn(X)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.percentile(latencies, [50, 99])
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the model to TensorFlow Lite")
+    parser.add_argument("--quantization", choices=["dynamic", "float16", "int8"], default=None)
+    parser.add_argument("--output", default=None, help="defaults to sign_language_model.tflite next to the model")
+    parser.add_argument("--version", default=None, help="registry version to export (default: current)")
+    args = parser.parse_args()
+    
+    print("=" * 50)
+    print("SIGN LANGUAGE MODEL EXPORT")
+    print("=" * 50)
+    
+    # Export the registry's current version if one has been published
+    registry = ModelRegistry()
+    version = args.version or registry.current()
+    model = SignLanguageModel(backend='keras', model_dir=registry.path(version) if version else None)
+    if model.model is None:
+        print("No trained model found! Please run train.py first.")
+        return
+    
+    # Held-out data: the same split train.py validates on
+    data_dir = os.path.join(os.path.dirname(__file__), 'training_data')
+    X_val = y_val = None
+    if os.path.exists(data_dir):
+        X, y = model.prepare_data_from_directory(data_dir)
+        if len(X) > 0:
+            _, X_val, _, y_val = train_test_split(X, y, test_size=0.2, random_state=42)
+            X_val = X_val.astype(np.float32)
+    
+    if X_val is None:
+        print("No training data found, parity is checked on random sequences only")
+        X_val = np.random.default_rng(0).standard_normal((64, model.sequence_length, model.num_features)).astype(np.float32)
+    
+    if args.quantization == 'int8':
+        representative = X_val[:100]
+    else:
+        representative = None
+    
+    output_path = model.export_tflite(args.output, args.quantization, representative)
+    tflite = TFLiteModel(output_path)
+    
+    # Accuracy parity
+    keras_pred = model.model.predict(X_val, verbose=0)
+    tflite_pred = tflite.predict(X_val)
+    agreement = np.mean(np.argmax(keras_pred, axis=1) == np.argmax(tflite_pred, axis=1))
+    max_diff = np.max(np.abs(keras_pred - tflite_pred))
+    
+    print(f"\nParity on {len(X_val)} held-out sequences:")
+    print(f"Top-1 agreement: {agreement * 100:.2f}%")
+    print(f"Max probability difference: {max_diff:.5f}")
+    if y_val is not None:
+        print(f"Keras accuracy:  {np.mean(np.argmax(keras_pred, axis=1) == y_val) * 100:.2f}%")
+        print(f"TFLite accuracy: {np.mean(np.argmax(tflite_pred, axis=1) == y_val) * 100:.2f}%")
+    
+    # Per-request latency
+    keras_p50, keras_p99 = latency_percentiles(lambda X: model.model.predict(X, verbose=0), X_val)
+    tflite_p50, tflite_p99 = latency_percentiles(tflite.predict, X_val)
+    print("\nSingle-request CPU latency:")
+    print(f"Keras:  p50={keras_p50:.2f}ms  p99={keras_p99:.2f}ms")
+    print(f"TFLite: p50={tflite_p50:.2f}ms  p99={tflite_p99:.2f}ms")
+    
+    print(f"\nStart the server with MODEL_BACKEND=tflite to serve {output_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Parallel frame decoding and hand landmark extraction.
+Each worker owns its own MediaPipe Hands instance, so frames from one or
+many requests can be processed concurrently without sharing tracker state.
+"""
+import asyncio
+import binascii
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from cache import MISS, content_key, create_landmark_cache
+from metrics import REGISTRY, stage_timer
+from profiling import ProfilingThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+FRAMES_TOTAL = REGISTRY.counter("recognition_frames_total", "Frames submitted for landmark extraction")
+FRAMES_WITH_HANDS = REGISTRY.counter("recognition_frames_with_hands_total", "Frames in which a hand was detected")
+
+mp_hands = mp.solutions.hands
+
+NUM_HAND_LANDMARKS = 21
+
+
+def create_hands(static_image_mode=True, max_num_hands=1):
+    """Create a MediaPipe Hands instance with the project's default thresholds"""
+    return mp_hands.Hands(
+        static_image_mode=static_image_mode,
+        max_num_hands=max_num_hands,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5
+    )
+
+
+def decode_base64_frame(base64_string):
+    """Decode a base64 string or data URL to the encoded image bytes"""
+    # Remove the data URL prefix if present
+    if base64_string.startswith("data:"):
+        base64_string = base64_string[base64_string.index(",") + 1:]
+    with stage_timer("base64_decode"):
+        # Reads an ASCII str in place, where b64decode would first copy it to bytes
+        return binascii.a2b_base64(base64_string)
+
+
+def bytes_to_image(img_data):
+    """Decode encoded image bytes to an OpenCV image"""
+    np_arr = np.frombuffer(img_data, np.uint8)
+    with stage_timer("imdecode"):
+        return cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
+
+
+# Frame headers carrying the image size (SOF0-SOF15 without DHT, JPG and DAC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+_REDUCED_DECODES = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+# OpenCV 4.10+ can decode straight to RGB; older builds convert in place
+_IMREAD_COLOR_RGB = getattr(cv2, "IMREAD_COLOR_RGB", None)
+
+# Frames are decoded at the smallest JPEG scale whose short side stays at
+# least this many pixels (0 decodes at full resolution)
+_decode_min_side = 0
+
+
+def configure_decoding(min_side):
+    global _decode_min_side
+    _decode_min_side = max(0, int(min_side or 0))
+
+
+def jpeg_size(img_data):
+    """(width, height) from a JPEG's frame header, or None for anything else"""
+    if img_data[:2] != b"\xff\xd8":
+        return None
+    i = 2
+    while i + 9 <= len(img_data):
+        if img_data[i] != 0xFF:
+            return None
+        marker = img_data[i + 1]
+        if marker == 0xFF:
+            i += 1  # fill byte
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            i += 2  # markers without a length
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            height = int.from_bytes(img_data[i + 5:i + 7], "big")
+            width = int.from_bytes(img_data[i + 7:i + 9], "big")
+            return width, height
+        if marker == 0xDA:
+            return None  # scan data started without a frame header
+        i += 2 + int.from_bytes(img_data[i + 2:i + 4], "big")
+    return None
+
+
+def _decode_flags(img_data, min_side):
+    flags = cv2.IMREAD_COLOR
+    size = jpeg_size(img_data) if min_side > 0 else None
+    if size is not None:
+        for factor, reduced in _REDUCED_DECODES:
+            if min(size) // factor >= min_side:
+                flags = reduced
+                break
+    if _IMREAD_COLOR_RGB is not None:
+        flags = (flags & ~cv2.IMREAD_COLOR) | _IMREAD_COLOR_RGB
+    return flags
+
+
+def bytes_to_rgb(img_data, min_side=None):
+    """
+    Decode encoded image bytes to an RGB image for MediaPipe, with JPEGs
+    scaled down by the decoder (1/2, 1/4 or 1/8) as far as min_side allows.
+    Skips the separate full-size RGB copy of bytes_to_image + cvtColor.
+    """
+    np_arr = np.frombuffer(img_data, np.uint8)
+    min_side = _decode_min_side if min_side is None else min_side
+    with stage_timer("imdecode"):
+        image = cv2.imdecode(np_arr, _decode_flags(img_data, min_side))
+    if image is not None and _IMREAD_COLOR_RGB is None:
+        with stage_timer("color_convert"):
+            cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+    return image
+
+
+def base64_to_image(base64_string):
+    """Convert base64 string to OpenCV image"""
+    try:
+        return bytes_to_image(decode_base64_frame(base64_string))
+    except Exception as e:
+        logger.error(f"Error converting base64 to image: {e}")
+        return None
+
+
+def base64_to_rgb(base64_string, min_side=None):
+    """Convert base64 string to an RGB image through the reduced-size decode path"""
+    try:
+        return bytes_to_rgb(decode_base64_frame(base64_string), min_side)
+    except Exception as e:
+        logger.error(f"Error converting base64 to image: {e}")
+        return None
+
+
+def _write_hand(out, hand_landmarks):
+    """Copy one hand's 21 landmarks into a (21, 3) float32 row block"""
+    out.reshape(-1)[:] = [value for landmark in hand_landmarks.landmark
+                          for value in (landmark.x, landmark.y, landmark.z)]
+
+
+def landmarks_from_rgb(rgb_frame, hands, num_hands=1, out=None):
+    """
+    Extract hand landmarks from an RGB frame with the given Hands instance.
+    Returns a (21 * num_hands, 3) float32 array, written into out if given
+    (e.g. one row of a preallocated (T, 21 * num_hands, 3) array), or None
+    without a hand. With num_hands=2 the left hand comes first and a
+    missing hand is zeros.
+    """
+    try:
+        with stage_timer("hands_process"):
+            results = hands.process(rgb_frame)
+
+        if not results.multi_hand_landmarks:
+            return None
+
+        if out is None:
+            out = np.empty((NUM_HAND_LANDMARKS * num_hands, 3), dtype=np.float32)
+        if num_hands == 2:
+            out[:] = 0
+            for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
+                slot = 0 if handedness.classification[0].label == "Left" else 1
+                _write_hand(out[slot * NUM_HAND_LANDMARKS:(slot + 1) * NUM_HAND_LANDMARKS], hand_landmarks)
+        else:
+            _write_hand(out, results.multi_hand_landmarks[0])  # First hand
+        return out
+    except Exception as e:
+        logger.error(f"Error extracting hand landmarks: {e}")
+        return None
+
+
+def landmarks_from_frame(frame, hands, num_hands=1, out=None):
+    """Extract hand landmarks from a BGR frame (see landmarks_from_rgb)"""
+    try:
+        # Convert to RGB (MediaPipe requires RGB)
+        with stage_timer("color_convert"):
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    except Exception as e:
+        logger.error(f"Error extracting hand landmarks: {e}")
+        return None
+    return landmarks_from_rgb(rgb_frame, hands, num_hands, out)
+
+
+# Per-worker Hands instance. Process workers get one each from the pool
+# initializer; thread workers get a thread-local one on first use.
+_worker_hands = None
+_thread_state = threading.local()
+
+# Frame hash -> landmarks cache, shared by the workers of one process
+_landmark_cache = None
+
+# Hands detected per frame (1, or 2 for two-handed signs)
+_num_hands = 1
+
+
+def configure_landmark_cache(cache_config):
+    """Create this process's landmark cache from keyword arguments for create_landmark_cache"""
+    global _landmark_cache
+    _landmark_cache = create_landmark_cache(**cache_config) if cache_config is not None else None
+    return _landmark_cache
+
+
+def _init_process_worker(cache_config=None, num_hands=1, decode_min_side=0):
+    global _worker_hands, _num_hands
+    _num_hands = num_hands
+    _worker_hands = create_hands(max_num_hands=num_hands)
+    configure_landmark_cache(cache_config)
+    configure_decoding(decode_min_side)
+
+
+def _get_worker_hands():
+    if _worker_hands is not None:
+        return _worker_hands
+    if not hasattr(_thread_state, "hands"):
+        _thread_state.hands = create_hands(max_num_hands=_num_hands)
+    return _thread_state.hands
+
+
+def process_frame(base64_frame, out=None):
+    """
+    Decode one frame and extract its landmarks; returns (decoded, landmarks).
+    Landmarks are written into out, a (21 * num_hands, 3) float32 array, if given.
+    """
+    decoded, landmarks = _process_frame(base64_frame, out)
+    FRAMES_TOTAL.inc()
+    if landmarks is not None:
+        FRAMES_WITH_HANDS.inc()
+    return decoded, landmarks
+
+
+def _process_frame(base64_frame, out=None):
+    try:
+        img_data = decode_base64_frame(base64_frame)
+    except Exception as e:
+        logger.error(f"Error converting base64 to image: {e}")
+        return False, None
+
+    # Identical JPEG bytes always give the same landmarks in static image mode
+    # (at a given decode scale)
+    key = None
+    if _landmark_cache is not None:
+        key = f"h{_num_hands}-r{_decode_min_side}-{content_key(img_data)}"
+        cached = _landmark_cache.get(key)
+        if cached is not MISS:
+            if cached is not None and out is not None:
+                out[:] = cached
+                return True, out
+            return True, cached
+
+    frame = bytes_to_rgb(img_data)
+    if frame is None:
+        return False, None
+
+    landmarks = landmarks_from_rgb(frame, _get_worker_hands(), _num_hands, out)
+    if key is not None:
+        # out may be a view into a whole request's array; cache just this frame
+        _landmark_cache.put(key, None if landmarks is None else landmarks.copy())
+    return True, landmarks
+
+
+class FrameExtractor:
+    """
+    Pool of decode + landmark workers.
+    Workers run MediaPipe in static image mode because consecutive frames of
+    a request may land on different workers.
+    """
+
+    def __init__(self, num_workers=None, mode="thread", cache_config=None, num_hands=1, decode_min_side=0):
+        global _num_hands
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.mode = mode
+        self.num_hands = num_hands
+        self.pending_frames = 0
+        # Also used by session extraction in this process
+        configure_decoding(decode_min_side)
+
+        if mode == "process":
+            # Each process gets its own memory tier; the disk tier is shared
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                initializer=_init_process_worker,
+                initargs=(cache_config, num_hands, decode_min_side)
+            )
+            self.cache = create_landmark_cache(**cache_config) if cache_config is not None else None
+        elif mode == "thread":
+            _num_hands = num_hands
+            self.cache = configure_landmark_cache(cache_config)
+            # Sampled for the profiled request whose frames a worker is processing
+            self._executor = ProfilingThreadPoolExecutor(
+                max_workers=self.num_workers,
+                thread_name_prefix="extract"
+            )
+        else:
+            raise ValueError(f"Unknown extraction mode: {mode}")
+
+        logger.info(f"Frame extractor using {self.num_workers} {mode} workers")
+
+    def _landmark_rows(self, num_frames):
+        """
+        Thread workers write landmarks straight into one preallocated
+        (T, 21 * num_hands, 3) array per request; process workers cannot
+        share it and return their own arrays
+        """
+        if self.mode != "thread":
+            return [None] * num_frames
+        return np.empty((num_frames, NUM_HAND_LANDMARKS * self.num_hands, 3), dtype=np.float32)
+
+    def extract_sync(self, frames):
+        """Process frames in parallel; results are in the same order as the input"""
+        return list(self._executor.map(process_frame, frames, self._landmark_rows(len(frames))))
+
+    async def extract(self, frames):
+        """Process frames in parallel without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        rows = self._landmark_rows(len(frames))
+        futures = [loop.run_in_executor(self._executor, process_frame, f, row) for f, row in zip(frames, rows)]
+        self.pending_frames += len(frames)
+        try:
+            return await asyncio.gather(*futures)
+        finally:
+            self.pending_frames -= len(frames)
+
+    def cache_stats(self):
+        """Landmark cache counters (in process mode the memory tier lives in the workers)"""
+        return self.cache.stats() if self.cache is not None else None
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
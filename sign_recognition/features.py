@@ -0,0 +1,118 @@
+"""
+Engineered per-frame hand features.
+The plain landmark input leaves the model to learn rotation, handedness and
+joint-angle invariance from raw coordinates. This stage computes those
+invariants up front, vectorized over a whole batch of sequences:
+
+    coordinates   63  landmarks mirrored to one handedness, rotated so the palm
+                      points up and scaled by palm length
+    distances     10  pairwise distances between the five fingertips
+    angles        15  flexion at the three joints of every finger, in units of pi
+    velocity      63  frame-to-frame change of the canonical coordinates
+    motion         3  wrist displacement since the previous frame, in palm lengths
+    orientation    3  cos/sin of the palm direction and the mirroring flag
+
+Each hand contributes FEATURES_PER_HAND values per frame; an absent hand
+(all-zero landmarks) yields zeros. Bump FEATURE_VERSION whenever the
+features change so cached copies (see PackedDataset.cached_features) are
+recomputed.
+"""
+import numpy as np
+
+FEATURE_SETS = ('landmarks', 'engineered')
+DEFAULT_FEATURE_SET = 'landmarks'
+FEATURE_VERSION = 1
+
+NUM_LANDMARKS = 21
+WRIST, INDEX_MCP, MIDDLE_MCP, PINKY_MCP = 0, 5, 9, 17
+FINGERTIPS = np.array([4, 8, 12, 16, 20])
+# Wrist followed by the four landmarks of each finger, base to tip
+FINGER_CHAINS = np.array([
+    [0, 1, 2, 3, 4],
+    [0, 5, 6, 7, 8],
+    [0, 9, 10, 11, 12],
+    [0, 13, 14, 15, 16],
+    [0, 17, 18, 19, 20],
+])
+
+_TIP_PAIRS = np.triu_indices(len(FINGERTIPS), k=1)
+
+FEATURES_PER_HAND = 63 + len(_TIP_PAIRS[0]) + 15 + 63 + 3 + 3
+
+
+def canonical_hands(hands):
+    """
+    Mirror, rotate and scale hands of shape (..., 21, 3) into a common frame.
+    Returns the canonical landmarks, the palm length, the palm direction
+    (cos, sin) and a mirrored flag.
+    """
+    centered = hands - hands[..., WRIST:WRIST + 1, :]
+
+    # The palm's winding (index -> pinky knuckle) tells left from right hands
+    index, pinky = centered[..., INDEX_MCP, :2], centered[..., PINKY_MCP, :2]
+    winding = index[..., 0] * pinky[..., 1] - index[..., 1] * pinky[..., 0]
+    mirrored = winding < 0
+    centered[..., 0] = np.where(mirrored[..., np.newaxis], -centered[..., 0], centered[..., 0])
+
+    # Rotate in the image plane so the wrist -> middle knuckle direction points up (-y)
+    palm = centered[..., MIDDLE_MCP, :]
+    palm_length = np.linalg.norm(palm, axis=-1)
+    planar = np.hypot(palm[..., 0], palm[..., 1])
+    safe = np.where(planar > 0, planar, 1.0)
+    cos = np.where(planar > 0, -palm[..., 1] / safe, 1.0)
+    sin = np.where(planar > 0, -palm[..., 0] / safe, 0.0)
+    x, y = centered[..., 0], centered[..., 1]
+    rotated = np.stack([cos[..., np.newaxis] * x - sin[..., np.newaxis] * y,
+                        sin[..., np.newaxis] * x + cos[..., np.newaxis] * y,
+                        centered[..., 2]], axis=-1)
+
+    scale = np.where(palm_length > 0, palm_length, 1.0)[..., np.newaxis, np.newaxis]
+    return rotated / scale, palm_length, np.stack([cos, sin], axis=-1), mirrored
+
+
+def joint_angles(hands):
+    """Flexion at the MCP, PIP and DIP joints of each finger, (..., 15) in units of pi"""
+    chains = hands[..., FINGER_CHAINS, :]                  # (..., 5, 5, 3)
+    toward_base = chains[..., :-2, :] - chains[..., 1:-1, :]
+    toward_tip = chains[..., 2:, :] - chains[..., 1:-1, :]
+    dot = np.sum(toward_base * toward_tip, axis=-1)
+    norms = np.linalg.norm(toward_base, axis=-1) * np.linalg.norm(toward_tip, axis=-1)
+    cosine = np.divide(dot, norms, out=np.ones_like(dot), where=norms > 0)
+    angles = np.arccos(np.clip(cosine, -1.0, 1.0)) / np.pi
+    return angles.reshape(angles.shape[:-2] + (-1,))
+
+
+def engineered_features(batch):
+    """
+    Features for sequences of shape (N, T, 21 * num_hands, 3).
+    Returns float32 of shape (N, T, FEATURES_PER_HAND * num_hands).
+    """
+    batch = np.asarray(batch, dtype=np.float64)
+    num_seqs, num_frames = batch.shape[:2]
+    hands = batch.reshape(num_seqs, num_frames, -1, NUM_LANDMARKS, 3)
+    present = np.any(hands != 0, axis=(-1, -2))[..., np.newaxis]
+
+    canonical, palm_length, direction, mirrored = canonical_hands(hands)
+    tips = canonical[..., FINGERTIPS, :]
+    distances = np.linalg.norm(tips[..., _TIP_PAIRS[0], :] - tips[..., _TIP_PAIRS[1], :], axis=-1)
+    angles = joint_angles(canonical)
+
+    coordinates = canonical.reshape(canonical.shape[:-2] + (-1,))
+    velocity = np.zeros_like(coordinates)
+    velocity[:, 1:] = coordinates[:, 1:] - coordinates[:, :-1]
+
+    # Wrist movement in image coordinates relative to the hand's size
+    wrist = hands[..., WRIST, :]
+    scale = np.where(palm_length > 0, palm_length, 1.0)[..., np.newaxis]
+    motion = np.zeros_like(wrist)
+    motion[:, 1:] = (wrist[:, 1:] - wrist[:, :-1]) / scale[:, 1:]
+    # Appearing or disappearing hands are not motion
+    both_present = present[:, 1:] & present[:, :-1]
+    velocity[:, 1:] *= both_present
+    motion[:, 1:] *= both_present
+
+    features = np.concatenate([
+        coordinates, distances, angles, velocity, motion,
+        direction, mirrored[..., np.newaxis].astype(np.float64),
+    ], axis=-1) * present
+    return features.reshape(num_seqs, num_frames, -1).astype(np.float32)
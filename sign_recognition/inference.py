@@ -0,0 +1,157 @@
+"""
+Micro-batching inference scheduler for the sign language model.
+Landmark sequences submitted by concurrent requests are gathered into
+small batches and run through the model off the event loop.
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import REGISTRY, LATENCY_BUCKETS_MS, BATCH_SIZE_BUCKETS
+from profiling import current_profile, profiled
+
+logger = logging.getLogger(__name__)
+
+
+class BatchedInferenceEngine:
+    def __init__(self, model, max_batch_size=16, max_wait_ms=10.0):
+        self.model = model
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._executor = None
+        self._queue = None
+        self._worker = None
+
+        # Metrics, also exported on /metrics
+        self.request_latency = REGISTRY.histogram(
+            "inference_request_latency_ms", LATENCY_BUCKETS_MS,
+            "Time from submission to result per request"
+        )
+        self.batch_latency = REGISTRY.histogram(
+            "inference_batch_latency_ms", LATENCY_BUCKETS_MS,
+            "Model time per batch"
+        )
+        self.batch_size = REGISTRY.histogram(
+            "inference_batch_size", BATCH_SIZE_BUCKETS,
+            "Number of sequences per model call"
+        )
+
+    @property
+    def running(self):
+        return self._worker is not None and not self._worker.done()
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        """Start the batching loop on the running event loop"""
+        if self.running:
+            return
+        # A single worker thread keeps model calls serialized
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            f"Inference engine started (max_batch_size={self.max_batch_size}, "
+            f"max_wait_ms={self.max_wait * 1000:.1f})"
+        )
+
+    async def stop(self):
+        """Stop the batching loop and fail any requests still queued"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future, _, _ = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("Inference engine stopped"))
+
+        if self._executor is not None:
+            # Lets a swapped-out engine's thread exit
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def predict(self, landmarks_sequence):
+        """Queue a sequence for prediction and wait for its (sign, confidence)"""
+        if not self.running:
+            raise RuntimeError("Inference engine is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((landmarks_sequence, future, time.perf_counter(), current_profile()))
+        return await future
+
+    async def _collect_batch(self):
+        """Wait for one request, then gather more until the batch is full or the wait expires"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without waiting
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+
+            # Drop requests whose callers already gave up
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                continue
+
+            sequences = [item[0] for item in batch]
+            start = time.perf_counter()
+            try:
+                # The model call counts towards every profiled request in the batch
+                results = await loop.run_in_executor(
+                    self._executor, profiled(self.model.predict_batch, [item[3] for item in batch]), sequences
+                )
+            except Exception as e:
+                logger.error(f"Error in batched prediction: {e}")
+                for _, future, _, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            finished = time.perf_counter()
+            self.batch_latency.observe((finished - start) * 1000)
+            self.batch_size.observe(len(batch))
+
+            for (_, future, submitted, _), result in zip(batch, results):
+                self.request_latency.observe((finished - submitted) * 1000)
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self):
+        """Current configuration, queue depth and histograms"""
+        return {
+            "running": self.running,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": self.queue_depth,
+            "request_latency_ms": self.request_latency.snapshot(),
+            "batch_latency_ms": self.batch_latency.snapshot(),
+            "batch_size": self.batch_size.snapshot(),
+        }
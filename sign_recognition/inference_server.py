@@ -0,0 +1,196 @@
+"""
+Centralized inference process for the multi-worker serving mode.
+Loads the model once and serves predictions to every API worker over a Unix
+socket (see remote_inference.py for the client and the wire format), so the
+weights and the TensorFlow runtime exist once however many workers run, and
+requests from all workers are micro-batched together.
+
+Configured with the same environment variables as main.py (MODEL_BACKEND,
+MODEL_REGISTRY_DIR, MODEL_VERSION, MAX_NUM_HANDS, INFERENCE_MAX_BATCH_SIZE,
+INFERENCE_MAX_WAIT_MS). Started by serve.py; can also be run on its own.
+
+Usage: python inference_server.py [--socket /tmp/sign_inference.sock]
+"""
+import argparse
+import asyncio
+import logging
+import os
+
+import numpy as np
+
+from inference import BatchedInferenceEngine
+from model import SignLanguageModel
+from model_manager import ModelManager
+from registry import ModelRegistry
+from remote_inference import pack_message, read_message
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = os.environ.get("INFERENCE_SOCKET") or "/tmp/sign_inference.sock"
+
+MODEL_BACKEND = os.environ.get("MODEL_BACKEND", "keras")
+MODEL_REGISTRY_DIR = os.environ.get("MODEL_REGISTRY_DIR") or os.path.join(os.path.dirname(__file__), "models", "registry")
+MODEL_VERSION = os.environ.get("MODEL_VERSION") or None
+MAX_NUM_HANDS = int(os.environ.get("MAX_NUM_HANDS", 1))
+INFERENCE_MAX_BATCH_SIZE = int(os.environ.get("INFERENCE_MAX_BATCH_SIZE", 16))
+INFERENCE_MAX_WAIT_MS = float(os.environ.get("INFERENCE_MAX_WAIT_MS", 10))
+
+
+class InferenceServer:
+    def __init__(self, socket_path):
+        self.socket_path = socket_path
+        self.registry = ModelRegistry(MODEL_REGISTRY_DIR)
+        self.manager = ModelManager(self._load, self._create_engine)
+        self._load_lock = asyncio.Lock()
+        self.connections = 0
+        self._writers = {}  # writer -> its write lock
+
+    def _load(self, version):
+        version = version or MODEL_VERSION or self.registry.current()
+        model_dir = self.registry.path(version) if version else None
+        loaded = SignLanguageModel(backend=MODEL_BACKEND, model_dir=model_dir)
+        if loaded.model is None:
+            raise RuntimeError(f"No trained model found{f' for version {version}' if version else ''}")
+        if loaded.num_hands != MAX_NUM_HANDS:
+            logger.warning(f"Model expects {loaded.num_hands} hand(s) but MAX_NUM_HANDS={MAX_NUM_HANDS}")
+        loaded.warm_up(batch_sizes=sorted({1, INFERENCE_MAX_BATCH_SIZE}))
+        return loaded
+
+    def _create_engine(self, loaded):
+        return BatchedInferenceEngine(
+            loaded,
+            max_batch_size=INFERENCE_MAX_BATCH_SIZE,
+            max_wait_ms=INFERENCE_MAX_WAIT_MS
+        )
+
+    def model_info(self):
+        served = self.manager.current
+        return {
+            "version": served.version,
+            "backend": served.model.backend,
+            "classes": served.model.classes,
+            "sequence_length": served.model.sequence_length,
+            "num_hands": served.model.num_hands,
+            # Orders models across swaps, so workers can tell which one is newer
+            "loaded_at": served.loaded_at,
+        }
+
+    async def load(self, version=None):
+        """
+        Make a version current. Every API worker asks for the version it wants
+        at startup and on reload, so a version that is already served is not
+        loaded again; None means whatever is current (loading it if nothing is).
+        Every connected worker is told about the new model, so workers that did
+        not ask for the swap stop caching predictions under the old version.
+        """
+        async with self._load_lock:
+            current = self.manager.current
+            if current is None or (version is not None and version != current.version):
+                await self.manager.swap(version)
+                await self._broadcast({"event": "loaded", "model": self.model_info()})
+        return self.model_info()
+
+    async def _broadcast(self, message):
+        for writer, write_lock in list(self._writers.items()):
+            try:
+                async with write_lock:
+                    writer.write(pack_message(message))
+                    await writer.drain()
+            except ConnectionError:
+                pass
+
+    async def _handle(self, message):
+        op = message.get("op")
+        if op == "predict":
+            landmarks = np.frombuffer(message["landmarks"], dtype=np.float32).reshape(message["shape"])
+            async with self.manager.use() as served:
+                predicted_sign, confidence = await served.engine.predict(landmarks)
+            return [predicted_sign, float(confidence), served.version, served.loaded_at]
+        if op == "load":
+            return await self.load(message.get("version"))
+        if op == "stats":
+            if not self.manager.ready:
+                return {"ready": False, "connections": self.connections}
+            return {
+                "ready": True,
+                "connections": self.connections,
+                "model": self.model_info(),
+                "engine": self.manager.current.engine.stats(),
+                "last_swap": self.manager.last_swap,
+            }
+        raise ValueError(f"Unknown op '{op}'")
+
+    async def _respond(self, message, writer, write_lock):
+        try:
+            response = {"result": await self._handle(message)}
+        except Exception as e:
+            response = {"error": str(e)}
+        if "id" in message:
+            response["id"] = message["id"]
+        else:
+            # One-shot requests (remote_load) get the result map itself
+            response = response.get("result", response)
+        async with write_lock:
+            writer.write(pack_message(response))
+            await writer.drain()
+
+    async def _serve_connection(self, reader, writer):
+        # Requests on one connection are handled concurrently so they can share
+        # a batch; responses carry the request id and may arrive out of order
+        self.connections += 1
+        write_lock = asyncio.Lock()
+        self._writers[writer] = write_lock
+        tasks = set()
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                task = asyncio.create_task(self._respond(message, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            self._writers.pop(writer, None)
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def run(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._serve_connection, path=self.socket_path)
+        logger.info(f"Inference server listening on {self.socket_path}")
+        try:
+            # Start loading right away rather than on the first worker's request
+            try:
+                await self.load()
+                logger.info(f"Serving model {self.manager.current.version or 'default'}")
+            except Exception as e:
+                logger.error(f"Error loading model: {e}")
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.manager.stop()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve model predictions to API workers over a Unix socket")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    args = parser.parse_args()
+    try:
+        asyncio.run(InferenceServer(args.socket).run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Headless ingestion of recorded videos into the training-data layout.
+Videos are read without a display, hand landmarks are extracted in a
+process pool (one video per worker, one MediaPipe Hands per process) and
+cut into sequence_length windows written as <sign>/<video>_w<k>.npy, next
+to the seq_<n>.npy files collect_data.py records.
+
+Videos are labelled by the name of their parent directory
+(<videos-dir>/<sign>/*.mp4), or all with --sign for a flat directory.
+Every finished video is appended to a manifest in the output directory, so
+an interrupted run picks up where it stopped and re-runs skip videos that
+were already processed.
+
+Usage: python ingest_videos.py VIDEOS_DIR [--sign one] [--output-dir training_data] [--workers N]
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+
+from extraction import create_hands, landmarks_from_frame
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.mkv', '.webm')
+MANIFEST_FILE = 'ingest_manifest.jsonl'
+
+# One video-mode Hands per worker process, reset between videos
+_hands = None
+_num_hands = 1
+
+
+def _init_worker(num_hands):
+    global _hands, _num_hands
+    _num_hands = num_hands
+    _hands = create_hands(static_image_mode=False, max_num_hands=num_hands)
+
+
+def find_videos(videos_dir, sign=None):
+    """(path, sign) for every video under videos_dir"""
+    videos = []
+    for root, _, files in os.walk(videos_dir):
+        for name in sorted(files):
+            if name.lower().endswith(VIDEO_EXTENSIONS):
+                label = sign or os.path.basename(root)
+                videos.append((os.path.join(root, name), label))
+    return sorted(videos)
+
+
+def video_key(path):
+    """Identifies a video file version: path, size and modification time"""
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def load_manifest(output_dir):
+    """Keys of videos a previous run finished"""
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    done = set()
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    done.add(json.loads(line)["key"])
+    return done
+
+
+def append_manifest(output_dir, entry):
+    with open(os.path.join(output_dir, MANIFEST_FILE), "a") as f:
+        f.write(json.dumps(entry) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_landmarks(path, frame_step=1):
+    """Landmarks for every frame_step-th frame of a video, None where no hand was found"""
+    _hands.reset()
+    capture = cv2.VideoCapture(path)
+    landmarks = []
+    index = 0
+    try:
+        while True:
+            # grab() skips decoding the frames we don't sample
+            if not capture.grab():
+                break
+            if index % frame_step == 0:
+                ok, frame = capture.retrieve()
+                if not ok:
+                    break
+                landmarks.append(landmarks_from_frame(frame, _hands, _num_hands))
+            index += 1
+    finally:
+        capture.release()
+    return landmarks
+
+
+def segment(landmarks, sequence_length, stride, min_hand_fraction=0.7):
+    """
+    Cut per-frame landmarks into sequence_length windows.
+    Windows with fewer than min_hand_fraction hand frames are dropped;
+    frames without a hand take the landmarks of the nearest earlier hand frame
+    (or the first one, at the start of a window).
+    """
+    windows = []
+    for start in range(0, len(landmarks) - sequence_length + 1, stride):
+        window = landmarks[start:start + sequence_length]
+        hand_frames = [frame for frame in window if frame is not None]
+        if len(hand_frames) < sequence_length * min_hand_fraction:
+            continue
+
+        filled = []
+        last = hand_frames[0]
+        for frame in window:
+            last = frame if frame is not None else last
+            filled.append(last)
+        windows.append(np.asarray(filled, dtype=np.float32))
+    return windows
+
+
+def _save_atomic(path, array):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def ingest_video(path, sign, output_dir, sequence_length, stride, frame_step, min_hand_fraction):
+    """Extract, segment and write one video; runs in a worker process"""
+    start = time.perf_counter()
+    landmarks = read_landmarks(path, frame_step)
+    windows = segment(landmarks, sequence_length, stride, min_hand_fraction)
+
+    sign_dir = os.path.join(output_dir, sign)
+    os.makedirs(sign_dir, exist_ok=True)
+    # Names are deterministic, so a video re-run after an interruption overwrites its partial output
+    stem = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.blake2b(os.path.abspath(path).encode(), digest_size=4).hexdigest()
+    for k, window in enumerate(windows):
+        _save_atomic(os.path.join(sign_dir, f"{stem}_{digest}_w{k}.npy"), window)
+
+    return {
+        "frames": len(landmarks),
+        "hand_frames": sum(frame is not None for frame in landmarks),
+        "windows": len(windows),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def ingest(videos_dir, output_dir, sign=None, workers=None, sequence_length=30, stride=None,
+           frame_step=1, min_hand_fraction=0.7, num_hands=1):
+    """Ingest every video not yet in the manifest; returns the number of windows written"""
+    os.makedirs(output_dir, exist_ok=True)
+    done = load_manifest(output_dir)
+    found = find_videos(videos_dir, sign)
+    videos = [(path, label) for path, label in found if video_key(path) not in done]
+    skipped = len(found) - len(videos)
+    print(f"{len(videos)} videos to ingest, {skipped} already done")
+    if not videos:
+        return 0
+
+    stride = stride or sequence_length
+    total_windows = 0
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                             initializer=_init_worker, initargs=(num_hands,)) as executor:
+        futures = {
+            executor.submit(ingest_video, path, label, output_dir, sequence_length,
+                            stride, frame_step, min_hand_fraction): (path, label)
+            for path, label in videos
+        }
+        for count, future in enumerate(as_completed(futures), start=1):
+            path, label = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # Left out of the manifest, so the next run retries it
+                print(f"[{count}/{len(videos)}] {path}: failed ({e})")
+                continue
+
+            append_manifest(output_dir, {"key": video_key(path), "sign": label, **result})
+            total_windows += result["windows"]
+            fps = result["frames"] / result["seconds"] if result["seconds"] else 0.0
+            print(f"[{count}/{len(videos)}] {path} -> {label}: {result['windows']} windows, "
+                  f"hands in {result['hand_frames']}/{result['frames']} frames ({fps:.0f} fps)")
+    return total_windows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract landmark sequences from recorded videos")
+    parser.add_argument("videos_dir")
+    parser.add_argument("--sign", default=None, help="Label for every video (default: parent directory name)")
+    parser.add_argument("--output-dir", default=os.path.join(os.path.dirname(__file__), 'training_data'))
+    parser.add_argument("--workers", type=int, default=None, help="defaults to the number of cores")
+    parser.add_argument("--sequence-length", type=int, default=30)
+    parser.add_argument("--stride", type=int, default=None, help="Frames between window starts (default: sequence length)")
+    parser.add_argument("--frame-step", type=int, default=1, help="Use every Nth frame")
+    parser.add_argument("--min-hand-fraction", type=float, default=0.7)
+    parser.add_argument("--num-hands", type=int, choices=[1, 2], default=1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    windows = ingest(args.videos_dir, args.output_dir, args.sign, args.workers, args.sequence_length,
+                     args.stride, args.frame_step, args.min_hand_fraction, args.num_hands)
+    print(f"\nWrote {windows} sequences to {args.output_dir} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Compact binary encoding for landmark sequences.
+Clients that already have hand landmarks send them as little-endian
+float16/float32 tensors of shape (T, 21, 3), either as a raw body or
+wrapped in msgpack, instead of base64 JPEG frames.
+"""
+import msgpack
+import numpy as np
+
+NUM_LANDMARKS = 21
+NUM_COORDS = 3
+LANDMARK_DTYPES = {
+    "float16": np.dtype("<f2"),
+    "float32": np.dtype("<f4"),
+}
+
+
+def _landmark_dtype(dtype):
+    if not isinstance(dtype, str) or dtype not in LANDMARK_DTYPES:
+        raise ValueError(f"Unsupported landmark dtype '{dtype}', expected one of {list(LANDMARK_DTYPES)}")
+    return LANDMARK_DTYPES[dtype]
+
+
+def decode_landmark_bytes(data, dtype="float32", num_landmarks=NUM_LANDMARKS):
+    """
+    Decode a raw landmark tensor into a float32 array of shape (T, num_landmarks, 3),
+    where num_landmarks is 21 per hand.
+    Frames containing NaN mark frames where no hand was found; they are
+    dropped, as are frames with infinite coordinates.
+    """
+    np_dtype = _landmark_dtype(dtype)
+    frame_bytes = num_landmarks * NUM_COORDS * np_dtype.itemsize
+
+    if not isinstance(data, (bytes, bytearray, memoryview)):
+        raise ValueError("Landmark payload must be binary data")
+    if not data:
+        raise ValueError("Empty landmark payload")
+    if len(data) % frame_bytes != 0:
+        raise ValueError(f"Payload of {len(data)} bytes is not a whole number of {dtype} ({num_landmarks}, 3) frames")
+
+    landmarks = np.frombuffer(data, dtype=np_dtype).reshape(-1, num_landmarks, NUM_COORDS)
+    landmarks = landmarks[np.isfinite(landmarks).all(axis=(1, 2))]
+    return landmarks.astype(np.float32)
+
+
+def encode_landmark_bytes(landmarks, dtype="float16"):
+    """Encode a (T, num_landmarks, 3) array as raw little-endian bytes"""
+    landmarks = np.asarray(landmarks)
+    landmarks = landmarks.reshape(len(landmarks), -1, NUM_COORDS)
+    return landmarks.astype(_landmark_dtype(dtype)).tobytes()
+
+
+def decode_msgpack_landmarks(data, num_landmarks=NUM_LANDMARKS):
+    """
+    Decode a msgpack payload of the form
+    {"landmarks": <bytes>, "dtype": "float16", "expectedSign": "one"}.
+    Returns (landmarks, expected_sign).
+    """
+    try:
+        payload = msgpack.unpackb(data, raw=False)
+    except Exception as e:
+        raise ValueError(f"Invalid msgpack payload: {e}")
+
+    if not isinstance(payload, dict) or "landmarks" not in payload:
+        raise ValueError("msgpack payload must be a map with a 'landmarks' field")
+
+    landmarks = decode_landmark_bytes(payload["landmarks"], payload.get("dtype", "float32"), num_landmarks)
+    return landmarks, _expected_sign(payload)
+
+
+def encode_msgpack_landmarks(landmarks, expected_sign, dtype="float16"):
+    """Encode landmarks and the expected sign as a msgpack payload"""
+    return msgpack.packb({
+        "landmarks": encode_landmark_bytes(landmarks, dtype),
+        "dtype": dtype,
+        "expectedSign": expected_sign,
+    }, use_bin_type=True)
+
+
+def _expected_sign(payload):
+    expected_sign = payload.get("expectedSign") or ""
+    if not isinstance(expected_sign, str):
+        raise ValueError("'expectedSign' must be a string")
+    return expected_sign
+
+
+def decode_json_landmarks(payload, num_landmarks=NUM_LANDMARKS):
+    """
+    Decode a JSON payload of the form
+    {"landmarks": [[x, y, z, ...], ...], "expectedSign": "one",
+     "frameHashes": ["<sha256 hex>", ...],
+     "verify": [{"index": 3, "frame": "data:image/jpeg;base64,..."}]}
+    as sent by browsers that run hand tracking themselves. Each landmark
+    frame holds num_landmarks * 3 numbers (flat or as [x, y, z] triples) and
+    only frames with a hand are sent. "frameHashes" holds the SHA-256 of
+    each camera frame the landmarks came from, and "verify" the frames the
+    server asked for to check them, indexed into "landmarks" (see
+    verification.py).
+    Returns (landmarks, expected_sign, frame_hashes, samples) with samples a
+    dict of index to frame.
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get("landmarks"), list):
+        raise ValueError("JSON payload must be an object with a 'landmarks' list")
+
+    try:
+        landmarks = np.asarray(payload["landmarks"], dtype=np.float32)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid landmark frames: {e}")
+    if landmarks.size % (num_landmarks * NUM_COORDS) != 0:
+        raise ValueError(f"Landmark frames must each hold {num_landmarks} x {NUM_COORDS} numbers")
+    landmarks = landmarks.reshape(-1, num_landmarks, NUM_COORDS)
+    if not np.isfinite(landmarks).all():
+        raise ValueError("Landmark frames must be finite numbers")
+
+    frame_hashes = payload.get("frameHashes")
+    if frame_hashes is not None:
+        if not isinstance(frame_hashes, list) or len(frame_hashes) != len(landmarks) or \
+                not all(isinstance(digest, str) for digest in frame_hashes):
+            raise ValueError("'frameHashes' must hold one SHA-256 hex string per landmark frame")
+        frame_hashes = [digest.lower() for digest in frame_hashes]
+
+    samples = {}
+    for sample in payload.get("verify") or []:
+        index = sample.get("index") if isinstance(sample, dict) else None
+        if not isinstance(index, int) or not 0 <= index < len(landmarks) or not isinstance(sample.get("frame"), str):
+            raise ValueError("Verification samples need an 'index' into 'landmarks' and a base64 'frame'")
+        samples[index] = sample["frame"]
+
+    return landmarks, _expected_sign(payload), frame_hashes, samples
@@ -2,16 +2,31 @@
 FastAPI backend for sign language recognition.
 This server processes webcam frames and returns sign predictions.
 """
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 from typing import List, Optional
-import base64
-import cv2
-import numpy as np
 import os
-import mediapipe as mp
+import asyncio
+import json
+import time
+import uuid
 from model import SignLanguageModel
+from extraction import FRAMES_TOTAL, FRAMES_WITH_HANDS, NUM_HAND_LANDMARKS, FrameExtractor
+from inference import BatchedInferenceEngine
+from model_manager import ModelManager
+from registry import ModelRegistry
+from remote_inference import RemoteInferenceEngine, remote_load
+from landmark_codec import decode_json_landmarks, decode_landmark_bytes, decode_msgpack_landmarks
+from streaming import RecognitionSession, process_session_frames
+from sampling import AdaptiveSampler
+from tracker_pool import HandsTrackerPool, PoolExhausted
+from verification import FramesRequired, LandmarkVerifier
+from admission import AdmissionController, Deadline, DeadlineExceeded, Overloaded
+from cache import MISS, create_prediction_cache, sequence_key
+from metrics import REGISTRY, LATENCY_BUCKETS_MS
+from profiling import ProfilingThreadPoolExecutor, SlowRequestProfiler
 import logging
 import uvicorn
 
@@ -34,102 +49,454 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize MediaPipe Hands
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(
-    static_image_mode=False,
-    max_num_hands=1,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
+# Landmark and prediction caches; CACHE_DIR adds a disk tier shared by workers
+CACHE_DIR = os.environ.get("CACHE_DIR") or None
+CACHE_TTL_SECONDS = float(os.environ.get("CACHE_TTL_SECONDS", 600))
+LANDMARK_CACHE_ENTRIES = int(os.environ.get("LANDMARK_CACHE_ENTRIES", 10000))
+PREDICTION_CACHE_ENTRIES = int(os.environ.get("PREDICTION_CACHE_ENTRIES", 1000))
+
+landmark_cache_config = {
+    "max_entries": LANDMARK_CACHE_ENTRIES,
+    "ttl_seconds": CACHE_TTL_SECONDS,
+    "disk_dir": CACHE_DIR,
+} if LANDMARK_CACHE_ENTRIES > 0 else None
+prediction_cache = create_prediction_cache(
+    max_entries=PREDICTION_CACHE_ENTRIES,
+    ttl_seconds=CACHE_TTL_SECONDS,
+    disk_dir=CACHE_DIR
+) if PREDICTION_CACHE_ENTRIES > 0 else None
+
+# Hands tracked per frame; the model must have been trained with the same number
+MAX_NUM_HANDS = int(os.environ.get("MAX_NUM_HANDS", 1))
+NUM_LANDMARKS = NUM_HAND_LANDMARKS * MAX_NUM_HANDS
+
+# Parallel frame decode + landmark extraction, one MediaPipe Hands per worker.
+# JPEGs are decoded at 1/2, 1/4 or 1/8 scale as long as their short side
+# stays at least DECODE_MIN_SIDE pixels (0 decodes at full resolution).
+EXTRACTION_WORKERS = int(os.environ.get("EXTRACTION_WORKERS", 0)) or None
+EXTRACTION_MODE = os.environ.get("EXTRACTION_MODE", "thread")
+DECODE_MIN_SIDE = int(os.environ.get("DECODE_MIN_SIDE", 240))
+frame_extractor = FrameExtractor(
+    num_workers=EXTRACTION_WORKERS,
+    mode=EXTRACTION_MODE,
+    cache_config=landmark_cache_config,
+    num_hands=MAX_NUM_HANDS,
+    decode_min_side=DECODE_MIN_SIDE
+)
+
+# Landmarks extracted in the browser are spot-checked: for a LANDMARK_VERIFY_RATE
+# share of attempts the server asks for LANDMARK_VERIFY_FRAMES of the camera
+# frames the client hashed, MediaPipe re-runs on them, and the attempt is
+# rejected if the client's landmarks differ by more than
+# LANDMARK_VERIFY_TOLERANCE. Raw and msgpack bodies and WebSocket binary
+# messages cannot carry frame hashes and are not checked. Workers must share LANDMARK_VERIFY_SECRET (serve.py sets one).
+landmark_verifier = LandmarkVerifier(
+    frame_extractor.extract,
+    sample_size=int(os.environ.get("LANDMARK_VERIFY_FRAMES", 2)),
+    rate=float(os.environ.get("LANDMARK_VERIFY_RATE", 1.0)),
+    tolerance=float(os.environ.get("LANDMARK_VERIFY_TOLERANCE", 0.05)),
+    secret=os.environ.get("LANDMARK_VERIFY_SECRET", "").encode() or None
+)
+
+# Video-mode trackers for WebSocket streams and requests carrying a sessionId;
+# a session keeps its tracker until it ends or has been idle TRACKER_IDLE_SECONDS
+TRACKER_POOL_SIZE = int(os.environ.get("TRACKER_POOL_SIZE", 8))
+TRACKER_IDLE_SECONDS = float(os.environ.get("TRACKER_IDLE_SECONDS", 60))
+TRACKER_CHECKOUT_TIMEOUT = float(os.environ.get("TRACKER_CHECKOUT_TIMEOUT", 5))
+tracker_pool = HandsTrackerPool(
+    max_size=TRACKER_POOL_SIZE,
+    idle_timeout=TRACKER_IDLE_SECONDS,
+    max_num_hands=MAX_NUM_HANDS
+)
+
+# Model backend ("keras" or "tflite", see export_model.py)
+MODEL_BACKEND = os.environ.get("MODEL_BACKEND", "keras")
+
+# Micro-batching scheduler in front of model.predict
+INFERENCE_MAX_BATCH_SIZE = int(os.environ.get("INFERENCE_MAX_BATCH_SIZE", 16))
+INFERENCE_MAX_WAIT_MS = float(os.environ.get("INFERENCE_MAX_WAIT_MS", 10))
+
+# Versioned models (see registry.py). The server loads MODEL_VERSION, or the
+# registry's current version, or models/sign_language_model.h5 if nothing has
+# been published. With MODEL_WATCH_SECONDS > 0 it also polls the registry and
+# hot-swaps when the current version changes.
+MODEL_REGISTRY_DIR = os.environ.get("MODEL_REGISTRY_DIR") or os.path.join(os.path.dirname(__file__), "models", "registry")
+MODEL_VERSION = os.environ.get("MODEL_VERSION") or None
+MODEL_WATCH_SECONDS = float(os.environ.get("MODEL_WATCH_SECONDS", 0))
+model_registry = ModelRegistry(MODEL_REGISTRY_DIR)
+
+# Multi-worker mode (see serve.py): with INFERENCE_SOCKET set, the model lives
+# in a separate inference_server.py process shared by all API workers and
+# this process never loads TensorFlow. Predictions always use the model the
+# inference process currently serves, so streams are not pinned across a swap.
+INFERENCE_SOCKET = os.environ.get("INFERENCE_SOCKET") or None
+
+# The model is loaded and warmed up in the background after startup;
+# /ready reports 503 until both have finished
+model_ready = False
+model_status = "loading"
+
+# Adaptive sampling: detect hands on every ADAPTIVE_STRIDE-th frame first, refine
+# only around frames with a hand, and stop at sequence_length distinct hand frames
+# or a prediction at least ADAPTIVE_CONFIDENCE confident. Requests can override
+# the default with "adaptive": true/false.
+ADAPTIVE_SAMPLING = os.environ.get("ADAPTIVE_SAMPLING", "0") == "1"
+ADAPTIVE_STRIDE = int(os.environ.get("ADAPTIVE_STRIDE", 4))
+ADAPTIVE_CONFIDENCE = float(os.environ.get("ADAPTIVE_CONFIDENCE", 0.9))
+ADAPTIVE_DUPLICATE_THRESHOLD = float(os.environ.get("ADAPTIVE_DUPLICATE_THRESHOLD", 0.005))
+
+# Admission control (see admission.py): ADMISSION_MAX_CONCURRENT recognition
+# requests are processed at once and up to ADMISSION_MAX_QUEUE more wait at
+# most ADMISSION_QUEUE_TIMEOUT_MS for a slot; the rest get 429 or 503 with
+# Retry-After. ADMISSION_MAX_CONCURRENT=0 disables the limit. A request stops
+# being processed after REQUEST_DEADLINE_MS, or after the client's shorter
+# X-Request-Timeout-Ms budget. Requests may carry at most
+# MAX_FRAMES_PER_REQUEST frames and MAX_REQUEST_BYTES of body.
+ADMISSION_MAX_CONCURRENT = int(os.environ.get("ADMISSION_MAX_CONCURRENT", 8))
+ADMISSION_MAX_QUEUE = int(os.environ.get("ADMISSION_MAX_QUEUE", 16))
+ADMISSION_QUEUE_TIMEOUT_MS = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT_MS", 5000))
+REQUEST_DEADLINE_MS = float(os.environ.get("REQUEST_DEADLINE_MS", 30000))
+MAX_FRAMES_PER_REQUEST = int(os.environ.get("MAX_FRAMES_PER_REQUEST", 120))
+MAX_REQUEST_BYTES = int(os.environ.get("MAX_REQUEST_BYTES", 50 * 1024 * 1024))
+ADMITTED_PATHS = {"/api/quiz", "/api/quiz/landmarks"}
+admission = AdmissionController(
+    max_concurrent=ADMISSION_MAX_CONCURRENT,
+    max_queue=ADMISSION_MAX_QUEUE,
+    queue_timeout=ADMISSION_QUEUE_TIMEOUT_MS / 1000
 )
 
-# Initialize the model
-try:
-    model = SignLanguageModel()
-    logger.info("Sign language model initialized successfully")
-except Exception as e:
-    logger.error(f"Error initializing model: {e}")
-    model = None
+# Emit a rolling prediction every N new hand frames on the WebSocket stream.
+# A stream holds an admission slot while open, is closed after
+# STREAM_DEADLINE_MS or STREAM_MAX_FRAMES frames, and may not send messages
+# larger than STREAM_MAX_MESSAGE_BYTES
+STREAM_PREDICT_EVERY = int(os.environ.get("STREAM_PREDICT_EVERY", 5))
+STREAM_DEADLINE_MS = float(os.environ.get("STREAM_DEADLINE_MS", 60000))
+STREAM_MAX_FRAMES = int(os.environ.get("STREAM_MAX_FRAMES", 300))
+STREAM_MAX_MESSAGE_BYTES = int(os.environ.get("STREAM_MAX_MESSAGE_BYTES", 1024 * 1024))
+
+# Optional sampling profiler: requests slower than PROFILE_SLOW_REQUESTS_MS
+# get a folded-stack flame graph written to PROFILE_DIR
+PROFILE_SLOW_REQUESTS_MS = float(os.environ.get("PROFILE_SLOW_REQUESTS_MS", 0))
+slow_request_profiler = SlowRequestProfiler(
+    os.environ.get("PROFILE_DIR", os.path.join(os.path.dirname(__file__), "profiles")),
+    threshold_ms=PROFILE_SLOW_REQUESTS_MS,
+    sample_rate=float(os.environ.get("PROFILE_SAMPLE_RATE", 1.0))
+) if PROFILE_SLOW_REQUESTS_MS > 0 else None
+
+def hand_detection_rate():
+    total = FRAMES_TOTAL.value
+    return FRAMES_WITH_HANDS.value / total if total else None
+
+def register_gauges():
+    """Gauges read at scrape time from the extractor, engine and caches"""
+    REGISTRY.gauge("recognition_hand_detection_rate", hand_detection_rate,
+                   "Fraction of frames in which a hand was detected")
+    REGISTRY.gauge("recognition_pending_frames", lambda: frame_extractor.pending_frames,
+                   "Frames queued or in progress in the extraction pool")
+    REGISTRY.gauge("inference_queue_depth",
+                   lambda: model_manager.current.engine.queue_depth if model_manager.ready else 0,
+                   "Sequences waiting for the inference engine")
+    REGISTRY.gauge("model_ready", lambda: int(model_ready), "1 once the model is loaded and warm")
+    REGISTRY.gauge("admission_in_flight", lambda: admission.in_flight,
+                   "Recognition requests being processed")
+    REGISTRY.gauge("admission_queued", lambda: admission.queued,
+                   "Recognition requests waiting for admission")
+    REGISTRY.gauge("tracker_pool_size", lambda: tracker_pool.stats()["size"],
+                   "Hand trackers created in the session pool")
+    REGISTRY.gauge("tracker_pool_busy", lambda: tracker_pool.stats()["busy"],
+                   "Hand trackers currently processing a frame")
+    REGISTRY.gauge("tracker_pool_sessions", lambda: tracker_pool.stats()["sessions"],
+                   "Sessions bound to a hand tracker")
+    
+    caches = {"landmarks": frame_extractor.cache_stats, "predictions": lambda: prediction_cache.stats() if prediction_cache is not None else None}
+    for cache_name, read_stats in caches.items():
+        for tier in ("memory", "disk"):
+            for field in ("hits", "misses", "entries", "bytes"):
+                def read(read_stats=read_stats, tier=tier, field=field):
+                    stats = read_stats()
+                    return stats[tier][field] if stats and tier in stats else None
+                REGISTRY.gauge(f"cache_{field}", read, f"Cache {field}",
+                               {"cache": cache_name, "tier": tier})
+
+register_gauges()
 
 # Data models
 class FrameData(BaseModel):
     frames: List[str]  # Base64 encoded frames
     expectedSign: str  # Expected sign
+    sessionId: Optional[str] = None  # Track hands across requests of one session
+    adaptive: Optional[bool] = None  # Override ADAPTIVE_SAMPLING for this request
 
 class RecognitionResult(BaseModel):
     isCorrect: bool
     predictedSign: str
     confidence: float
     message: Optional[str] = None
+    framesProcessed: Optional[int] = None
+    verified: Optional[bool] = None  # Outcome of the client landmark spot check, if one ran
+    verifyFrames: Optional[List[int]] = None  # Landmark frames to resend as "verify" before a result is given
+
+def request_deadline(request):
+    """REQUEST_DEADLINE_MS, shortened to the client's X-Request-Timeout-Ms if it sent one"""
+    budget_ms = REQUEST_DEADLINE_MS
+    try:
+        budget_ms = min(budget_ms, float(request.headers.get("x-request-timeout-ms", budget_ms)))
+    except ValueError:
+        pass
+    return Deadline(max(0.0, budget_ms) / 1000)
+
+def overload_response(status_code, detail, retry_after=None):
+    headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+    return JSONResponse(status_code=status_code, content={"detail": detail}, headers=headers)
+
+def deadline_error(error):
+    return HTTPException(status_code=503, detail=str(error),
+                         headers={"Retry-After": str(admission.retry_after())})
+
+# Bound the size and number of recognition requests in progress before their bodies are read
+@app.middleware("http")
+async def admit_recognition_requests(request: Request, call_next):
+    if request.method != "POST" or request.url.path not in ADMITTED_PATHS:
+        return await call_next(request)
+    
+    # Bodies sent without a Content-Length are only bounded by the gateway
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > MAX_REQUEST_BYTES:
+        return overload_response(413, f"Request body larger than {MAX_REQUEST_BYTES} bytes")
+    
+    request.state.deadline = request_deadline(request)
+    try:
+        return await admission.run(request.state.deadline, lambda: call_next(request))
+    except Overloaded as e:
+        logger.warning(f"Rejected {request.url.path} with {e.status_code}: {e.detail}")
+        return overload_response(e.status_code, e.detail, e.retry_after)
 
-# Increase the maximum size for requests
+# Time requests and profile slow ones
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
-    # Increase the maximum size limit for the request body
-    # This is needed for large base64 encoded images
-    request._body_size_limit = 100 * 1024 * 1024  # 100 MB
-    response = await call_next(request)
+    profiler = slow_request_profiler.maybe_start() if slow_request_profiler is not None else None
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if profiler is not None:
+            slow_request_profiler.finish(profiler, elapsed_ms, request.url.path)
+    
+    # Label by route template rather than raw path to bound cardinality
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    REGISTRY.histogram(
+        "http_request_latency_ms", LATENCY_BUCKETS_MS,
+        "End-to-end request latency", {"path": path}
+    ).observe(elapsed_ms)
+    
+    response.headers["X-Process-Time"] = f"{elapsed_ms / 1000:.4f}"
     return response
 
-def base64_to_image(base64_string):
-    """Convert base64 string to OpenCV image"""
-    try:
-        # Remove the data URL prefix if present
-        if "data:image" in base64_string:
-            base64_string = base64_string.split(',')[1]
-        
-        # Decode base64
-        img_data = base64.b64decode(base64_string)
-        np_arr = np.frombuffer(img_data, np.uint8)
-        
-        # Convert to OpenCV image
-        return cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-    except Exception as e:
-        logger.error(f"Error converting base64 to image: {e}")
-        return None
+def load_and_warm_model(version=None):
+    """Load a model version and run a warm-up batch at each size the engine may use"""
+    version = version or MODEL_VERSION or model_registry.current()
+    model_dir = model_registry.path(version) if version else None
+    loaded = SignLanguageModel(backend=MODEL_BACKEND, model_dir=model_dir)
+    if loaded.model is None:
+        raise RuntimeError(f"No trained model found{f' for version {version}' if version else ''}")
+    if loaded.num_hands != MAX_NUM_HANDS:
+        logger.warning(f"Model expects {loaded.num_hands} hand(s) but MAX_NUM_HANDS={MAX_NUM_HANDS}")
+    loaded.warm_up(batch_sizes=sorted({1, INFERENCE_MAX_BATCH_SIZE}))
+    return loaded
+
+def create_inference_engine(loaded):
+    return BatchedInferenceEngine(
+        loaded,
+        max_batch_size=INFERENCE_MAX_BATCH_SIZE,
+        max_wait_ms=INFERENCE_MAX_WAIT_MS
+    )
+
+def load_remote_model(version=None):
+    """Have the inference process serve a version and return its description"""
+    return remote_load(INFERENCE_SOCKET, version or MODEL_VERSION)
 
-def extract_hand_landmarks(frame):
-    """Extract hand landmarks from frame using MediaPipe"""
+if INFERENCE_SOCKET:
+    model_manager = ModelManager(load_remote_model, lambda loaded: RemoteInferenceEngine(INFERENCE_SOCKET, loaded))
+else:
+    model_manager = ModelManager(load_and_warm_model, create_inference_engine)
+
+async def initialize_model():
+    global model_ready, model_status
+    loop = asyncio.get_running_loop()
+    start = loop.time()
     try:
-        # Convert to RGB (MediaPipe requires RGB)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Process with MediaPipe
-        results = hands.process(rgb_frame)
-        
-        # Check for hand landmarks
-        if results.multi_hand_landmarks:
-            hand_landmarks = results.multi_hand_landmarks[0]  # First hand
-            
-            # Extract landmarks
-            landmarks = []
-            for landmark in hand_landmarks.landmark:
-                landmarks.append([landmark.x, landmark.y, landmark.z])
-            
-            return landmarks
-        
-        return None
+        await model_manager.swap()
+        model_ready = True
+        model_status = "ready"
+        logger.info(f"Sign language model loaded and warmed up in {loop.time() - start:.2f}s")
     except Exception as e:
-        logger.error(f"Error extracting hand landmarks: {e}")
-        return None
+        model_status = f"failed: {e}"
+        logger.error(f"Error initializing model: {e}")
+
+@app.on_event("startup")
+async def start_model_loading():
+    if slow_request_profiler is not None:
+        # Jobs sent to run_in_executor(None, ...) are sampled for the request that sent them
+        asyncio.get_running_loop().set_default_executor(ProfilingThreadPoolExecutor())
+    # Not awaited, so the server accepts connections (and answers /ready) while loading
+    app.state.model_loader = asyncio.create_task(initialize_model())
+    app.state.tracker_evictor = asyncio.create_task(evict_idle_trackers())
+    app.state.model_watcher = asyncio.create_task(watch_registry()) if MODEL_WATCH_SECONDS > 0 else None
+
+async def watch_registry():
+    """Hot-swap when the registry's current version changes (unless MODEL_VERSION pins one)"""
+    while True:
+        await asyncio.sleep(MODEL_WATCH_SECONDS)
+        version = model_registry.current()
+        if MODEL_VERSION or not model_ready or version is None or version == model_manager.current.version:
+            continue
+        try:
+            await model_manager.swap(version)
+        except Exception as e:
+            logger.error(f"Error swapping to model {version}: {e}")
+
+async def evict_idle_trackers():
+    """Free trackers of sessions that went away without closing"""
+    while True:
+        await asyncio.sleep(TRACKER_IDLE_SECONDS / 2)
+        tracker_pool.evict_idle()
+
+@app.on_event("shutdown")
+async def stop_workers():
+    await model_manager.stop()
+    app.state.tracker_evictor.cancel()
+    if app.state.model_watcher is not None:
+        app.state.model_watcher.cancel()
+    frame_extractor.shutdown()
+    tracker_pool.close()
 
 @app.get("/")
 async def root():
     """Root endpoint"""
     return {"message": "Sign Language Recognition API"}
 
+@app.get("/ready")
+async def readiness():
+    """Readiness probe: 200 once the model is loaded and warm, 503 before"""
+    if not model_ready:
+        raise HTTPException(status_code=503, detail=f"Model {model_status}")
+    served = model_manager.current
+    return {"ready": True, "backend": served.model.backend, "version": served.version}
+
+@app.get("/api/inference/stats")
+async def inference_stats():
+    """Batch size and latency histograms for the inference engine"""
+    if not model_manager.ready:
+        raise HTTPException(status_code=503, detail="Model not initialized")
+    return model_manager.current.engine.stats()
+
+class ModelSwapRequest(BaseModel):
+    version: Optional[str] = None  # Defaults to the registry's current version
+
+@app.get("/api/models")
+async def list_models():
+    """Published versions, the registry's current version and the one being served"""
+    return {
+        "versions": model_registry.versions(),
+        "current": model_registry.current(),
+        "serving": model_manager.current.info() if model_manager.ready else None,
+        "last_swap": model_manager.last_swap,
+    }
+
+@app.post("/api/models/reload")
+async def reload_model(data: ModelSwapRequest):
+    """
+    Hot-swap to another model version. The new version is loaded and warmed
+    while the old one keeps serving; requests already running finish on the
+    old model. Returns the swap time and memory overhead.
+    """
+    global model_ready, model_status
+    version = data.version or model_registry.current()
+    if version is not None and version not in model_registry.versions():
+        raise HTTPException(status_code=404, detail=f"Unknown model version '{version}'")
+    try:
+        swap = await model_manager.swap(version)
+    except Exception as e:
+        logger.error(f"Error swapping to model {version}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error loading model: {str(e)}")
+    # Also recovers a server whose initial load failed
+    model_ready = True
+    model_status = "ready"
+    return swap
+
+async def predict_sequence(served, landmarks):
+    """Predict a landmark sequence, reusing the result for an identical sequence"""
+    namespace = served.cache_namespace
+    key = sequence_key(landmarks, namespace) if prediction_cache is not None else None
+    cached = prediction_cache.get(key) if key is not None else MISS
+    if cached is not MISS:
+        return cached
+    prediction = await served.engine.predict(landmarks)
+    # Not cached if the inference process swapped models meanwhile, as either may have answered
+    if key is not None and served.cache_namespace == namespace:
+        prediction_cache.put(key, prediction)
+    return prediction
+
+async def predict_and_score(served, landmarks, expected_sign, message=None, prediction=None, frames_processed=None):
+    """Run a landmark sequence through the model and compare with the expected sign"""
+    # Predict sign, unless an early exit already did
+    predicted_sign, confidence = prediction or await predict_sequence(served, landmarks)
+    logger.info(f"Prediction: {predicted_sign} with confidence {confidence:.2f}")
+    
+    # Check correctness
+    is_correct = predicted_sign.lower() == expected_sign.lower()
+    
+    # Add more logging information
+    logger.info(f"Expected: {expected_sign}, Predicted: {predicted_sign}, Correct: {is_correct}")
+    
+    return RecognitionResult(
+        isCorrect=is_correct,
+        predictedSign=predicted_sign,
+        confidence=confidence,
+        message=message,
+        framesProcessed=frames_processed
+    )
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition of stage timings, counters and gauges"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Hit/miss counts and bytes held by the landmark and prediction caches"""
+    return {
+        "landmarks": frame_extractor.cache_stats(),
+        "predictions": prediction_cache.stats() if prediction_cache is not None else None,
+    }
+
+@app.get("/api/admission/stats")
+async def admission_stats():
+    """Requests in progress and waiting, and the recent time each holds a slot"""
+    return admission.stats()
+
+@app.get("/api/trackers/stats")
+async def tracker_stats():
+    """Size, occupancy and reassignment counts of the hand tracker pool"""
+    return tracker_pool.stats()
+
 @app.post("/api/quiz", response_model=RecognitionResult)
-async def recognize_sign(data: FrameData):
+async def recognize_sign(data: FrameData, request: Request):
     """
     Recognize sign language from a sequence of frames
     """
+    deadline = request.state.deadline
     # Check if model is initialized
-    if model is None:
-        raise HTTPException(status_code=500, detail="Model not initialized")
+    if not model_ready:
+        raise HTTPException(status_code=503, detail="Model not ready")
     
     # Check for frames
     if not data.frames or len(data.frames) == 0:
         raise HTTPException(status_code=400, detail="No frames provided")
+    if len(data.frames) > MAX_FRAMES_PER_REQUEST:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_FRAMES_PER_REQUEST} frames per request")
     
     logger.info(f"Received {len(data.frames)} frames for recognition")
     
@@ -138,53 +505,344 @@ async def recognize_sign(data: FrameData):
     frames_processed = 0
     frames_with_hands = 0
     
+    async def extract(frames):
+        if data.sessionId:
+            # Frames of one session go through its own tracker, in order
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, process_session_frames, tracker_pool, data.sessionId,
+                frames, MAX_NUM_HANDS, min(TRACKER_CHECKOUT_TIMEOUT, deadline.remaining()), deadline
+            )
+        # Decode and extract across the worker pool; results keep frame order
+        return await frame_extractor.extract(frames)
+    
+    adaptive = ADAPTIVE_SAMPLING if data.adaptive is None else data.adaptive
+    
     try:
-        for base64_frame in data.frames:
-            # Convert base64 to image
-            frame = base64_to_image(base64_frame)
-            frames_processed += 1
+        # Requests started before a model swap finish on the model they started with
+        async with model_manager.use() as served:
+            # Each stage is cancelled once the request's deadline has passed
+            if adaptive:
+                return await deadline.run(recognize_adaptive(served, data.frames, data.expectedSign, extract))
             
-            if frame is None:
-                continue
+            results = await deadline.run(extract(data.frames))
             
-            # Extract landmarks
-            landmarks = extract_hand_landmarks(frame)
+            for decoded, landmarks in results:
+                frames_processed += 1
             
-            if landmarks is not None:
-                all_landmarks.append(landmarks)
-                frames_with_hands += 1
-        
-        logger.info(f"Processed {frames_processed} frames, found hands in {frames_with_hands} frames")
-        
-        # Check if we have enough landmarks
-        if len(all_landmarks) == 0:
-            return RecognitionResult(
-                isCorrect=False,
-                predictedSign="unknown",
-                confidence=0.0,
-                message="No hand landmarks detected in any frame"
-            )
-        
-        # Predict sign
-        predicted_sign, confidence = model.predict(all_landmarks)
-        logger.info(f"Prediction: {predicted_sign} with confidence {confidence:.2f}")
-        
-        # Check correctness
-        is_correct = predicted_sign.lower() == data.expectedSign.lower()
-        
-        # Add more logging information
-        logger.info(f"Expected: {data.expectedSign}, Predicted: {predicted_sign}, Correct: {is_correct}")
-        
+                if not decoded:
+                    continue
+            
+                if landmarks is not None:
+                    all_landmarks.append(landmarks)
+                    frames_with_hands += 1
+            
+            logger.info(f"Processed {frames_processed} frames, found hands in {frames_with_hands} frames")
+            
+            # Check if we have enough landmarks
+            if len(all_landmarks) == 0:
+                return RecognitionResult(
+                    isCorrect=False,
+                    predictedSign="unknown",
+                    confidence=0.0,
+                    message="No hand landmarks detected in any frame",
+                    framesProcessed=frames_processed
+                )
+            
+            return await deadline.run(predict_and_score(
+                served,
+                all_landmarks,
+                data.expectedSign,
+                message=f"Hand detected in {frames_with_hands}/{frames_processed} frames",
+                frames_processed=frames_processed
+            ))
+    
+    except DeadlineExceeded as e:
+        logger.warning(f"Recognition stopped: {e}")
+        raise deadline_error(e)
+    except PoolExhausted as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in recognition: {e}")
+        raise HTTPException(status_code=500, detail=f"Error in recognition: {str(e)}")
+
+async def recognize_adaptive(served, frames, expected_sign, extract):
+    """Recognize from an adaptively sampled subset of the frames"""
+    sampler = AdaptiveSampler(
+        target_frames=served.model.sequence_length,
+        stride=ADAPTIVE_STRIDE,
+        confidence_threshold=ADAPTIVE_CONFIDENCE,
+        duplicate_threshold=ADAPTIVE_DUPLICATE_THRESHOLD
+    )
+    landmarks, frames_processed, prediction = await sampler.run(
+        frames, extract, lambda sequence: predict_sequence(served, sequence)
+    )
+    
+    logger.info(f"Adaptive sampling processed {frames_processed}/{len(frames)} frames, "
+                f"kept {len(landmarks)} distinct hand frames, early exit: {prediction is not None}")
+    
+    if len(landmarks) == 0:
         return RecognitionResult(
-            isCorrect=is_correct,
-            predictedSign=predicted_sign,
-            confidence=confidence,
-            message=f"Hand detected in {frames_with_hands}/{frames_processed} frames"
+            isCorrect=False,
+            predictedSign="unknown",
+            confidence=0.0,
+            message="No hand landmarks detected in any sampled frame",
+            framesProcessed=frames_processed
         )
     
+    return await predict_and_score(
+        served,
+        landmarks,
+        expected_sign,
+        message=f"Kept {len(landmarks)} hand frames from {frames_processed}/{len(frames)} processed frames",
+        prediction=prediction,
+        frames_processed=frames_processed
+    )
+
+@app.post("/api/quiz/landmarks", response_model=RecognitionResult)
+async def recognize_landmarks(request: Request, expectedSign: str = "", dtype: str = "float32"):
+    """
+    Recognize sign language from client-extracted hand landmarks.
+    The body is either a raw little-endian (T, 21 * MAX_NUM_HANDS, 3) tensor
+    (application/octet-stream, dtype given as a query parameter), a
+    msgpack map (application/msgpack), or a JSON object from browsers that
+    track hands themselves (application/json, see decode_json_landmarks).
+    Frame decoding and MediaPipe are skipped, except for the few frames the
+    server asks a JSON request to resend for verification (verifyFrames);
+    raw and msgpack bodies carry no frame hashes and are not verified.
+    """
+    if not model_ready:
+        raise HTTPException(status_code=503, detail="Model not ready")
+    deadline = request.state.deadline
+    
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    
+    frame_hashes, samples, checkable = None, {}, False
+    try:
+        if content_type.startswith("application/msgpack"):
+            landmarks, expected_sign = decode_msgpack_landmarks(body, NUM_LANDMARKS)
+            expected_sign = expected_sign or expectedSign
+        elif content_type.startswith("application/json"):
+            try:
+                payload = json.loads(body)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON payload: {e}")
+            landmarks, expected_sign, frame_hashes, samples = decode_json_landmarks(payload, NUM_LANDMARKS)
+            expected_sign = expected_sign or expectedSign
+            checkable = True
+        else:
+            landmarks = decode_landmark_bytes(body, dtype, NUM_LANDMARKS)
+            expected_sign = expectedSign
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if len(landmarks) > MAX_FRAMES_PER_REQUEST:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_FRAMES_PER_REQUEST} frames per request")
+    
+    logger.info(f"Received {len(landmarks)} landmark frames for recognition")
+    
+    if len(landmarks) == 0:
+        return RecognitionResult(
+            isCorrect=False,
+            predictedSign="unknown",
+            confidence=0.0,
+            message="No hand landmarks in payload"
+        )
+    
+    try:
+        if checkable:
+            verified = await deadline.run(landmark_verifier.verify(landmarks, frame_hashes, samples))
+        else:
+            verified = landmark_verifier.unchecked()
+    except FramesRequired as e:
+        # The client resends the same body with these frames attached
+        return RecognitionResult(
+            isCorrect=False,
+            predictedSign="unknown",
+            confidence=0.0,
+            message="Send the requested frames to verify the landmarks",
+            verifyFrames=e.indices
+        )
+    except DeadlineExceeded as e:
+        raise deadline_error(e)
+    if verified is False:
+        # The client falls back to uploading its frames
+        logger.warning("Client landmarks failed verification")
+        return RecognitionResult(
+            isCorrect=False,
+            predictedSign="unknown",
+            confidence=0.0,
+            message="Client landmarks failed verification",
+            verified=False
+        )
+    
+    try:
+        async with model_manager.use() as served:
+            result = await deadline.run(predict_and_score(
+                served,
+                landmarks,
+                expected_sign,
+                message=f"Received {len(landmarks)} landmark frames"
+            ))
+        result.verified = verified
+        return result
+    except DeadlineExceeded as e:
+        logger.warning(f"Recognition stopped: {e}")
+        raise deadline_error(e)
     except Exception as e:
         logger.error(f"Error in recognition: {e}")
         raise HTTPException(status_code=500, detail=f"Error in recognition: {str(e)}")
 
+async def stream_prediction(served, session, message_type):
+    """Predict on the session's current window and build the message to send"""
+    predicted_sign, confidence = await served.engine.predict(session.window())
+    return {
+        "type": message_type,
+        "isCorrect": predicted_sign.lower() == session.expected_sign.lower(),
+        "predictedSign": predicted_sign,
+        "confidence": confidence,
+        "framesReceived": session.frames_received,
+        "framesWithHands": session.frames_with_hands,
+    }
+
+@app.websocket("/ws/recognize")
+async def recognize_stream(websocket: WebSocket):
+    """
+    Streaming recognition. Clients send JSON text messages
+    {"type": "start", "expectedSign": ..., "dtype": ...},
+    {"type": "frame", "frame": <base64 JPEG>} and {"type": "end"},
+    or binary messages holding raw (T, 21 * MAX_NUM_HANDS, 3) landmark tensors.
+    The server answers with {"type": "prediction", ...} every
+    STREAM_PREDICT_EVERY hand frames and {"type": "final", ...} on "end".
+    Streams are admitted like recognition requests and closed with an
+    {"type": "error", ...} message once over their deadline or frame cap,
+    or with code 1013 when no hand tracker frees up in time.
+    """
+    await websocket.accept()
+    
+    if not model_ready:
+        await websocket.send_json({"type": "error", "detail": "Model not ready"})
+        await websocket.close()
+        return
+    
+    deadline = Deadline(STREAM_DEADLINE_MS / 1000)
+    try:
+        await admission.run(deadline, lambda: serve_stream(websocket, deadline), timed=False)
+    except Overloaded as e:
+        logger.warning(f"Rejected stream with {e.status_code}: {e.detail}")
+        await close_stream(websocket, 1013, e.detail, retryAfter=e.retry_after)
+
+async def close_stream(websocket, code, detail, **fields):
+    """Send a final error message and close, unless the client is already gone"""
+    try:
+        await websocket.send_json({"type": "error", "detail": detail, **fields})
+        await websocket.close(code=code)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+
+async def serve_stream(websocket, deadline):
+    loop = asyncio.get_running_loop()
+    # The whole stream stays on the model it started with, even across a swap
+    async with model_manager.use() as served:
+        try:
+            await deadline.run(run_stream(websocket, loop, served))
+        except DeadlineExceeded as e:
+            logger.warning(f"Stream stopped: {e}")
+            await close_stream(websocket, 1008, str(e))
+
+async def run_stream(websocket, loop, served):
+    session = RecognitionSession(
+        uuid.uuid4().hex,
+        tracker_pool,
+        served.model.sequence_length,
+        predict_every=STREAM_PREDICT_EVERY,
+        num_hands=MAX_NUM_HANDS,
+        checkout_timeout=TRACKER_CHECKOUT_TIMEOUT
+    )
+    
+    # Binary landmark messages carry no frame hashes, so the stream is not verified
+    binary_recorded = False
+    
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            
+            data = message.get("bytes") if message.get("bytes") is not None else message.get("text") or ""
+            if len(data) > STREAM_MAX_MESSAGE_BYTES:
+                await close_stream(websocket, 1009, f"Messages may be at most {STREAM_MAX_MESSAGE_BYTES} bytes")
+                break
+            
+            if message.get("bytes") is not None:
+                try:
+                    landmarks = session.decode_landmark_bytes(message["bytes"])
+                except ValueError as e:
+                    await websocket.send_json({"type": "error", "detail": str(e)})
+                    continue
+                # One binary message may hold many frames
+                if session.frames_received + len(landmarks) > STREAM_MAX_FRAMES:
+                    await close_stream(websocket, 1008, f"At most {STREAM_MAX_FRAMES} frames per stream")
+                    break
+                session.add_landmarks(landmarks)
+                if not binary_recorded:
+                    landmark_verifier.unchecked()
+                    binary_recorded = True
+            else:
+                try:
+                    payload = json.loads(message.get("text") or "")
+                except ValueError:
+                    await websocket.send_json({"type": "error", "detail": "Invalid JSON message"})
+                    continue
+                
+                kind = payload.get("type") if isinstance(payload, dict) else None
+                if kind == "start":
+                    expected_sign, dtype = payload.get("expectedSign", ""), payload.get("dtype", session.dtype)
+                    if not isinstance(expected_sign, str) or not isinstance(dtype, str):
+                        await websocket.send_json({"type": "error", "detail": "'expectedSign' and 'dtype' must be strings"})
+                        continue
+                    session.expected_sign, session.dtype = expected_sign, dtype
+                    continue
+                elif kind == "frame":
+                    if session.frames_received >= STREAM_MAX_FRAMES:
+                        await close_stream(websocket, 1008, f"At most {STREAM_MAX_FRAMES} frames per stream")
+                        break
+                    # Frames of one session are processed in order to keep tracking valid
+                    try:
+                        await loop.run_in_executor(None, session.add_frame, payload.get("frame", ""))
+                    except PoolExhausted as e:
+                        # Like the 503 of /api/quiz: the client may retry later
+                        await close_stream(websocket, 1013, str(e))
+                        break
+                elif kind == "end":
+                    if len(session.buffer) == 0:
+                        await websocket.send_json({
+                            "type": "final",
+                            "isCorrect": False,
+                            "predictedSign": "unknown",
+                            "confidence": 0.0,
+                            "framesReceived": session.frames_received,
+                            "framesWithHands": 0,
+                        })
+                    else:
+                        await websocket.send_json(await stream_prediction(served, session, "final"))
+                    continue
+                else:
+                    await websocket.send_json({"type": "error", "detail": f"Unknown message type: {kind}"})
+                    continue
+            
+            if session.should_predict():
+                await websocket.send_json(await stream_prediction(served, session, "prediction"))
+    
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Error in streaming recognition: {e}")
+    finally:
+        logger.info(f"Stream closed after {session.frames_received} frames, {session.frames_with_hands} with hands")
+        session.close()
+
 if __name__ == "__main__":
+    # Development server; use serve.py to run several workers
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
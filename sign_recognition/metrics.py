@@ -0,0 +1,236 @@
+"""
+Lightweight in-process metrics for the recognition server.
+Histograms are cheap enough to update on every request and can be
+snapshotted as plain dictionaries for JSON endpoints or rendered in the
+Prometheus text exposition format for /metrics.
+"""
+import bisect
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def current_rss_mb():
+    """Current resident set size in MB (Linux), falling back to the peak elsewhere"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+    return pages * resource.getpagesize() / (1024 * 1024)
+
+
+# Default bucket boundaries
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+STAGE_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels.items()) + list((extra or {}).items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in items) + "}"
+
+
+class Histogram:
+    """Fixed-bucket histogram with cumulative counts, sum and max"""
+
+    def __init__(self, name, buckets, description="", labels=None):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            # One extra slot for observations above the last boundary
+            self._counts = [0] * (len(self.buckets) + 1)
+            self.count = 0
+            self.sum = 0.0
+            self.max = 0.0
+
+    def observe(self, value):
+        """Record a single observation"""
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[idx] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q):
+        """Estimate a quantile from the bucket counts (upper bucket bound)"""
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            target = q * self.count
+            running = 0
+            for idx, bucket_count in enumerate(self._counts):
+                running += bucket_count
+                if running >= target:
+                    if idx < len(self.buckets):
+                        return float(min(self.buckets[idx], self.max))
+                    return float(self.max)
+            return float(self.max)
+
+    def snapshot(self):
+        """Return the current state as a JSON-serializable dict"""
+        with self._lock:
+            counts = list(self._counts)
+            count, total, maximum = self.count, self.sum, self.max
+
+        cumulative = []
+        running = 0
+        for bound, bucket_count in zip(list(self.buckets) + ["+Inf"], counts):
+            running += bucket_count
+            cumulative.append({"le": bound, "count": running})
+
+        return {
+            "name": self.name,
+            "labels": self.labels,
+            "description": self.description,
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+            "max": maximum,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": cumulative,
+        }
+
+    def render(self):
+        """Prometheus exposition lines (without HELP/TYPE)"""
+        with self._lock:
+            counts = list(self._counts)
+            count, total = self.count, self.sum
+
+        lines = []
+        running = 0
+        for bound, bucket_count in zip(list(self.buckets) + ["+Inf"], counts):
+            running += bucket_count
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, {'le': bound})} {running}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labels)} {total}")
+        lines.append(f"{self.name}_count{_format_labels(self.labels)} {count}")
+        return lines
+
+
+class Counter:
+    """Monotonically increasing counter"""
+
+    def __init__(self, name, description="", labels=None):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def render(self):
+        return [f"{self.name}{_format_labels(self.labels)} {self.value}"]
+
+
+class Gauge:
+    """Value read from a callback at scrape time"""
+
+    def __init__(self, name, read, description="", labels=None):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self.read = read
+
+    def render(self):
+        try:
+            value = self.read()
+        except Exception:
+            return []
+        return [] if value is None else [f"{self.name}{_format_labels(self.labels)} {value}"]
+
+
+class MetricsRegistry:
+    """
+    Get-or-create registry of named metrics. Metrics with the same name and
+    different labels are rendered together under one HELP/TYPE header.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, kind, name, labels, factory):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = factory()
+                metric.kind = kind
+                self._metrics[key] = metric
+            return metric
+
+    def histogram(self, name, buckets, description="", labels=None):
+        return self._get_or_create("histogram", name, labels,
+                                   lambda: Histogram(name, buckets, description, labels))
+
+    def counter(self, name, description="", labels=None):
+        return self._get_or_create("counter", name, labels,
+                                   lambda: Counter(name, description, labels))
+
+    def gauge(self, name, read, description="", labels=None):
+        """Register a gauge; re-registering replaces the callback"""
+        gauge = self._get_or_create("gauge", name, labels,
+                                    lambda: Gauge(name, read, description, labels))
+        gauge.read = read
+        return gauge
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = sorted(self._metrics.items(), key=lambda item: item[0])
+
+        lines = []
+        current = None
+        for (name, _), metric in metrics:
+            if name != current:
+                current = name
+                lines.append(f"# HELP {name} {metric.description}")
+                lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry served on /metrics
+REGISTRY = MetricsRegistry()
+
+
+def stage_histogram(stage):
+    return REGISTRY.histogram(
+        "recognition_stage_latency_ms", STAGE_BUCKETS_MS,
+        "Time spent in each stage of the recognition pipeline", {"stage": stage}
+    )
+
+
+@contextmanager
+def stage_timer(stage):
+    """Time a block of the recognition pipeline into the per-stage histogram"""
+    histogram = stage_histogram(stage)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe((time.perf_counter() - start) * 1000)
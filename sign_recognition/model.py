@@ -1,35 +1,87 @@
 """
 Sign language recognition model implementation.
 This module handles the machine learning model for sign language detection.
+
+TensorFlow, the Keras training utilities and scikit-learn are imported
+inside the methods that need them, so an inference-only server does not
+pay for them at import time (and, with the TFLite backend, not at all).
 """
+import json
 import numpy as np
-import tensorflow as tf
-from tensorflow.keras.models import Sequential, load_model
-from tensorflow.keras.layers import LSTM, Dense, Dropout, Bidirectional, BatchNormalization
-from tensorflow.keras.callbacks import ModelCheckpoint, ReduceLROnPlateau, EarlyStopping
-from tensorflow.keras.optimizers import Adam
-from sklearn.model_selection import train_test_split
 import os
 import pickle
+from metrics import stage_timer
+from architectures import DEFAULT_ARCHITECTURE, build_model
+from features import DEFAULT_FEATURE_SET, FEATURE_SETS, FEATURE_VERSION, FEATURES_PER_HAND, engineered_features
+
+# Signs of the original vocabulary, used when no class list is given or saved
+DEFAULT_CLASSES = ['one', 'two', 'three', 'four', 'five']
+
+# Artifact file names inside a model directory (see registry.py)
+MODEL_FILE = 'sign_language_model.h5'
+TFLITE_FILE = 'sign_language_model.tflite'
+SCALER_FILE = 'scaler.pkl'
+METADATA_FILE = 'metadata.json'
 
 class SignLanguageModel:
-    def __init__(self):
+    BACKENDS = ('keras', 'tflite')
+    
+    def __init__(self, backend='keras', num_hands=1, model_dir=None, classes=None, architecture=None,
+                 feature_set=None):
         # Model parameters
         self.num_landmarks = 21  # MediaPipe hand landmarks
+        self.num_hands = num_hands  # 2 for two-handed signs (left hand, then right)
         self.num_coords = 3      # x, y, z coordinates
         self.sequence_length = 30  # Frames per sign
-        self.classes = ['one', 'two', 'three', 'four', 'five']  # Signs to detect
+        self.classes = list(classes or DEFAULT_CLASSES)  # Signs to detect
+        self.version = None  # Registry version, if loaded from one
+        self.jit_compile = False  # Compile training steps with XLA
+        self.architecture = architecture or DEFAULT_ARCHITECTURE  # See architectures.py
+        self.feature_set = feature_set or DEFAULT_FEATURE_SET  # 'landmarks' or 'engineered' (see features.py)
         
         # Paths
-        self.model_dir = os.path.join(os.path.dirname(__file__), 'models')
+        self.model_dir = model_dir or os.path.join(os.path.dirname(__file__), 'models')
         os.makedirs(self.model_dir, exist_ok=True)
-        self.model_path = os.path.join(self.model_dir, 'sign_language_model.h5')
-        self.scaler_path = os.path.join(self.model_dir, 'scaler.pkl')
+        self.model_path = os.path.join(self.model_dir, MODEL_FILE)
+        self.scaler_path = os.path.join(self.model_dir, SCALER_FILE)
+        self.tflite_path = os.path.join(self.model_dir, TFLITE_FILE)
+        self.metadata_path = os.path.join(self.model_dir, METADATA_FILE)
+        
+        # A saved model's class list, shape and inputs take precedence
+        if os.path.exists(self.metadata_path):
+            with open(self.metadata_path) as f:
+                metadata = json.load(f)
+            if classes is None:
+                self.classes = metadata['classes']
+                self.sequence_length = metadata.get('sequence_length', self.sequence_length)
+                self.version = metadata.get('version')
+            if architecture is None:
+                self.architecture = metadata.get('architecture', DEFAULT_ARCHITECTURE)
+            if feature_set is None:
+                self.feature_set = metadata.get('feature_set', DEFAULT_FEATURE_SET)
+        if self.feature_set not in FEATURE_SETS:
+            raise ValueError(f"Unknown feature set '{self.feature_set}', expected one of {FEATURE_SETS}")
+        
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {self.BACKENDS}")
+        if backend == 'tflite' and not os.path.exists(self.tflite_path):
+            print(f"No TFLite model found at {self.tflite_path}, falling back to Keras")
+            backend = 'keras'
+        self.backend = backend
         
         # Load model if exists
-        if os.path.exists(self.model_path):
-            print(f"Loading model from {self.model_path}")
-            self.model = load_model(self.model_path)
+        if backend == 'tflite' or os.path.exists(self.model_path):
+            if backend == 'tflite':
+                from tflite_model import TFLiteModel
+                print(f"Loading TFLite model from {self.tflite_path}")
+                self.model = TFLiteModel(self.tflite_path)
+            else:
+                from tensorflow.keras.models import load_model
+                print(f"Loading model from {self.model_path}")
+                self.model = load_model(self.model_path)
+            
+            # The saved input width tells whether the model was trained on one or two hands
+            self.num_hands = self.model.input_shape[-1] // self.features_per_hand
             
             # Load scaler if exists
             if os.path.exists(self.scaler_path):
@@ -42,83 +94,85 @@ class SignLanguageModel:
             self.model = None
             self.scaler = None
     
-    def preprocess_landmarks(self, landmarks_sequence):
-        """Normalize and preprocess hand landmarks"""
-        # Convert to list if it's a numpy array
-        if isinstance(landmarks_sequence, np.ndarray):
-            landmarks_sequence = landmarks_sequence.tolist()
-        
-        # Ensure we have the right number of frames
-        if len(landmarks_sequence) < self.sequence_length:
-            # Pad with the last frame
-            last_frame = landmarks_sequence[-1]
-            landmarks_sequence = landmarks_sequence + [last_frame] * (self.sequence_length - len(landmarks_sequence))
-        elif len(landmarks_sequence) > self.sequence_length:
-            # Truncate
-            landmarks_sequence = landmarks_sequence[:self.sequence_length]
+    def save_metadata(self, **extra):
+        """Write the class list and input shape next to the model artifact"""
+        metadata = {
+            'classes': self.classes,
+            'sequence_length': self.sequence_length,
+            'num_hands': self.num_hands,
+            'architecture': self.architecture,
+            'feature_set': self.feature_set,
+            **extra,
+        }
+        with open(self.metadata_path, 'w') as f:
+            json.dump(metadata, f, indent=2)
+    
+    @property
+    def features_per_hand(self):
+        if self.feature_set == 'engineered':
+            return FEATURES_PER_HAND
+        return self.num_landmarks * self.num_coords
+    
+    @property
+    def num_features(self):
+        """Model input values per frame"""
+        return self.num_hands * self.features_per_hand
+    
+    def preprocess_batch(self, sequences):
+        """
+        Normalize and preprocess a batch of landmark sequences at once.
+        Accepts an array of shape (N, T, 21 * num_hands, 3) or a list of
+        (T_i, 21 * num_hands, 3) sequences and returns an array of shape
+        (N, sequence_length, num_features): normalized landmarks, or the
+        features of features.py for the engineered feature set.
+        """
+        if isinstance(sequences, np.ndarray) and sequences.ndim == 4:
+            batch = sequences.astype(np.float64, copy=False)
+            num_frames = batch.shape[1]
+            if num_frames != self.sequence_length:
+                # Pad with the last frame or truncate
+                frame_idx = np.minimum(np.arange(self.sequence_length), num_frames - 1)
+                batch = batch[:, frame_idx]
+        else:
+            fitted = []
+            for seq in sequences:
+                seq = np.asarray(seq, dtype=np.float64)
+                frame_idx = np.minimum(np.arange(self.sequence_length), len(seq) - 1)
+                fitted.append(seq[frame_idx])
+            batch = np.stack(fitted)
         
-        # Flatten landmarks for each frame
-        flattened_sequence = []
-        for landmarks in landmarks_sequence:
-            # Convert to numpy array if not already
-            landmarks = np.array(landmarks)
-            
-            # Center the landmarks around the wrist
-            wrist = landmarks[0]  # Wrist is the first landmark in MediaPipe
-            centered = landmarks - wrist
-            
-            # Normalize for scale
-            max_dist = np.max(np.abs(centered))
-            if max_dist > 0:
-                normalized = centered / max_dist
-            else:
-                normalized = centered
-            
-            # Flatten to 1D array
-            flattened = normalized.flatten()
-            flattened_sequence.append(flattened)
+        if self.feature_set == 'engineered':
+            return engineered_features(batch)
+        
+        # Center each hand's landmarks around its wrist (first MediaPipe landmark)
+        hands = batch.reshape(batch.shape[0], batch.shape[1], -1, self.num_landmarks, batch.shape[-1])
+        centered = (hands - hands[:, :, :, :1, :]).reshape(batch.shape)
         
-        return np.array(flattened_sequence)
+        # Normalize each frame for scale
+        max_dist = np.max(np.abs(centered), axis=(2, 3), keepdims=True)
+        normalized = np.divide(centered, max_dist, out=centered, where=max_dist > 0)
+        
+        # Flatten landmarks for each frame
+        return normalized.reshape(len(normalized), self.sequence_length, -1)
+    
+    def preprocess_landmarks(self, landmarks_sequence):
+        """Normalize and preprocess hand landmarks"""
+        return self.preprocess_batch(np.asarray(landmarks_sequence, dtype=np.float64)[np.newaxis])[0]
     
     def create_model(self):
-        """Create a new LSTM model for sign language recognition"""
-        # Input shape: [sequence_length, features]
-        input_shape = (self.sequence_length, self.num_landmarks * self.num_coords)
-        num_classes = len(self.classes)
+        """Create a new model of the configured architecture (see architectures.py)"""
+        from tensorflow.keras.optimizers import Adam
         
-        model = Sequential([
-            # First LSTM layer with bidirectional wrapper
-            Bidirectional(LSTM(64, return_sequences=True), input_shape=input_shape),
-            BatchNormalization(),
-            Dropout(0.3),
-            
-            # Second LSTM layer
-            Bidirectional(LSTM(128, return_sequences=True)),
-            BatchNormalization(),
-            Dropout(0.3),
-            
-            # Third LSTM layer
-            LSTM(64),
-            BatchNormalization(),
-            Dropout(0.3),
-            
-            # Dense layers
-            Dense(64, activation='relu'),
-            BatchNormalization(),
-            Dropout(0.3),
-            
-            Dense(32, activation='relu'),
-            BatchNormalization(),
-            
-            # Output layer
-            Dense(num_classes, activation='softmax')
-        ])
+        # Input shape: [sequence_length, features]
+        input_shape = (self.sequence_length, self.num_features)
+        model = build_model(self.architecture, input_shape, len(self.classes))
         
         # Compile with Adam optimizer
         model.compile(
             optimizer=Adam(learning_rate=0.001),
             loss='categorical_crossentropy',
-            metrics=['categorical_accuracy']
+            metrics=['categorical_accuracy'],
+            jit_compile=self.jit_compile
         )
         
         self.model = model
@@ -138,37 +192,44 @@ class SignLanguageModel:
                 continue
             
             print(f"Processing class: {class_name}")
-            files = [f for f in os.listdir(class_dir) if f.endswith('.npy')]
+            # Sorted like dataset.pack_directory, so seeded splits pick the same sequences
+            files = sorted(f for f in os.listdir(class_dir) if f.endswith('.npy'))
             print(f"Found {len(files)} sequences")
             
             for file_name in files:
                 file_path = os.path.join(class_dir, file_name)
-                sequence = np.load(file_path)
-                
-                # Preprocess landmarks
-                processed_sequence = self.preprocess_landmarks(sequence)
-                X.append(processed_sequence)
+                X.append(np.load(file_path))
                 y.append(class_idx)
         
-        return np.array(X), np.array(y)
-    
-    def train(self, X, y, epochs=100, batch_size=16, validation_split=0.2):
-        """Train the model with sign language data"""
-        if self.model is None:
-            self.create_model()
+        if not X:
+            return np.array(X), np.array(y)
         
-        print(f"Training model with {len(X)} sequences")
-        print(f"X shape: {X.shape}, y shape: {y.shape}")
+        # Preprocess all sequences in one vectorized pass
+        return self.preprocess_batch(X), np.array(y)
+    
+    def prepare_data_from_packed(self, packed_dir):
+        """Load and preprocess training data from a packed dataset (see dataset.py)"""
+        from dataset import PackedDataset
         
-        # Convert labels to one-hot encoding
-        y_categorical = tf.keras.utils.to_categorical(y, num_classes=len(self.classes))
+        dataset = PackedDataset(packed_dir, self.classes, self.sequence_length, self.num_hands * self.num_landmarks)
+        print(f"Loading {len(dataset)} packed sequences from {packed_dir}")
+        if len(dataset) == 0:
+            return np.array([]), np.array([])
         
-        # Split data
-        X_train, X_val, y_train, y_val = train_test_split(
-            X, y_categorical, test_size=validation_split, random_state=42
+        if self.feature_set == 'engineered':
+            return np.asarray(self.packed_features(dataset)), np.asarray(dataset.labels)
+        return self.preprocess_batch(dataset.sequences), np.asarray(dataset.labels)
+    
+    def packed_features(self, dataset):
+        """Engineered features of a packed dataset, computed once and cached next to it"""
+        return dataset.cached_features(
+            f'engineered-v{FEATURE_VERSION}', self.preprocess_batch, self.num_features
         )
+    
+    def _training_callbacks(self):
+        """Checkpointing, learning-rate and early-stopping callbacks shared by both training modes"""
+        from tensorflow.keras.callbacks import ModelCheckpoint, ReduceLROnPlateau, EarlyStopping
         
-        # Callbacks
         checkpoint = ModelCheckpoint(
             self.model_path,
             monitor='val_categorical_accuracy',
@@ -192,47 +253,250 @@ class SignLanguageModel:
             verbose=1
         )
         
+        return [checkpoint, reduce_lr, early_stopping]
+    
+    def train(self, X, y, epochs=100, batch_size=16, validation_split=0.2):
+        """Train the model with sign language data"""
+        import tensorflow as tf
+        from tensorflow.keras.models import load_model
+        from sklearn.model_selection import train_test_split
+        from train_callbacks import ThroughputLogger
+        
+        if self.model is None:
+            self.create_model()
+        
+        print(f"Training model with {len(X)} sequences")
+        print(f"X shape: {X.shape}, y shape: {y.shape}")
+        
+        # Convert labels to one-hot encoding
+        y_categorical = tf.keras.utils.to_categorical(y, num_classes=len(self.classes))
+        
+        # Split data
+        X_train, X_val, y_train, y_val = train_test_split(
+            X, y_categorical, test_size=validation_split, random_state=42
+        )
+        
         # Train the model
         history = self.model.fit(
             X_train, y_train,
             epochs=epochs,
             batch_size=batch_size,
             validation_data=(X_val, y_val),
-            callbacks=[checkpoint, reduce_lr, early_stopping]
+            callbacks=self._training_callbacks() + [ThroughputLogger(len(X_train))]
+        )
+        
+        # Load the best model
+        self.model = load_model(self.model_path)
+        self.save_metadata()
+        
+        return history
+    
+    def packed_input_pipeline(self, dataset, indices, batch_size=16, shuffle=False,
+                              shuffle_buffer=2048, num_shards=4, seed=42):
+        """
+        Build a tf.data pipeline that streams batches from a packed dataset.
+        Indices are split into contiguous shards that are read interleaved;
+        each batch is gathered from the memory map and preprocessed on the fly
+        (engineered features are read precomputed from the features cache).
+        """
+        import tensorflow as tf
+        
+        labels = dataset.labels
+        num_classes = len(self.classes)
+        num_features = self.num_features
+        
+        if self.feature_set == 'engineered':
+            # Batches are read straight from the features cache
+            sequences, preprocess = self.packed_features(dataset), np.asarray
+        else:
+            sequences, preprocess = dataset.sequences, self.preprocess_batch
+        
+        def load_batch(batch_indices):
+            # Read in file order so the memory map is accessed sequentially
+            batch_indices = np.sort(batch_indices.numpy())
+            X = preprocess(sequences[batch_indices]).astype(np.float32)
+            y = np.eye(num_classes, dtype=np.float32)[labels[batch_indices]]
+            return X, y
+        
+        def set_shapes(X, y):
+            X.set_shape([None, self.sequence_length, num_features])
+            y.set_shape([None, num_classes])
+            return X, y
+        
+        indices = np.sort(np.asarray(indices, dtype=np.int64))
+        num_shards = max(1, min(num_shards, len(indices)))
+        shard_bounds = np.linspace(0, len(indices), num_shards + 1).astype(np.int64)
+        starts = tf.constant(shard_bounds[:-1])
+        lengths = tf.constant(np.diff(shard_bounds))
+        
+        index_ds = tf.data.Dataset.from_tensor_slices(indices)
+        ds = tf.data.Dataset.range(num_shards).interleave(
+            lambda shard: index_ds.skip(starts[shard]).take(lengths[shard]),
+            cycle_length=num_shards,
+            num_parallel_calls=tf.data.AUTOTUNE,
+            deterministic=not shuffle
+        )
+        
+        if shuffle:
+            ds = ds.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True)
+        
+        ds = ds.batch(batch_size)
+        ds = ds.map(
+            lambda batch_indices: tf.py_function(load_batch, [batch_indices], [tf.float32, tf.float32]),
+            num_parallel_calls=tf.data.AUTOTUNE
+        )
+        ds = ds.map(set_shapes)
+        return ds.prefetch(tf.data.AUTOTUNE)
+    
+    def train_streaming(self, packed_dir, epochs=100, batch_size=16, validation_split=0.2,
+                        shuffle_buffer=2048, num_shards=4):
+        """
+        Train from a packed dataset (see dataset.py) without loading it into memory.
+        The validation split is a fixed, seeded selection of indices, so only
+        index arrays are held in memory, never copies of the data.
+        """
+        from tensorflow.keras.models import load_model
+        from dataset import PackedDataset
+        from train_callbacks import ThroughputLogger
+        
+        if self.model is None:
+            self.create_model()
+        
+        dataset = PackedDataset(packed_dir, self.classes, self.sequence_length, self.num_hands * self.num_landmarks)
+        if len(dataset) == 0:
+            raise ValueError(f"Packed dataset at {packed_dir} is empty")
+        
+        # Deterministic split
+        permutation = np.random.default_rng(42).permutation(len(dataset))
+        num_val = int(round(len(dataset) * validation_split))
+        val_indices, train_indices = permutation[:num_val], permutation[num_val:]
+        
+        print(f"Streaming {len(train_indices)} training and {len(val_indices)} validation sequences from {packed_dir}")
+        
+        train_ds = self.packed_input_pipeline(
+            dataset, train_indices, batch_size, shuffle=True,
+            shuffle_buffer=shuffle_buffer, num_shards=num_shards
+        )
+        val_ds = self.packed_input_pipeline(dataset, val_indices, batch_size, num_shards=1)
+        
+        history = self.model.fit(
+            train_ds,
+            epochs=epochs,
+            validation_data=val_ds,
+            callbacks=self._training_callbacks() + [ThroughputLogger(len(train_indices))]
         )
         
         # Load the best model
         self.model = load_model(self.model_path)
+        self.save_metadata()
         
         return history
     
+    def export_tflite(self, output_path=None, quantization=None, representative_data=None):
+        """
+        Convert the Keras model to a TensorFlow Lite artifact.
+        quantization: None, 'dynamic' (int8 weights), 'float16' or 'int8'
+        (full integer, needs representative_data of preprocessed sequences).
+        """
+        import tensorflow as tf
+        
+        if self.model is None or self.backend != 'keras':
+            raise ValueError("A loaded Keras model is required for export.")
+        
+        output_path = output_path or self.tflite_path
+        
+        # Fixed sequence length with a dynamic batch dimension
+        input_shape = (None, self.sequence_length, self.num_features)
+        serving_fn = tf.function(lambda x: self.model(x, training=False)).get_concrete_function(
+            tf.TensorSpec(input_shape, tf.float32)
+        )
+        converter = tf.lite.TFLiteConverter.from_concrete_functions([serving_fn], self.model)
+        
+        if quantization == 'dynamic':
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        elif quantization == 'float16':
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_types = [tf.float16]
+        elif quantization == 'int8':
+            if representative_data is None:
+                raise ValueError("int8 quantization needs representative_data")
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.representative_dataset = lambda: (
+                [np.asarray(sample[np.newaxis], dtype=np.float32)] for sample in representative_data
+            )
+        elif quantization is not None:
+            raise ValueError(f"Unknown quantization '{quantization}'")
+        
+        tflite_model = converter.convert()
+        with open(output_path, 'wb') as f:
+            f.write(tflite_model)
+        
+        print(f"Exported TFLite model ({len(tflite_model) / 1024:.1f} KB) to {output_path}")
+        return output_path
+    
+    def warm_up(self, batch_sizes=(1,)):
+        """Run dummy batches through the model so the first real request skips graph tracing"""
+        if self.model is None:
+            raise ValueError("Model not initialized. Create or load a model first.")
+        
+        frame = np.zeros((self.num_hands * self.num_landmarks, self.num_coords), dtype=np.float32)
+        frame[1:] = 0.1  # avoid an all-zero frame so normalization runs its usual path
+        for batch_size in batch_sizes:
+            self.predict_batch([np.stack([frame] * self.sequence_length)] * batch_size)
+    
+    def _interpret_prediction(self, prediction):
+        """Map a softmax output row to a (sign, confidence) pair"""
+        predicted_class_idx = np.argmax(prediction)
+        confidence = prediction[predicted_class_idx]
+        
+        if confidence < 0.5:
+            return "uncertain", float(confidence)
+        
+        return self.classes[predicted_class_idx], float(confidence)
+    
+    def predict_batch(self, sequences):
+        """Predict signs for several landmark sequences in one model call"""
+        if self.model is None:
+            raise ValueError("Model not initialized. Create or load a model first.")
+        
+        results = [("unknown", 0.0)] * len(sequences)
+        batch_indices = [i for i, seq in enumerate(sequences) if len(seq) > 0]
+        if not batch_indices:
+            return results
+        
+        # Preprocess into a single batch
+        with stage_timer("preprocess_landmarks"):
+            X = self.preprocess_batch([sequences[i] for i in batch_indices])
+        with stage_timer("model_predict"):
+            predictions = self.model.predict(X, verbose=0)
+        
+        for i, prediction in zip(batch_indices, predictions):
+            results[i] = self._interpret_prediction(prediction)
+        
+        return results
+    
     def predict(self, landmarks_sequence):
         """Predict sign from a sequence of hand landmarks"""
         if self.model is None:
             raise ValueError("Model not initialized. Create or load a model first.")
         
-        if not landmarks_sequence:
+        if landmarks_sequence is None or len(landmarks_sequence) == 0:
             return "unknown", 0.0
         
         # Preprocess the landmarks
         try:
-            processed_sequence = self.preprocess_landmarks(landmarks_sequence)
+            with stage_timer("preprocess_landmarks"):
+                processed_sequence = self.preprocess_landmarks(landmarks_sequence)
             
             # Add batch dimension
             X = np.expand_dims(processed_sequence, axis=0)
             
             # Make prediction
-            prediction = self.model.predict(X)[0]
-            
-            # Get class and confidence
-            predicted_class_idx = np.argmax(prediction)
-            confidence = prediction[predicted_class_idx]
-            
-            if confidence < 0.5:
-                return "uncertain", float(confidence)
+            with stage_timer("model_predict"):
+                prediction = self.model.predict(X, verbose=0)[0]
             
-            return self.classes[predicted_class_idx], float(confidence)
+            return self._interpret_prediction(prediction)
         
         except Exception as e:
             print(f"Error in prediction: {e}")
-            return "error", 0.0
\ No newline at end of file
+            return "error", 0.0
@@ -0,0 +1,131 @@
+"""
+Hot-swappable model serving.
+The server holds one ServedModel (a loaded model plus its inference engine)
+at a time. A request takes a reference to the current one for its whole
+duration, so a swap only affects requests that start after it; the old
+model keeps serving requests and streams already using it and its engine
+is stopped once the last of them finishes.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from metrics import REGISTRY, current_rss_mb
+
+logger = logging.getLogger(__name__)
+
+
+class ServedModel:
+    def __init__(self, model, engine, version=None):
+        self.model = model
+        self.engine = engine
+        self._version = version
+        self.loaded_at = time.time()
+        self.active = 0
+        self.retired = False
+
+    @property
+    def version(self):
+        # A remote engine follows the inference process, which other workers may have swapped
+        return getattr(self.engine, "served_version", None) or self._version
+
+    @property
+    def cache_namespace(self):
+        """Prediction cache entries are only valid for the model that produced them"""
+        return f"{self.model.backend}:{self.version or 'default'}"
+
+    async def _release(self):
+        self.active -= 1
+        if self.retired and self.active == 0:
+            await self.engine.stop()
+            logger.info(f"Model {self.version} drained and stopped")
+
+    def info(self):
+        return {
+            "version": self.version,
+            "backend": self.model.backend,
+            "classes": self.model.classes,
+            "loaded_at": self.loaded_at,
+            "active_requests": self.active,
+        }
+
+
+class ModelManager:
+    """
+    load: blocking callable taking a version (or None) and returning a warm model
+    create_engine: callable taking a model and returning an unstarted engine
+    """
+
+    def __init__(self, load, create_engine):
+        self._load = load
+        self._create_engine = create_engine
+        self.current = None
+        self._swap_lock = asyncio.Lock()
+        self.last_swap = None
+
+        self.swaps = REGISTRY.counter("model_swaps_total", "Completed model hot swaps")
+
+    @property
+    def ready(self):
+        return self.current is not None
+
+    @asynccontextmanager
+    async def use(self):
+        """Pin the current model for the duration of a request or stream"""
+        served = self.current
+        if served is None:
+            raise RuntimeError("No model loaded")
+        served.active += 1
+        try:
+            yield served
+        finally:
+            await served._release()
+
+    async def swap(self, version=None):
+        """
+        Load a version off the event loop, start its engine and make it current.
+        Returns timings and resident memory before, during and after the swap.
+        """
+        async with self._swap_lock:
+            loop = asyncio.get_running_loop()
+            rss_before = current_rss_mb()
+            start = time.perf_counter()
+
+            model = await loop.run_in_executor(None, self._load, version)
+            loaded = time.perf_counter()
+            engine = self._create_engine(model)
+            await engine.start()
+            served = ServedModel(model, engine, version or model.version)
+            rss_loaded = current_rss_mb()
+
+            # Swapping the reference is atomic on the event loop
+            previous, self.current = self.current, served
+            swapped = time.perf_counter()
+
+            if previous is not None:
+                previous.retired = True
+                if previous.active == 0:
+                    await previous.engine.stop()
+                self.swaps.inc()
+
+            self.last_swap = {
+                "from": previous.version if previous is not None else None,
+                "to": served.version,
+                "load_seconds": loaded - start,
+                "total_seconds": swapped - start,
+                "draining_requests": previous.active if previous is not None else 0,
+                "rss_before_mb": rss_before,
+                "rss_with_both_mb": rss_loaded,
+                "swap_overhead_mb": rss_loaded - rss_before,
+            }
+            logger.info(
+                f"Swapped model {self.last_swap['from']} -> {served.version} in "
+                f"{self.last_swap['total_seconds']:.2f}s (+{self.last_swap['swap_overhead_mb']:.1f} MB, "
+                f"{self.last_swap['draining_requests']} requests still on the old model)"
+            )
+            return self.last_swap
+
+    async def stop(self):
+        if self.current is not None:
+            await self.current.engine.stop()
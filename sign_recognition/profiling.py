@@ -0,0 +1,231 @@
+"""
+Sampling profiler for slow recognition requests.
+One background thread samples stacks for every request being profiled and,
+for requests slower than a threshold, writes them in the folded-stack format
+read by flamegraph.pl and speedscope. Each sample is attributed to the
+request whose thread it came from; on the event loop thread, which all
+requests share, only while one of that request's own tasks is running.
+Jobs a request hands to worker threads (frame extraction, session tracking,
+inference batches) are wrapped with profiled(), and the worker thread is
+sampled for the request while the job runs; a batch serving several
+requests counts for each of them. Work in other processes (process-mode
+extraction, the multi-worker inference server) is not sampled.
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Frames that only mean "this thread is idle"
+_IDLE_FUNCTIONS = {"wait", "select"}
+
+# The profile of the request being handled; tasks it spawns inherit it
+_current_profile = contextvars.ContextVar("request_profile", default=None)
+
+
+def _folded_stack(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _track_request_tasks(loop):
+    """Install a task factory recording tasks created by a profiled request as its own"""
+    previous = loop.get_task_factory()
+    if getattr(previous, "tracks_request_tasks", False):
+        return
+
+    def factory(loop, coro, **kwargs):
+        task = previous(loop, coro, **kwargs) if previous else asyncio.Task(coro, loop=loop, **kwargs)
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.tasks.add(task)
+        return task
+
+    factory.tracks_request_tasks = True
+    loop.set_task_factory(factory)
+
+
+def current_profile():
+    """The profile of the request being handled in this context, or None"""
+    return _current_profile.get()
+
+
+def profiled(fn, profiles=None):
+    """
+    Wrap fn so that the thread running it is sampled for profiles (by
+    default the calling request's) until it returns; fn itself if there is
+    nothing to profile
+    """
+    if profiles is None:
+        profiles = (_current_profile.get(),)
+    profiles = [profile for profile in profiles if profile is not None]
+    if not profiles:
+        return fn
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        thread_id = threading.get_ident()
+        for profile in profiles:
+            profile.enter_worker(thread_id)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            for profile in profiles:
+                profile.leave_worker(thread_id)
+    return run
+
+
+class ProfilingThreadPoolExecutor(ThreadPoolExecutor):
+    """A thread pool whose jobs are sampled for the request that submitted them"""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(profiled(fn), *args, **kwargs)
+
+
+class RequestProfile:
+    """
+    Samples of one request, taken on thread_id (and, if loop is set, only
+    while its tasks run) and on worker threads while they run its jobs
+    """
+
+    def __init__(self):
+        self.thread_id = threading.get_ident()
+        self.tasks = weakref.WeakSet()
+        try:
+            self.loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.loop = None
+        else:
+            _track_request_tasks(self.loop)
+            self.tasks.add(asyncio.current_task())
+        self.samples = Counter()
+        self._workers = Counter()
+        self._workers_lock = threading.Lock()
+        self._token = _current_profile.set(self)
+
+    def owns(self, frame):
+        if frame.f_code.co_name in _IDLE_FUNCTIONS:
+            return False
+        if self.loop is None:
+            return True
+        return asyncio.current_task(self.loop) in self.tasks
+
+    def enter_worker(self, thread_id):
+        with self._workers_lock:
+            self._workers[thread_id] += 1
+
+    def leave_worker(self, thread_id):
+        with self._workers_lock:
+            self._workers[thread_id] -= 1
+            if self._workers[thread_id] <= 0:
+                del self._workers[thread_id]
+
+    def worker_threads(self):
+        """Threads currently running jobs of this request"""
+        with self._workers_lock:
+            return list(self._workers)
+
+    def detach(self):
+        _current_profile.reset(self._token)
+
+    def write_folded(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class SharedSampler:
+    """A single sampling thread, running while any request is being profiled"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self._profiles = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add(self, profile):
+        with self._lock:
+            self._profiles.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample, name="profiler", daemon=True)
+                self._thread.start()
+
+    def remove(self, profile):
+        with self._lock:
+            self._profiles.discard(profile)
+
+    def _sample(self):
+        while True:
+            with self._lock:
+                if not self._profiles:
+                    self._thread = None
+                    return
+                profiles = list(self._profiles)
+
+            frames = sys._current_frames()
+            stacks = {}
+
+            def stack(thread_id):
+                if thread_id not in stacks:
+                    stacks[thread_id] = _folded_stack(frames[thread_id])
+                return stacks[thread_id]
+
+            for profile in profiles:
+                frame = frames.get(profile.thread_id)
+                if frame is not None and profile.owns(frame):
+                    profile.samples[stack(profile.thread_id)] += 1
+                for thread_id in profile.worker_threads():
+                    frame = frames.get(thread_id)
+                    if thread_id != profile.thread_id and frame is not None and \
+                            frame.f_code.co_name not in _IDLE_FUNCTIONS:
+                        profile.samples[stack(thread_id)] += 1
+            time.sleep(self.interval)
+
+
+class SlowRequestProfiler:
+    """
+    Profiles a sampled fraction of requests and keeps the profile only when
+    the request took longer than threshold_ms.
+    """
+
+    def __init__(self, output_dir, threshold_ms=1000, sample_rate=1.0, interval=0.005):
+        self.output_dir = output_dir
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.sampler = SharedSampler(interval)
+        os.makedirs(output_dir, exist_ok=True)
+
+    def maybe_start(self):
+        """Start profiling the calling request; call from the request's own task or thread"""
+        if random.random() >= self.sample_rate:
+            return None
+        profile = RequestProfile()
+        self.sampler.add(profile)
+        return profile
+
+    def finish(self, profile, elapsed_ms, label):
+        self.sampler.remove(profile)
+        profile.detach()
+        if elapsed_ms < self.threshold_ms or not profile.samples:
+            return None
+
+        safe_label = label.strip("/").replace("/", "_") or "root"
+        path = os.path.join(self.output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{safe_label}-{int(elapsed_ms)}ms-{uuid.uuid4().hex[:8]}.folded")
+        profile.write_folded(path)
+        logger.info(f"Slow request ({elapsed_ms:.0f}ms) on {label}, profile written to {path}")
+        return path
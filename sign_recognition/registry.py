@@ -0,0 +1,143 @@
+"""
+Versioned model registry.
+Every published version is an immutable directory holding the model
+artifacts together with the class list and scaler they were trained with:
+
+    models/registry/
+        v0001/
+            sign_language_model.h5
+            sign_language_model.tflite   (if exported)
+            scaler.pkl                   (if present)
+            metadata.json                classes, sequence_length, num_hands, version
+        v0002/
+        CURRENT                          name of the version the server loads
+
+Versions are staged in a temporary directory and renamed into place, and
+CURRENT is replaced atomically, so a reader never sees a partial version.
+
+Usage: python registry.py [list | publish [--no-activate] | activate VERSION]
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from model import DEFAULT_CLASSES, MODEL_FILE, TFLITE_FILE, SCALER_FILE, METADATA_FILE
+
+ARTIFACT_FILES = (MODEL_FILE, TFLITE_FILE, SCALER_FILE)
+CURRENT_FILE = 'CURRENT'
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(__file__), 'models', 'registry')
+
+
+class ModelRegistry:
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, version):
+        return os.path.join(self.root, version)
+
+    def versions(self):
+        """Published versions, oldest first"""
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, name, METADATA_FILE))
+        )
+
+    def metadata(self, version):
+        with open(os.path.join(self.path(version), METADATA_FILE)) as f:
+            return json.load(f)
+
+    def current(self):
+        """The active version, or None if nothing has been published"""
+        try:
+            with open(os.path.join(self.root, CURRENT_FILE)) as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def activate(self, version):
+        """Point CURRENT at a published version"""
+        if version not in self.versions():
+            raise ValueError(f"Unknown model version '{version}'")
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix='.current-')
+        with os.fdopen(fd, 'w') as f:
+            f.write(version + '\n')
+        os.replace(tmp_path, os.path.join(self.root, CURRENT_FILE))
+
+    def _next_version(self):
+        numbers = [int(v[1:]) for v in self.versions() if v.startswith('v') and v[1:].isdigit()]
+        return f"v{max(numbers, default=0) + 1:04d}"
+
+    def publish(self, source_dir, version=None, activate=True, **metadata):
+        """
+        Copy the artifacts and metadata in source_dir into a new version.
+        Extra keyword arguments are stored in the version's metadata.
+        Returns the version name.
+        """
+        if not os.path.exists(os.path.join(source_dir, MODEL_FILE)) and \
+                not os.path.exists(os.path.join(source_dir, TFLITE_FILE)):
+            raise FileNotFoundError(f"No model artifact in {source_dir}")
+        metadata_path = os.path.join(source_dir, METADATA_FILE)
+        if os.path.exists(metadata_path):
+            with open(metadata_path) as f:
+                version_metadata = json.load(f)
+        else:
+            # Models trained before metadata was saved all used the default vocabulary
+            version_metadata = {'classes': DEFAULT_CLASSES, 'sequence_length': 30}
+
+        version = version or self._next_version()
+        if os.path.exists(self.path(version)):
+            raise ValueError(f"Model version '{version}' already exists")
+
+        staging = tempfile.mkdtemp(dir=self.root, prefix=f'.{version}-')
+        try:
+            for name in ARTIFACT_FILES:
+                if os.path.exists(os.path.join(source_dir, name)):
+                    shutil.copy2(os.path.join(source_dir, name), os.path.join(staging, name))
+            version_metadata.update(metadata, version=version, published=time.strftime('%Y-%m-%dT%H:%M:%S'))
+            with open(os.path.join(staging, METADATA_FILE), 'w') as f:
+                json.dump(version_metadata, f, indent=2)
+            os.rename(staging, self.path(version))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        if activate:
+            self.activate(version)
+        return version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage published model versions")
+    parser.add_argument("--root", default=DEFAULT_ROOT)
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("list")
+    publish_parser = subparsers.add_parser("publish", help="Publish the model in models/ as a new version")
+    publish_parser.add_argument("--source-dir", default=os.path.join(os.path.dirname(__file__), 'models'))
+    publish_parser.add_argument("--no-activate", action="store_true")
+    activate_parser = subparsers.add_parser("activate")
+    activate_parser.add_argument("version")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    if args.command == "publish":
+        version = registry.publish(args.source_dir, activate=not args.no_activate)
+        print(f"Published {version}{' (active)' if not args.no_activate else ''}")
+    elif args.command == "activate":
+        registry.activate(args.version)
+        print(f"Activated {args.version}; running servers pick it up on reload")
+    else:
+        current = registry.current()
+        for version in registry.versions():
+            metadata = registry.metadata(version)
+            marker = "*" if version == current else " "
+            print(f"{marker} {version}  {metadata.get('published', '')}  {', '.join(metadata['classes'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Client side of the centralized inference process (see inference_server.py).
+In the multi-worker serving mode each API worker talks to the one process
+holding the model over a Unix socket instead of loading TensorFlow itself.
+RemoteInferenceEngine has the same interface as BatchedInferenceEngine, so
+the model manager and endpoints use either interchangeably.
+
+Messages are msgpack maps behind a 4-byte big-endian length prefix. Besides
+responses, the inference process pushes a {"event": "loaded"} message to
+every connection when it swaps models, and each prediction names the model
+version that made it, so a worker follows swaps other workers asked for.
+"""
+import asyncio
+import itertools
+import logging
+import socket
+import struct
+import time
+
+import msgpack
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_LENGTH = struct.Struct(">I")
+
+
+def pack_message(message):
+    payload = msgpack.packb(message, use_bin_type=True)
+    return _LENGTH.pack(len(payload)) + payload
+
+
+async def read_message(reader):
+    """Read one message from an asyncio stream; None when the peer closed"""
+    try:
+        header = await reader.readexactly(_LENGTH.size)
+        payload = await reader.readexactly(_LENGTH.unpack(header)[0])
+    except asyncio.IncompleteReadError:
+        return None
+    return msgpack.unpackb(payload, raw=False)
+
+
+def _recv_exactly(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Inference server closed the connection")
+        data += chunk
+    return data
+
+
+def request_sync(socket_path, message, timeout=None):
+    """One blocking request/response on a fresh connection"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(pack_message(message))
+        while True:
+            length = _LENGTH.unpack(_recv_exactly(sock, _LENGTH.size))[0]
+            response = msgpack.unpackb(_recv_exactly(sock, length), raw=False)
+            # Swap events pushed to every connection are not the answer
+            if not (isinstance(response, dict) and "event" in response):
+                return response
+
+
+class RemoteModel:
+    """
+    What the API process needs to know about the model the inference process
+    serves. RemoteInferenceEngine keeps it current when the process swaps.
+    """
+
+    def __init__(self, info):
+        self.loaded_at = None
+        self.update(info)
+
+    def update(self, info):
+        """Take on a newer model's description; descriptions of older models are ignored"""
+        if self.loaded_at is not None and info["loaded_at"] <= self.loaded_at:
+            return False
+        self.version = info["version"]
+        self.backend = f"remote-{info['backend']}"
+        self.classes = info["classes"]
+        self.sequence_length = info["sequence_length"]
+        self.num_hands = info["num_hands"]
+        self.loaded_at = info["loaded_at"]
+        return True
+
+
+def remote_load(socket_path, version=None, timeout=300.0):
+    """
+    Ask the inference process to serve a version (None keeps whatever it
+    loaded) and return its description. Blocks until the process is up and
+    the model is warm.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            response = request_sync(socket_path, {"op": "load", "version": version}, timeout)
+            break
+        except (FileNotFoundError, ConnectionError) as e:
+            # The inference process may still be starting
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Inference server at {socket_path} not reachable: {e}")
+            time.sleep(0.5)
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return RemoteModel(response)
+
+
+class RemoteInferenceEngine:
+    """
+    Forwards predictions to the inference process over one multiplexed connection.
+    model: the RemoteModel it serves, updated in place when the process swaps
+    """
+
+    def __init__(self, socket_path, model=None):
+        self.socket_path = socket_path
+        self.model = model
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+        self._pending = {}
+        self._ids = itertools.count()
+        self._write_lock = None
+
+    @property
+    def running(self):
+        return self._reader_task is not None and not self._reader_task.done()
+
+    @property
+    def queue_depth(self):
+        return len(self._pending)
+
+    @property
+    def served_version(self):
+        """Version the inference process served as of its latest message"""
+        return self.model.version if self.model is not None else None
+
+    def _follow(self, info):
+        if self.model is not None and self.model.update(info):
+            logger.info(f"Inference server now serves model {info['version'] or 'default'}")
+
+    async def start(self):
+        if self.running:
+            return
+        self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+        self._write_lock = asyncio.Lock()
+        self._reader_task = asyncio.create_task(self._read_responses())
+        logger.info(f"Connected to inference server at {self.socket_path}")
+
+    async def stop(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._fail_pending(RuntimeError("Inference engine stopped"))
+
+    def _fail_pending(self, error):
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    async def _read_responses(self):
+        while True:
+            message = await read_message(self._reader)
+            if message is None:
+                logger.error("Inference server closed the connection")
+                self._fail_pending(RuntimeError("Inference server disconnected"))
+                return
+            if message.get("event") == "loaded":
+                self._follow(message["model"])
+                continue
+            future = self._pending.pop(message.get("id"), None)
+            if future is None or future.done():
+                continue
+            if "error" in message:
+                future.set_exception(RuntimeError(message["error"]))
+            else:
+                future.set_result(message["result"])
+
+    async def _request(self, message):
+        if not self.running:
+            raise RuntimeError("Inference engine is not running")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        async with self._write_lock:
+            self._writer.write(pack_message({"id": request_id, **message}))
+            await self._writer.drain()
+        return await future
+
+    async def predict(self, landmarks_sequence):
+        """Queue a sequence for prediction and wait for its (sign, confidence)"""
+        landmarks = np.asarray(landmarks_sequence, dtype=np.float32)
+        predicted_sign, confidence, version, loaded_at = await self._request({
+            "op": "predict",
+            "landmarks": landmarks.tobytes(),
+            "shape": list(landmarks.shape),
+        })
+        if self.model is not None and loaded_at > self.model.loaded_at:
+            # Answered by a model this worker has not been told about yet
+            self.model.version, self.model.loaded_at = version, loaded_at
+        return predicted_sign, confidence
+
+    def stats(self):
+        return {
+            "running": self.running,
+            "remote": self.socket_path,
+            "queue_depth": self.queue_depth,
+        }
+
+    async def remote_stats(self):
+        """Batch size and latency histograms of the engine in the inference process"""
+        return await self._request({"op": "stats"})
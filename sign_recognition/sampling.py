@@ -0,0 +1,115 @@
+"""
+Adaptive frame sampling for recognition requests.
+Hand detection first runs on every stride-th frame, then refines only the
+stretches next to sampled frames that had a hand, halving the stride each
+round. Near-duplicate frames are dropped, and sampling stops once enough
+distinct hand frames are collected or the model is confident enough.
+"""
+import numpy as np
+
+from metrics import REGISTRY
+
+FRAMES_SKIPPED = REGISTRY.counter("recognition_frames_skipped_total", "Frames not run through hand detection by adaptive sampling")
+
+
+def landmark_distance(a, b):
+    """Mean absolute difference between two landmark frames"""
+    return float(np.mean(np.abs(np.asarray(a) - np.asarray(b))))
+
+
+def _initial_indices(num_frames, stride):
+    indices = list(range(0, num_frames, stride))
+    if indices[-1] != num_frames - 1:
+        indices.append(num_frames - 1)
+    return indices
+
+
+def _refine_indices(num_frames, processed, hand_indices, stride):
+    """
+    Unprocessed frames on a stride grid between consecutive processed frames,
+    where at least one of the two had a hand.
+    """
+    ordered = sorted(processed)
+    indices = []
+    for left, right in zip(ordered, ordered[1:]):
+        if right - left < 2 or (left not in hand_indices and right not in hand_indices):
+            continue
+        indices.extend(i for i in range(left + stride, right, stride) if i not in processed)
+    return indices
+
+
+class AdaptiveSampler:
+    """
+    Decides which frames of a capture to run hand detection on.
+
+    target_frames: distinct hand frames after which sampling stops
+    min_predict_frames: hand frames needed before trying an early prediction
+    confidence_threshold: stop once a prediction is at least this confident
+    duplicate_threshold: frames closer than this to a temporal neighbour are dropped
+    """
+
+    def __init__(self, target_frames, stride=4, min_predict_frames=None,
+                 confidence_threshold=0.9, duplicate_threshold=0.005):
+        self.target_frames = target_frames
+        self.stride = max(1, int(stride))
+        self.min_predict_frames = min_predict_frames or max(1, target_frames // 2)
+        self.confidence_threshold = confidence_threshold
+        self.duplicate_threshold = duplicate_threshold
+
+    def _is_duplicate(self, index, landmarks, kept):
+        """Compare with the nearest kept frames before and after index"""
+        before = [i for i in kept if i < index]
+        after = [i for i in kept if i > index]
+        neighbours = ([max(before)] if before else []) + ([min(after)] if after else [])
+        return any(landmark_distance(kept[i], landmarks) < self.duplicate_threshold for i in neighbours)
+
+    async def run(self, frames, extract, predict=None):
+        """
+        Sample frames for one request.
+
+        extract: coroutine taking a list of base64 frames and returning
+            (decoded, landmarks) per frame, like FrameExtractor.extract
+        predict: optional coroutine taking a landmark sequence and
+            returning (predicted_sign, confidence)
+
+        Returns (landmarks, frames_processed, prediction), where landmarks
+        are the kept hand frames in temporal order and prediction is the
+        (predicted_sign, confidence) of an early exit on those landmarks, or None.
+        """
+        num_frames = len(frames)
+        processed = set()
+        hand_indices = set()
+        kept = {}
+        prediction = None
+
+        stride = self.stride
+        indices = _initial_indices(num_frames, stride)
+        while True:
+            results = await extract([frames[i] for i in indices]) if indices else []
+            processed.update(indices)
+
+            num_kept = len(kept)
+            for index, (decoded, landmarks) in zip(indices, results):
+                if not decoded or landmarks is None:
+                    continue
+                landmarks = np.asarray(landmarks, dtype=np.float32)
+                hand_indices.add(index)
+                if not self._is_duplicate(index, landmarks, kept):
+                    kept[index] = landmarks
+
+            if len(kept) >= self.target_frames:
+                break
+
+            if predict is not None and len(kept) > num_kept and len(kept) >= self.min_predict_frames:
+                prediction = await predict([kept[i] for i in sorted(kept)])
+                if prediction[1] >= self.confidence_threshold:
+                    break
+                prediction = None
+
+            if stride == 1:
+                break
+            stride = max(1, stride // 2)
+            indices = _refine_indices(num_frames, processed, hand_indices, stride)
+
+        FRAMES_SKIPPED.inc(num_frames - len(processed))
+        return [kept[i] for i in sorted(kept)], len(processed), prediction
@@ -0,0 +1,96 @@
+"""
+Production launcher: runs the API with several uvicorn worker processes.
+
+In the default centralized mode one inference_server.py process holds the
+model and every worker sends it landmark sequences over a Unix socket, so
+memory for the weights and TensorFlow runtime does not grow with the worker
+count and predictions from all workers share batches. In replicated mode
+every worker loads its own copy of the model, as a single main.py does.
+
+The worker count is WORKERS, or WORKERS_PER_CORE (default 1) times the
+number of CPU cores. Unless EXTRACTION_WORKERS is set, each worker's frame
+extraction pool is sized to its share of the cores. Workers share one
+LANDMARK_VERIFY_SECRET, generated at startup unless set.
+
+Usage: python serve.py [--workers N | --workers-per-core F] [--mode centralized|replicated]
+                       [--host 0.0.0.0] [--port 8000]
+"""
+import argparse
+import math
+import os
+import secrets
+import signal
+import subprocess
+import sys
+
+import uvicorn
+
+from remote_inference import remote_load
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def worker_count(workers=None, workers_per_core=None):
+    """Explicit count, else per-core factor, else WORKERS / WORKERS_PER_CORE from the environment"""
+    if workers is None and os.environ.get("WORKERS"):
+        workers = int(os.environ["WORKERS"])
+    if workers:
+        return max(1, workers)
+    if workers_per_core is None:
+        workers_per_core = float(os.environ.get("WORKERS_PER_CORE", 1))
+    return max(1, math.ceil(workers_per_core * (os.cpu_count() or 1)))
+
+
+def start_inference_server(socket_path):
+    """Start inference_server.py and wait until its model is loaded"""
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(APP_DIR, "inference_server.py"), "--socket", socket_path]
+    )
+    try:
+        info = remote_load(socket_path)
+    except Exception:
+        process.terminate()
+        raise
+    print(f"Inference server ready (pid {process.pid}, model {info.version or 'default'}, {info.backend})")
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API with multiple workers")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--workers-per-core", type=float, default=None)
+    parser.add_argument("--mode", choices=("centralized", "replicated"), default="centralized",
+                        help="one shared inference process, or a model per worker")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--socket", default=os.environ.get("INFERENCE_SOCKET") or "/tmp/sign_inference.sock")
+    args = parser.parse_args()
+
+    workers = worker_count(args.workers, args.workers_per_core)
+    # Any worker may check frames for a landmark attempt another worker asked for
+    os.environ.setdefault("LANDMARK_VERIFY_SECRET", secrets.token_hex(32))
+    if not os.environ.get("EXTRACTION_WORKERS"):
+        # Workers extract frames in parallel, so split the cores between them
+        os.environ["EXTRACTION_WORKERS"] = str(max(1, (os.cpu_count() or 1) // workers))
+
+    inference_server = None
+    if args.mode == "centralized":
+        os.environ["INFERENCE_SOCKET"] = args.socket
+        inference_server = start_inference_server(args.socket)
+    else:
+        os.environ.pop("INFERENCE_SOCKET", None)
+
+    print(f"Starting {workers} worker(s) in {args.mode} mode on {args.host}:{args.port}")
+    try:
+        uvicorn.run("main:app", host=args.host, port=args.port, workers=workers, app_dir=APP_DIR)
+    finally:
+        if inference_server is not None:
+            inference_server.send_signal(signal.SIGINT)
+            try:
+                inference_server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                inference_server.kill()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Per-session state for streaming sign recognition over WebSocket.
+Each session checks its MediaPipe tracker out of a HandsTrackerPool, so
+video-mode tracking carries across its frames, and keeps a ring buffer of
+the most recent hand landmarks.
+"""
+from collections import deque
+
+import numpy as np
+
+from extraction import NUM_HAND_LANDMARKS, base64_to_rgb, landmarks_from_rgb
+from landmark_codec import decode_landmark_bytes
+
+
+def process_session_frames(tracker_pool, session_id, frames, num_hands=1, timeout=None, deadline=None):
+    """
+    Extract landmarks from a session's frames in order on its pooled tracker.
+    Returns (decoded, landmarks) per frame like FrameExtractor. With a
+    Deadline, stops between frames once it has passed (DeadlineExceeded).
+    """
+    results = []
+    rows = np.empty((len(frames), NUM_HAND_LANDMARKS * num_hands, 3), dtype=np.float32)
+    with tracker_pool.session(session_id, timeout) as hands:
+        for base64_frame, row in zip(frames, rows):
+            if deadline is not None:
+                deadline.check()
+            frame = base64_to_rgb(base64_frame)
+            if frame is None:
+                results.append((False, None))
+                continue
+            results.append((True, landmarks_from_rgb(frame, hands, num_hands, row)))
+    return results
+
+
+class RecognitionSession:
+    def __init__(self, session_id, tracker_pool, sequence_length, predict_every=5,
+                 expected_sign="", dtype="float32", num_hands=1, checkout_timeout=None):
+        self.session_id = session_id
+        self.tracker_pool = tracker_pool
+        self.sequence_length = sequence_length
+        self.predict_every = max(1, int(predict_every))
+        self.expected_sign = expected_sign
+        self.dtype = dtype
+        self.num_hands = num_hands
+        self.checkout_timeout = checkout_timeout
+
+        self.buffer = deque(maxlen=sequence_length)
+
+        self.frames_received = 0
+        self.frames_with_hands = 0
+        self._since_prediction = 0
+
+    def add_frame(self, base64_frame):
+        """Decode a frame and push its landmarks into the buffer; returns True if a hand was found"""
+        self.frames_received += 1
+        frame = base64_to_rgb(base64_frame)
+        if frame is None:
+            return False
+
+        # Tracking mode: landmarks from the previous frame seed the next one
+        with self.tracker_pool.session(self.session_id, self.checkout_timeout) as hands:
+            landmarks = landmarks_from_rgb(frame, hands, self.num_hands)
+        if landmarks is None:
+            return False
+
+        self._push(landmarks)
+        return True
+
+    def decode_landmark_bytes(self, data):
+        """Client-extracted landmark frames of a binary message, in the session's dtype"""
+        return decode_landmark_bytes(data, self.dtype, NUM_HAND_LANDMARKS * self.num_hands)
+
+    def add_landmark_bytes(self, data):
+        """Push client-extracted landmark frames; returns the number of hand frames added"""
+        return self.add_landmarks(self.decode_landmark_bytes(data))
+
+    def add_landmarks(self, landmarks):
+        """Push decoded landmark frames; returns the number of hand frames added"""
+        self.frames_received += len(landmarks)
+        for frame_landmarks in landmarks:
+            self._push(frame_landmarks)
+        return len(landmarks)
+
+    def _push(self, landmarks):
+        self.buffer.append(np.asarray(landmarks, dtype=np.float32))
+        self.frames_with_hands += 1
+        self._since_prediction += 1
+
+    def should_predict(self):
+        """True once predict_every new hand frames have arrived since the last prediction"""
+        return self._since_prediction >= self.predict_every and len(self.buffer) > 0
+
+    def window(self):
+        """The buffered landmarks as a (T, 21, 3) array and reset the prediction counter"""
+        self._since_prediction = 0
+        return np.stack(self.buffer)
+
+    def close(self):
+        self.tracker_pool.release(self.session_id)
@@ -0,0 +1,137 @@
+"""
+Synthetic hand data for running the training and evaluation pipeline
+without a webcam.
+Each sign gets procedurally posed MediaPipe-style hand landmarks ("one" to
+"five" extend that many fingers) with random rotation, scale, position and
+per-frame jitter. Sequences are written in the layout collect_data.py uses,
+and optionally rendered as JPEG frame sets for replaying the frame path.
+
+Layout written under the output directory:
+    <sign>/seq_<n>.npy            (sequence_length, 21, 3) landmarks
+    <sign>/frames_<n>/<i>.jpg     rendered frames of the same sequence
+
+MediaPipe rarely detects a hand in the rendered skeletons, so frame sets are
+useful for decode and detection timings rather than accuracy.
+
+Usage: python synthetic_data.py [--output-dir synthetic_data] [--sequences 20] [--frames]
+"""
+import argparse
+import os
+
+import cv2
+import numpy as np
+
+SIGNS = ['one', 'two', 'three', 'four', 'five']
+
+# MediaPipe hand landmark indices: wrist, then four joints per finger
+WRIST = 0
+FINGERS = {
+    'thumb': (1, 2, 3, 4),
+    'index': (5, 6, 7, 8),
+    'middle': (9, 10, 11, 12),
+    'ring': (13, 14, 15, 16),
+    'pinky': (17, 18, 19, 20),
+}
+# Fingers extended for each sign, in counting order
+EXTENDED = ['index', 'middle', 'ring', 'pinky', 'thumb']
+# Direction of each finger from the wrist, in degrees from straight up
+FINGER_ANGLES = {'thumb': -55, 'index': -15, 'middle': 0, 'ring': 14, 'pinky': 28}
+FINGER_LENGTHS = {'thumb': 0.7, 'index': 0.9, 'middle': 1.0, 'ring': 0.95, 'pinky': 0.75}
+
+HAND_CONNECTIONS = [(WRIST, joints[0]) for joints in FINGERS.values()] + [
+    (a, b) for joints in FINGERS.values() for a, b in zip(joints, joints[1:])
+]
+
+
+def hand_pose(sign):
+    """Canonical (21, 3) landmarks for a sign, wrist at the origin, unit palm size"""
+    num_extended = SIGNS.index(sign) + 1
+    extended = set(EXTENDED[:num_extended])
+    landmarks = np.zeros((21, 3))
+
+    for finger, joints in FINGERS.items():
+        angle = np.radians(FINGER_ANGLES[finger])
+        direction = np.array([np.sin(angle), -np.cos(angle)])
+        base = direction * 0.45
+        length = FINGER_LENGTHS[finger] * 0.8
+        for j, idx in enumerate(joints):
+            if j == 0:
+                point = base
+            elif finger in extended:
+                point = base + direction * length * j / 3
+            else:
+                # Folded: curl back towards the palm centre
+                point = base * (1 - 0.25 * j) + np.array([0, 0.05 * j])
+            landmarks[idx, :2] = point
+            landmarks[idx, 2] = -0.02 * j if finger in extended else 0.03 * j
+    return landmarks
+
+
+def synthetic_sequence(sign, sequence_length=30, rng=None):
+    """A (sequence_length, 21, 3) sequence in normalized image coordinates"""
+    rng = rng or np.random.default_rng()
+    pose = hand_pose(sign)
+
+    angle = rng.uniform(-0.4, 0.4)
+    scale = rng.uniform(0.12, 0.22)
+    start = np.array([rng.uniform(0.35, 0.65), rng.uniform(0.6, 0.8)])
+    drift = rng.normal(0, 0.002, size=2)
+
+    frames = []
+    for t in range(sequence_length):
+        theta = angle + 0.01 * np.sin(t / 4)
+        rotation = np.array([[np.cos(theta), -np.sin(theta)], [np.sin(theta), np.cos(theta)]])
+        frame = pose + rng.normal(0, 0.02, size=pose.shape)
+        frame[:, :2] = frame[:, :2] @ rotation.T * scale + start + drift * t
+        frame[:, 2] *= scale
+        frames.append(frame)
+    return np.asarray(frames, dtype=np.float32)
+
+
+def render_frame(landmarks, width=320, height=240):
+    """Draw landmarks as a hand skeleton on a plain background, as a BGR image"""
+    image = np.full((height, width, 3), (60, 50, 40), dtype=np.uint8)
+    points = [(int(x * width), int(y * height)) for x, y, _ in landmarks]
+    for a, b in HAND_CONNECTIONS:
+        cv2.line(image, points[a], points[b], (140, 180, 225), 8)
+    for point in points:
+        cv2.circle(image, point, 5, (120, 160, 210), -1)
+    return image
+
+
+def generate(output_dir, sequences_per_sign=20, sequence_length=30, frames=False, seed=0):
+    """Write synthetic sequences (and frame sets) for every sign; returns the count"""
+    rng = np.random.default_rng(seed)
+    count = 0
+    for sign in SIGNS:
+        sign_dir = os.path.join(output_dir, sign)
+        os.makedirs(sign_dir, exist_ok=True)
+        for n in range(sequences_per_sign):
+            sequence = synthetic_sequence(sign, sequence_length, rng)
+            np.save(os.path.join(sign_dir, f"seq_{n}.npy"), sequence)
+
+            if frames:
+                frames_dir = os.path.join(sign_dir, f"frames_{n}")
+                os.makedirs(frames_dir, exist_ok=True)
+                for i, landmarks in enumerate(sequence):
+                    cv2.imwrite(os.path.join(frames_dir, f"{i:03d}.jpg"), render_frame(landmarks),
+                                [cv2.IMWRITE_JPEG_QUALITY, 80])
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic sign data")
+    parser.add_argument("--output-dir", default=os.path.join(os.path.dirname(__file__), 'synthetic_data'))
+    parser.add_argument("--sequences", type=int, default=20, help="Sequences per sign")
+    parser.add_argument("--sequence-length", type=int, default=30)
+    parser.add_argument("--frames", action="store_true", help="Also render JPEG frame sets")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    count = generate(args.output_dir, args.sequences, args.sequence_length, args.frames, args.seed)
+    print(f"Wrote {count} synthetic sequences to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import os
+import sys
+import time
+
+import pytest
+
+# The server modules import each other as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StandInModel:
+    """Answers every sequence with one sign, without TensorFlow"""
+    sequence_length = 30
+    num_hands = 1
+    version = None
+    backend = "stand-in"
+    classes = ["one", "two"]
+
+    def predict_batch(self, sequences):
+        return [("one", 0.9) for _ in sequences]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """The API with the default configuration, serving StandInModel"""
+    pytest.importorskip("mediapipe")
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    import main
+
+    monkeypatch.setattr(main.model_manager, "_load", lambda version: StandInModel())
+    with TestClient(main.app) as client:
+        for _ in range(100):
+            if main.model_ready:
+                break
+            time.sleep(0.05)
+        assert main.model_ready, main.model_status
+        yield client
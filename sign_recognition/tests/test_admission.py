@@ -0,0 +1,25 @@
+import asyncio
+
+import admission
+from admission import AdmissionController, Deadline
+
+
+def test_slot_handed_over_as_the_wait_times_out_is_kept(monkeypatch):
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=1)
+    wait_for = asyncio.wait_for
+
+    async def hand_over_then_time_out(waiter, timeout):
+        # _release() gives the slot to the waiter just before the timeout fires
+        controller._release()
+        raise asyncio.TimeoutError
+
+    async def main():
+        await controller._acquire(Deadline(1))
+        monkeypatch.setattr(admission.asyncio, "wait_for", hand_over_then_time_out)
+        result = await controller.run(Deadline(1), lambda: asyncio.sleep(0, "handled"))
+        monkeypatch.setattr(admission.asyncio, "wait_for", wait_for)
+        return result
+
+    assert asyncio.run(main()) == "handled"
+    assert controller.in_flight == 0
+    assert controller.queued == 0
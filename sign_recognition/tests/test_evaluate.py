@@ -0,0 +1,24 @@
+import pytest
+
+from evaluate import UNCERTAIN, UNKNOWN, confusion_report, held_out
+
+
+def test_confusion_counts_uncertain_predictions():
+    classes = ["one", "two"]
+    confusion, per_class = confusion_report(classes, ["one", "one", "two"], ["one", UNCERTAIN, UNKNOWN])
+
+    assert confusion["labels"] == ["one", "two", UNCERTAIN, UNKNOWN]
+    assert confusion["matrix"] == [[1, 0, 1, 0], [0, 0, 0, 1]]
+    assert per_class["one"] == {"support": 2, "precision": 1.0, "recall": 0.5}
+    assert per_class["two"]["recall"] == 0.0
+
+
+def test_held_out_matches_the_training_split():
+    train_test_split = pytest.importorskip("sklearn.model_selection").train_test_split
+    sequences = [("landmarks", "one" if i < 10 else "two", f"seq{i:02d}.npy") for i in range(20)]
+    frame_sets = [("frames", "one", "take1"), ("frames", "two", "take1")]
+
+    _, validation = train_test_split(list(range(20)), test_size=0.2, random_state=42)
+    selected = held_out(sequences + frame_sets)
+
+    assert selected == [sequences[i] for i in sorted(validation)] + frame_sets
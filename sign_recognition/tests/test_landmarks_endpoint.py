@@ -0,0 +1,42 @@
+"""
+/api/quiz/landmarks with the default configuration, against a stand-in model
+"""
+import numpy as np
+
+from landmark_codec import encode_landmark_bytes, encode_msgpack_landmarks
+
+NUM_LANDMARKS = 21
+
+
+def landmarks(frames=8):
+    return np.random.default_rng(0).random((frames, NUM_LANDMARKS, 3))
+
+
+def test_raw_body_gets_a_prediction(client):
+    response = client.post(
+        "/api/quiz/landmarks?expectedSign=one&dtype=float16",
+        content=encode_landmark_bytes(landmarks(), "float16"),
+        headers={"content-type": "application/octet-stream"}
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["predictedSign"] == "one" and result["isCorrect"]
+    assert result["verified"] is None and result["verifyFrames"] is None
+
+
+def test_msgpack_body_gets_a_prediction(client):
+    response = client.post(
+        "/api/quiz/landmarks",
+        content=encode_msgpack_landmarks(landmarks(), "one"),
+        headers={"content-type": "application/msgpack"}
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["predictedSign"] == "one" and result["isCorrect"]
+    assert result["verified"] is None and result["verifyFrames"] is None
+
+
+def test_json_body_without_frame_hashes_fails_verification(client):
+    response = client.post("/api/quiz/landmarks", json={"landmarks": landmarks().tolist(), "expectedSign": "one"})
+    assert response.status_code == 200
+    assert response.json()["verified"] is False
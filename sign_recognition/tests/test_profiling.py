@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+from profiling import ProfilingThreadPoolExecutor, SlowRequestProfiler
+
+
+def busy_executor_job(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_executor_jobs_are_attributed_to_the_request(tmp_path):
+    profiler = SlowRequestProfiler(str(tmp_path), threshold_ms=50, interval=0.002)
+
+    async def request():
+        profile = profiler.maybe_start()
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, busy_executor_job, 0.2)
+        return profiler.finish(profile, (time.perf_counter() - start) * 1000, "/api/quiz")
+
+    async def main():
+        asyncio.get_running_loop().set_default_executor(ProfilingThreadPoolExecutor())
+        return await request()
+
+    path = asyncio.run(main())
+
+    assert path is not None
+    with open(path) as f:
+        stacks = f.read()
+    assert "busy_executor_job (test_profiling.py" in stacks
+
+
+def test_concurrent_requests_keep_their_own_jobs(tmp_path):
+    profiler = SlowRequestProfiler(str(tmp_path), threshold_ms=0, interval=0.002)
+    executor = ProfilingThreadPoolExecutor(max_workers=2)
+
+    def other_job(seconds):
+        busy_executor_job(seconds)
+
+    async def request(job):
+        profile = profiler.maybe_start()
+        await asyncio.get_running_loop().run_in_executor(executor, job, 0.15)
+        profiler.finish(profile, 0, "/")
+        return profile.samples
+
+    async def main():
+        return await asyncio.gather(request(busy_executor_job), request(other_job))
+
+    first, second = asyncio.run(main())
+    executor.shutdown()
+
+    assert any("busy_executor_job" in stack for stack in first)
+    assert not any("other_job" in stack for stack in first)
+    assert any("other_job" in stack for stack in second)
@@ -0,0 +1,39 @@
+"""
+/ws/recognize limits, against a stand-in model
+"""
+import numpy as np
+import pytest
+
+from landmark_codec import encode_landmark_bytes
+
+
+def test_one_binary_message_cannot_pass_the_frame_cap(client, monkeypatch):
+    import main
+    from starlette.websockets import WebSocketDisconnect
+
+    monkeypatch.setattr(main, "STREAM_MAX_FRAMES", 20)
+    frames = encode_landmark_bytes(np.random.default_rng(0).random((30, 21, 3)), "float32")
+    with client.websocket_connect("/ws/recognize") as websocket:
+        websocket.send_bytes(frames)
+        assert websocket.receive_json() == {"type": "error", "detail": "At most 20 frames per stream"}
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_json()
+        assert closed.value.code == 1008
+
+
+def test_exhausted_tracker_pool_closes_with_try_again_later(client, monkeypatch):
+    import main
+    from starlette.websockets import WebSocketDisconnect
+    from tracker_pool import PoolExhausted
+
+    def exhausted(session, frame):
+        raise PoolExhausted(f"No hand tracker available for session {session.session_id}")
+
+    monkeypatch.setattr(main.RecognitionSession, "add_frame", exhausted)
+    with client.websocket_connect("/ws/recognize") as websocket:
+        websocket.send_json({"type": "frame", "frame": "data:image/jpeg;base64,"})
+        message = websocket.receive_json()
+        assert message["type"] == "error" and "No hand tracker available" in message["detail"]
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_json()
+        assert closed.value.code == 1013
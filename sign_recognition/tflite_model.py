@@ -0,0 +1,63 @@
+"""
+TensorFlow Lite inference backend for the sign language model.
+Wraps a converted .tflite artifact behind the same predict() call the
+Keras model exposes, so SignLanguageModel can use either interchangeably.
+"""
+import threading
+
+import numpy as np
+
+try:
+    # The standalone runtime is much lighter than full TensorFlow
+    from tflite_runtime.interpreter import Interpreter
+except ImportError:
+    import tensorflow as tf
+    Interpreter = tf.lite.Interpreter
+
+
+class TFLiteModel:
+    def __init__(self, model_path, num_threads=None):
+        self.model_path = model_path
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_size = int(self._input["shape"][0])
+        self.input_shape = tuple(int(d) for d in self._input["shape"])
+        self._lock = threading.Lock()
+
+    def _resize(self, batch_size):
+        """Resize the input tensor when the batch size changes"""
+        if batch_size == self._batch_size:
+            return
+        shape = list(self._input["shape"])
+        shape[0] = batch_size
+        self.interpreter.resize_tensor_input(self._input["index"], shape)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_size = batch_size
+
+    def _quantize_input(self, X):
+        """Apply the input quantization parameters of full-integer models"""
+        dtype = self._input["dtype"]
+        if np.issubdtype(dtype, np.integer):
+            scale, zero_point = self._input["quantization"]
+            return np.round(X / scale + zero_point).astype(dtype)
+        return X.astype(dtype)
+
+    def _dequantize_output(self, y):
+        if np.issubdtype(y.dtype, np.integer):
+            scale, zero_point = self._output["quantization"]
+            return (y.astype(np.float32) - zero_point) * scale
+        return y
+
+    def predict(self, X, verbose=0):
+        """Run a batch of shape (N, sequence_length, features) and return softmax rows"""
+        X = np.asarray(X)
+        with self._lock:
+            self._resize(len(X))
+            self.interpreter.set_tensor(self._input["index"], self._quantize_input(X))
+            self.interpreter.invoke()
+            return self._dequantize_output(self.interpreter.get_tensor(self._output["index"]).copy())
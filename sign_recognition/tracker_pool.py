@@ -0,0 +1,153 @@
+"""
+Pool of MediaPipe Hands trackers checked out per session.
+A session keeps the same tracker between checkouts so video-mode tracking
+carries across its frames; trackers are reset before moving to another
+session so no tracking state leaks between users.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from extraction import create_hands
+
+
+class PoolExhausted(Exception):
+    """No tracker became available before the checkout timeout"""
+
+
+class _Tracker:
+    def __init__(self, hands):
+        self.hands = hands
+        self.session_id = None
+        self.busy = False
+        self.last_used = time.monotonic()
+
+
+class HandsTrackerPool:
+    def __init__(self, max_size=8, idle_timeout=60.0, max_num_hands=1, static_image_mode=False):
+        self.max_size = max(1, int(max_size))
+        self.idle_timeout = idle_timeout
+        self.max_num_hands = max_num_hands
+        self.static_image_mode = static_image_mode
+
+        self._trackers = []
+        self._by_session = {}
+        self._available = threading.Condition()
+
+        self.checkouts = 0
+        self.reassignments = 0
+        self.waits = 0
+
+    def _create_tracker(self):
+        return _Tracker(create_hands(
+            static_image_mode=self.static_image_mode,
+            max_num_hands=self.max_num_hands
+        ))
+
+    def _claim(self, session_id):
+        """Find a tracker for the session; caller holds the condition lock"""
+        tracker = self._by_session.get(session_id)
+        if tracker is not None:
+            return None if tracker.busy else tracker
+
+        # A tracker no session is bound to
+        tracker = next((t for t in self._trackers if t.session_id is None and not t.busy), None)
+
+        if tracker is None and len(self._trackers) < self.max_size:
+            tracker = self._create_tracker()
+            self._trackers.append(tracker)
+
+        if tracker is None:
+            # Take over the least recently used idle session's tracker
+            idle = [t for t in self._trackers if not t.busy]
+            if not idle:
+                return None
+            tracker = min(idle, key=lambda t: t.last_used)
+            self._unbind(tracker)
+            self.reassignments += 1
+
+        tracker.session_id = session_id
+        self._by_session[session_id] = tracker
+        return tracker
+
+    def _unbind(self, tracker):
+        if tracker.session_id is not None:
+            self._by_session.pop(tracker.session_id, None)
+            tracker.session_id = None
+            # Drop the previous session's tracking state
+            tracker.hands.reset()
+
+    def checkout(self, session_id, timeout=None):
+        """Return the session's Hands instance, waiting up to timeout seconds if all are busy"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._available:
+            self._evict_idle_locked()
+            tracker = self._claim(session_id)
+            while tracker is None:
+                self.waits += 1
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise PoolExhausted(f"No hand tracker available for session {session_id}")
+                self._available.wait(remaining)
+                tracker = self._claim(session_id)
+
+            tracker.busy = True
+            self.checkouts += 1
+            return tracker.hands
+
+    def checkin(self, session_id):
+        """Return the session's tracker; it stays bound to the session until evicted"""
+        with self._available:
+            tracker = self._by_session.get(session_id)
+            if tracker is not None:
+                tracker.busy = False
+                tracker.last_used = time.monotonic()
+            self._available.notify_all()
+
+    def release(self, session_id):
+        """End a session: reset its tracker and make it available to others"""
+        with self._available:
+            tracker = self._by_session.get(session_id)
+            if tracker is not None and not tracker.busy:
+                self._unbind(tracker)
+            self._available.notify_all()
+
+    @contextmanager
+    def session(self, session_id, timeout=None):
+        hands = self.checkout(session_id, timeout)
+        try:
+            yield hands
+        finally:
+            self.checkin(session_id)
+
+    def _evict_idle_locked(self):
+        now = time.monotonic()
+        for tracker in self._trackers:
+            if (tracker.session_id is not None and not tracker.busy
+                    and now - tracker.last_used > self.idle_timeout):
+                self._unbind(tracker)
+
+    def evict_idle(self):
+        """Unbind sessions idle for longer than idle_timeout"""
+        with self._available:
+            self._evict_idle_locked()
+            self._available.notify_all()
+
+    def close(self):
+        with self._available:
+            for tracker in self._trackers:
+                tracker.hands.close()
+            self._trackers.clear()
+            self._by_session.clear()
+
+    def stats(self):
+        with self._available:
+            return {
+                "size": len(self._trackers),
+                "max_size": self.max_size,
+                "busy": sum(t.busy for t in self._trackers),
+                "sessions": len(self._by_session),
+                "checkouts": self.checkouts,
+                "reassignments": self.reassignments,
+                "waits": self.waits,
+            }
@@ -1,15 +1,101 @@
 """
 Sign language model training script.
 Run this after collecting data to train the sign language recognition model.
+
+Usage: python train.py [--classes one,two,...] [--architecture NAME] [--features SET]
+                       [--num-hands N] [--no-publish] [--streaming] [--eager]
+                       [--jit-compile] [--mixed-precision]
+                       [--intra-op-threads N] [--inter-op-threads N]
+  --classes          signs to train on (default: every training_data/<sign>
+                     directory with recordings)
+  --architecture     bilstm, gru, tcn or transformer (see architectures.py;
+                     default: that of the previous model, else bilstm)
+  --features         landmarks or engineered (see features.py; default: that
+                     of the previous model, else landmarks)
+  --num-hands        hands per recorded frame, 1 or 2 (2 for recordings from
+                     ingest_videos.py --num-hands 2; default: that of the
+                     previous model, else 1)
+  --no-publish       don't publish the trained model to the model registry
+  --streaming        stream batches from the packed dataset through tf.data
+                     instead of loading every sequence into memory
+  --eager            run every step eagerly (slow, for debugging only)
+  --jit-compile      compile training steps with XLA
+  --mixed-precision  train in mixed bfloat16 on CPUs with native support
 """
+import argparse
+import json
 import os
+import shutil
 import numpy as np
-from model import SignLanguageModel
+from model import DEFAULT_CLASSES, SignLanguageModel
+from architectures import ARCHITECTURES, DEFAULT_ARCHITECTURE
+from features import DEFAULT_FEATURE_SET, FEATURE_SETS
+from dataset import DatasetMismatch, pack_directory
+from registry import ModelRegistry
 import tensorflow as tf
 import matplotlib.pyplot as plt
 
-# Enable eager execution explicitly
-tf.config.run_functions_eagerly(True)
+def cpu_supports_bfloat16():
+    """True if the CPU advertises native bfloat16 instructions (AVX512-BF16 or AMX)"""
+    try:
+        with open('/proc/cpuinfo') as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return 'avx512_bf16' in flags or 'amx_bf16' in flags
+
+def configure_tensorflow(eager=False, intra_op_threads=0, inter_op_threads=0, mixed_precision=False):
+    """
+    Apply runtime settings. Must be called before any model is built;
+    thread counts of 0 leave the choice to TensorFlow.
+    Returns True if mixed bfloat16 precision was enabled.
+    """
+    tf.config.run_functions_eagerly(eager)
+    
+    if intra_op_threads:
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+    if inter_op_threads:
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+    
+    if mixed_precision:
+        if cpu_supports_bfloat16() or tf.config.list_physical_devices('GPU'):
+            tf.keras.mixed_precision.set_global_policy('mixed_bfloat16')
+            return True
+        print("Warning: no native bfloat16 support detected, training in float32")
+    return False
+
+def discover_classes(data_dir):
+    """Sign directories with recorded sequences, the original five first"""
+    found = [
+        name for name in os.listdir(data_dir)
+        if os.path.isdir(os.path.join(data_dir, name))
+        and any(f.endswith('.npy') for f in os.listdir(os.path.join(data_dir, name)))
+    ]
+    return [c for c in DEFAULT_CLASSES if c in found] + sorted(c for c in found if c not in DEFAULT_CLASSES)
+
+def trained_metadata(model):
+    """Class list, architecture, feature set and hand count the model in model_dir was trained with"""
+    metadata = {'classes': DEFAULT_CLASSES, 'architecture': DEFAULT_ARCHITECTURE, 'feature_set': DEFAULT_FEATURE_SET,
+                'num_hands': 1}
+    if os.path.exists(model.metadata_path):
+        with open(model.metadata_path) as f:
+            metadata.update(json.load(f))
+    return metadata
+
+def pack_training_data(data_dir, packed_dir, classes, sequence_length, landmarks_per_frame):
+    """Pack new recordings; a packed dataset built for another vocabulary or hand count is rebuilt"""
+    try:
+        return pack_directory(data_dir, packed_dir, classes, sequence_length, landmarks_per_frame)
+    except DatasetMismatch as e:
+        print(f"{e}; rebuilding the packed dataset")
+        shutil.rmtree(packed_dir)
+        return pack_directory(data_dir, packed_dir, classes, sequence_length, landmarks_per_frame)
+
+def publish_model(model):
+    """Publish the trained model, its classes and scaler as a new registry version"""
+    version = ModelRegistry().publish(model.model_dir)
+    print(f"Published model version {version}; running servers swap to it via "
+          f"POST /api/models/reload or MODEL_WATCH_SECONDS")
 
 def plot_training_history(history):
     """Plot training and validation metrics"""
@@ -43,6 +129,31 @@ def plot_training_history(history):
     print(f"Training plots saved to {plots_dir}")
 
 def main():
+    parser = argparse.ArgumentParser(description="Train the sign language recognition model")
+    parser.add_argument("--classes", default=None, help="comma-separated signs to train on")
+    parser.add_argument("--architecture", choices=sorted(ARCHITECTURES), default=None,
+                        help="model architecture (default: keep the previous one)")
+    parser.add_argument("--features", choices=FEATURE_SETS, default=None,
+                        help="model input features (default: keep the previous ones)")
+    parser.add_argument("--num-hands", type=int, choices=[1, 2], default=None,
+                        help="hands per recorded frame (default: keep the previous count)")
+    parser.add_argument("--no-publish", action="store_true", help="don't publish to the model registry")
+    parser.add_argument("--streaming", action="store_true",
+                        help="stream training data from disk instead of loading it into memory")
+    parser.add_argument("--eager", action="store_true", help="run training steps eagerly")
+    parser.add_argument("--jit-compile", action="store_true", help="compile training steps with XLA")
+    parser.add_argument("--mixed-precision", action="store_true", help="use mixed bfloat16 precision")
+    parser.add_argument("--intra-op-threads", type=int, default=0)
+    parser.add_argument("--inter-op-threads", type=int, default=0)
+    args = parser.parse_args()
+    
+    mixed_precision = configure_tensorflow(
+        eager=args.eager,
+        intra_op_threads=args.intra_op_threads,
+        inter_op_threads=args.inter_op_threads,
+        mixed_precision=args.mixed_precision
+    )
+    
     print("=" * 50)
     print("SIGN LANGUAGE RECOGNITION MODEL TRAINING")
     print("=" * 50)
@@ -57,9 +168,6 @@ def main():
         except RuntimeError as e:
             print(f"Error setting memory growth: {e}")
     
-    # Create model instance
-    model = SignLanguageModel()
-    
     # Data directory
     data_dir = os.path.join(os.path.dirname(__file__), 'training_data')
     
@@ -68,9 +176,64 @@ def main():
         print("Please run collect_data.py first to gather training data.")
         return
     
-    # Load and preprocess data
+    # Create model instance for the vocabulary being trained
+    classes = args.classes.split(',') if args.classes else discover_classes(data_dir)
+    if not classes:
+        print("No training data found! Please run collect_data.py first.")
+        return
+    print(f"Signs: {', '.join(classes)}")
+    model = SignLanguageModel(classes=classes, num_hands=args.num_hands or 1)
+    previous = trained_metadata(model)
+    # A loaded model knows its hand count from its input width
+    trained_hands = model.num_hands if model.model is not None else previous['num_hands']
+    model.num_hands = args.num_hands or trained_hands
+    model.architecture = args.architecture or previous['architecture']
+    model.feature_set = args.features or previous['feature_set']
+    model.jit_compile = args.jit_compile
+    if model.model is not None and previous['classes'] != classes:
+        # The previous model was trained on a different vocabulary
+        print("Vocabulary changed, training a new model")
+        model.create_model()
+    elif model.model is not None and (previous['architecture'], previous['feature_set'], trained_hands) != \
+            (model.architecture, model.feature_set, model.num_hands):
+        print(f"Model changed to {model.architecture} on {model.feature_set} features from "
+              f"{model.num_hands} hand(s), training a new model")
+        model.create_model()
+    print(f"Architecture: {model.architecture}, features: {model.feature_set}, hands: {model.num_hands}")
+    print(f"Execution: {'eager' if args.eager else 'graph'}"
+          f"{', XLA' if args.jit_compile else ''}"
+          f"{', mixed bfloat16' if mixed_precision else ''}")
+    
+    # Pack new recordings into the memory-mapped dataset, then load from it
     print("\nPreparing training data...")
-    X, y = model.prepare_data_from_directory(data_dir)
+    packed_dir = os.path.join(os.path.dirname(__file__), 'training_data_packed')
+    dataset, added = pack_training_data(data_dir, packed_dir, model.classes, model.sequence_length,
+                                        model.num_hands * model.num_landmarks)
+    print(f"Packed {added} new sequences into {packed_dir}")
+    
+    if len(dataset) == 0:
+        print("No training data found! Please run collect_data.py first.")
+        return
+    
+    epochs = 100
+    batch_size = 16
+    
+    if args.streaming:
+        print("\nTraining model from streamed data...")
+        history = model.train_streaming(
+            packed_dir,
+            epochs=epochs,
+            batch_size=batch_size,
+            validation_split=0.2
+        )
+        plot_training_history(history)
+        print("\nTraining complete!")
+        print(f"Model saved to: {os.path.join('models', 'sign_language_model.h5')}")
+        if not args.no_publish:
+            publish_model(model)
+        return
+    
+    X, y = model.prepare_data_from_packed(packed_dir)
     
     if len(X) == 0:
         print("No training data found! Please run collect_data.py first.")
@@ -88,9 +251,6 @@ def main():
     
     # Train model
     print("\nTraining model...")
-    epochs = 100
-    batch_size = 16
-    
     history = model.train(
         X, y,
         epochs=epochs,
@@ -103,6 +263,8 @@ def main():
     
     print("\nTraining complete!")
     print(f"Model saved to: {os.path.join('models', 'sign_language_model.h5')}")
+    if not args.no_publish:
+        publish_model(model)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""
+Keras callbacks for monitoring training performance.
+"""
+import time
+
+import tensorflow as tf
+
+from metrics import peak_rss_mb
+
+
+class ThroughputLogger(tf.keras.callbacks.Callback):
+    """Report training samples/sec and peak RSS at the end of every epoch"""
+
+    def __init__(self, samples_per_epoch):
+        super().__init__()
+        self.samples_per_epoch = samples_per_epoch
+        self.epoch_rates = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._epoch_start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        elapsed = time.perf_counter() - self._epoch_start
+        rate = self.samples_per_epoch / elapsed if elapsed > 0 else 0.0
+        self.epoch_rates.append(rate)
+
+        if logs is not None:
+            logs['samples_per_sec'] = rate
+            logs['peak_rss_mb'] = peak_rss_mb()
+
+        print(f"\nEpoch {epoch + 1}: {rate:.1f} samples/sec, peak RSS {peak_rss_mb():.1f} MB")
@@ -0,0 +1,133 @@
+"""
+Spot checks for landmarks extracted in the browser.
+A client that runs hand tracking itself sends its landmarks along with a
+SHA-256 hash of each camera frame they came from. The server then decides
+whether to check the attempt and which frames it wants to see, keyed with a
+server secret over the landmarks and hashes: the client commits to its
+frames before it can know the choice, and resubmitting the same attempt
+gets the same choice. The client sends those frames, the server matches
+them against the hashes, runs MediaPipe on them only and compares the
+result with what the client reported for the same frames. This catches
+broken or mismatched client-side extraction (wrong coordinate system, wrong
+hand, stale frames) at a fraction of the cost of extracting every frame; it
+is a plausibility check, not a defence against a client that fabricates
+both frames and landmarks.
+
+The choice needs no per-attempt state, so any API worker can check frames
+for an attempt another worker asked for, as long as they share the secret.
+Binary landmark bodies (raw tensors, msgpack, WebSocket binary messages)
+cannot carry frame hashes and are never checked.
+"""
+import hashlib
+import hmac
+import os
+import random
+
+import numpy as np
+
+from metrics import REGISTRY
+from sampling import landmark_distance
+
+
+def _counter(result):
+    return REGISTRY.counter(
+        "landmark_verifications_total", "Client landmark verifications by outcome", {"result": result}
+    )
+
+
+VERIFIED, REJECTED, UNVERIFIED = _counter("verified"), _counter("rejected"), _counter("unverified")
+
+
+def frame_hash(frame):
+    """Hex SHA-256 of a base64 frame string exactly as the client sends it"""
+    return hashlib.sha256(frame.encode()).hexdigest()
+
+
+class FramesRequired(Exception):
+    """The attempt is checked and the client has yet to send these frames"""
+
+    def __init__(self, indices):
+        super().__init__(f"Frames {indices} are needed to verify the landmarks")
+        self.indices = indices
+
+
+class LandmarkVerifier:
+    """
+    extract: async callable taking base64 frames and returning
+             (decoded, landmarks) pairs, e.g. FrameExtractor.extract
+    sample_size: frames re-extracted per checked attempt
+    rate: fraction of attempts that are checked at all
+    tolerance: largest mean absolute landmark difference (normalized image
+               coordinates) still counted as the same hand
+    secret: key for choosing checked attempts and frames; API workers must
+            share it (random per process if not given)
+    """
+
+    def __init__(self, extract, sample_size=2, rate=1.0, tolerance=0.05, secret=None):
+        self.extract = extract
+        self.sample_size = max(1, int(sample_size))
+        self.rate = rate
+        self.tolerance = tolerance
+        self.secret = secret or os.urandom(32)
+
+    def frames_to_check(self, landmarks, frame_hashes=None):
+        """Sorted indices into landmarks of the frames to check, or [] if the attempt is not checked"""
+        key = hmac.new(self.secret, np.ascontiguousarray(landmarks, dtype=np.float32).tobytes(), hashlib.sha256)
+        for digest in frame_hashes or ():
+            key.update(digest.encode())
+        rng = random.Random(key.digest())
+        if rng.random() >= self.rate:
+            return []
+        return sorted(rng.sample(range(len(landmarks)), min(self.sample_size, len(landmarks))))
+
+    def unchecked(self):
+        """Record an attempt in a format that cannot carry frame hashes; returns None like an unchecked verify"""
+        UNVERIFIED.inc()
+        return None
+
+    async def verify(self, landmarks, frame_hashes=None, samples=None):
+        """
+        Check client landmarks against the frames the server picks for them.
+        frame_hashes holds the frame_hash of every landmark frame and samples
+        maps landmark indices to the frames sent so far.
+        Returns True if every picked frame matches its hash and its
+        landmarks, False if any does not, the client sent no hashes to pick
+        from, or the server finds no hand in any picked frame, and None if
+        the attempt is not checked. Raises FramesRequired if the picked
+        frames have not been sent yet.
+        """
+        indices = self.frames_to_check(landmarks, frame_hashes)
+        if not indices:
+            UNVERIFIED.inc()
+            return None
+        if not frame_hashes:
+            REJECTED.inc()
+            return False
+        if not samples:
+            raise FramesRequired(indices)
+
+        frames = [samples.get(index) for index in indices]
+        if any(frame is None or frame_hash(frame) != frame_hashes[index] for index, frame in zip(indices, frames)):
+            REJECTED.inc()
+            return False
+        results = await self.extract(frames)
+
+        matches = 0
+        for index, (decoded, server_landmarks) in zip(indices, results):
+            if not decoded:
+                REJECTED.inc()
+                return False
+            if server_landmarks is None:
+                # MediaPipe builds differ a little in detection thresholds
+                continue
+            if landmark_distance(server_landmarks, landmarks[index]) > self.tolerance:
+                REJECTED.inc()
+                return False
+            matches += 1
+
+        if matches == 0:
+            # The client reported a hand in every checked frame, the server in none
+            REJECTED.inc()
+            return False
+        VERIFIED.inc()
+        return True
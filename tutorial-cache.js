@@ -0,0 +1,55 @@
+import axios from "axios";
+
+// In-process cache for tutorial video metadata from api.js.
+// A record is served from memory until it is ttlMs old; after that the next
+// lookup revalidates it with If-None-Match, so an unchanged record costs a
+// 304 with no body instead of a full fetch. Concurrent lookups of the same
+// id share one request, and a stale record is kept in use if the API cannot
+// be reached. Only records the API returned are cached, so the
+// cache never grows past the size of the video library.
+
+export function createTutorialCache({ baseUrl, ttlMs = 60000, timeoutMs = 5000 }) {
+    const entries = new Map();   // id -> { data, etag, fetchedAt }
+    const pending = new Map();   // id -> Promise of the record
+    const client = axios.create({
+        baseURL: baseUrl,
+        timeout: timeoutMs,
+        validateStatus: (status) => (status >= 200 && status < 300) || status === 304
+    });
+
+    async function fetchRecord(id, cached) {
+        const headers = cached && cached.etag ? { "If-None-Match": cached.etag } : {};
+        try {
+            const response = await client.get(`/videolib/${encodeURIComponent(id)}`, { headers: headers });
+            if (response.status === 304) {
+                cached.fetchedAt = Date.now();
+                return cached.data;
+            }
+            entries.set(id, { data: response.data, etag: response.headers.etag, fetchedAt: Date.now() });
+            return response.data;
+        } catch (error) {
+            if (error.response && error.response.status === 404) {
+                entries.delete(id);
+            } else if (cached) {
+                // A stale record is better than an error page while the API is down
+                console.error(`Serving stale metadata for video ${id}:`, error.message);
+                return cached.data;
+            }
+            throw error;
+        }
+    }
+
+    // Metadata record for a video id; rejects like axios.get if the API fails
+    function get(id) {
+        const cached = entries.get(id);
+        if (cached && Date.now() - cached.fetchedAt < ttlMs) {
+            return Promise.resolve(cached.data);
+        }
+        if (!pending.has(id)) {
+            pending.set(id, fetchRecord(id, cached).finally(() => pending.delete(id)));
+        }
+        return pending.get(id);
+    }
+
+    return { get: get, size: () => entries.size };
+}